@@ -0,0 +1,175 @@
+"""
+Módulo analise_aproximada.py
+Modo de análise aproximada, com memória fixa por entidade.
+
+Em vez de conjuntos exatos, cada usuário guarda um HyperLogLog dos conteúdos com que interagiu, e cada
+conteúdo e plataforma um HyperLogLog dos usuários distintos; as contagens por (conteúdo, tipo de interação)
+ficam em um único Count-Min Sketch compartilhado, cujo tamanho não depende da quantidade de conteúdos, e as
+contagens por (usuário, tipo de interação) em outro, com os mesmos limites de erro.
+Os limites de erro são configuráveis: erro_distintos é o erro relativo típico dos HyperLogLog, e
+erro_contagens a fração do total de interações que uma contagem pode exceder (com probabilidade
+1 - probabilidade_falha). No modo aproximado do sistema, usuários e conteúdos não mantêm conjuntos nem
+contagens exatas: leem o HyperLogLog de conteúdos do usuário (sketch_conteudos_usuario) e os Count-Min
+Sketches (contagens e contagens_usuarios), que só esta classe alimenta; a tabela de relatórios lê as mesmas
+estimativas, então o valor exibido é sempre o usado nos rankings. Como os sketches são mescláveis, os estados de shards podem ser combinados
+(mesclar) e gravados em JSON (para_dict/de_dict).
+"""
+
+import heapq
+
+from entidades.interacao import Interacao
+from estruturas_dados.count_min_sketch import CountMinSketch
+from estruturas_dados.hyperloglog import HyperLogLog, precisao_para_erro
+
+VERSAO_ESTADO_APROXIMADO = 2
+
+
+class AnaliseAproximada:
+    def __init__(self, erro_distintos: float = 0.05, erro_contagens: float = 0.001, probabilidade_falha: float = 0.01):
+        """Cria os sketches vazios para os limites de erro informados (ValueError se fora de (0, 1))."""
+        self._precisao = precisao_para_erro(erro_distintos)
+        self._contagens = CountMinSketch(erro_contagens, probabilidade_falha)
+        self._contagens_usuarios = CountMinSketch(erro_contagens, probabilidade_falha)
+        self._limites = {'erro_distintos': erro_distintos, 'erro_contagens': erro_contagens,
+                         'probabilidade_falha': probabilidade_falha}
+        self._conteudos_por_usuario = {}    # id_usuario -> HyperLogLog de id_conteudo
+        self._usuarios_por_conteudo = {}    # id_conteudo -> HyperLogLog de id_usuario
+        self._usuarios_por_plataforma = {}  # nome normalizado -> HyperLogLog de id_usuario
+
+    def _sketch(self, sketches, chave):
+        sketch = sketches.get(chave)
+        if sketch is None:
+            sketch = sketches[chave] = HyperLogLog(self._precisao)
+        return sketch
+
+    @property
+    def contagens(self):
+        """Count-Min Sketch compartilhado das contagens por (id_conteudo, tipo de interação)."""
+        return self._contagens
+
+    @property
+    def contagens_usuarios(self):
+        """Count-Min Sketch compartilhado das contagens por (id_usuario, tipo de interação)."""
+        return self._contagens_usuarios
+
+    def sketch_conteudos_usuario(self, id_usuario: int):
+        """HyperLogLog dos conteúdos do usuário (criado vazio, se ainda não existir). Complexidade: O(1)."""
+        return self._sketch(self._conteudos_por_usuario, id_usuario)
+
+    def adicionar_interacao(self, interacao):
+        """Registra a interação nos HyperLogLog do usuário, do conteúdo e da plataforma e nos Count-Min Sketches. Complexidade: O(d)."""
+        id_usuario = interacao.id_usuario
+        id_conteudo = interacao.conteudo_associado.id_conteudo
+        self._sketch(self._conteudos_por_usuario, id_usuario).adicionar(id_conteudo)
+        self._sketch(self._usuarios_por_conteudo, id_conteudo).adicionar(id_usuario)
+        chave_plataforma = interacao.plataforma_interacao.nome_plataforma.strip().lower()
+        self._sketch(self._usuarios_por_plataforma, chave_plataforma).adicionar(id_usuario)
+        self._contagens.adicionar((id_conteudo, interacao.tipo_interacao))
+        self._contagens_usuarios.adicionar((id_usuario, interacao.tipo_interacao))
+
+    # Estimativas
+
+    def conteudos_distintos_usuario(self, id_usuario: int) -> int:
+        """Quantidade estimada de conteúdos distintos do usuário. Complexidade: O(m)."""
+        sketch = self._conteudos_por_usuario.get(id_usuario)
+        return sketch.estimativa() if sketch else 0
+
+    def usuarios_distintos_conteudo(self, id_conteudo: int) -> int:
+        """Quantidade estimada de usuários distintos do conteúdo. Complexidade: O(m)."""
+        sketch = self._usuarios_por_conteudo.get(id_conteudo)
+        return sketch.estimativa() if sketch else 0
+
+    def usuarios_distintos_plataforma(self, nome_plataforma: str) -> int:
+        """Quantidade estimada de usuários distintos da plataforma (nome sem diferenciar maiúsculas). Complexidade: O(m)."""
+        sketch = self._usuarios_por_plataforma.get(nome_plataforma.strip().lower())
+        return sketch.estimativa() if sketch else 0
+
+    def contagem_tipo(self, id_conteudo: int, tipo_interacao: str) -> int:
+        """Contagem estimada (limite superior) de interações do tipo no conteúdo. Complexidade: O(d)."""
+        return self._contagens.estimar((id_conteudo, tipo_interacao))
+
+    def contagem_tipo_usuario(self, id_usuario: int, tipo_interacao: str) -> int:
+        """Contagem estimada (limite superior) de interações do tipo feitas pelo usuário. Complexidade: O(d)."""
+        return self._contagens_usuarios.estimar((id_usuario, tipo_interacao))
+
+    def top_conteudos_por_tipo(self, tipo_interacao: str, top_n: int = 10):
+        """
+        Os `top_n` conteúdos com maior contagem estimada do tipo de interação, como pares (id_conteudo, contagem),
+        com desempate pelo menor ID. Complexidade: O(c d + c log top_n), c = conteúdos.
+        """
+        return heapq.nsmallest(top_n, ((id_conteudo, self.contagem_tipo(id_conteudo, tipo_interacao))
+                                       for id_conteudo in self._usuarios_por_conteudo),
+                               key=lambda item: (-item[1], item[0]))
+
+    def limites_erro(self):
+        """Limites configurados e os efetivos: erro relativo dos HyperLogLog e excesso máximo das contagens."""
+        return dict(self._limites, erro_relativo_hll=round(HyperLogLog(self._precisao).erro_relativo, 6),
+                    excesso_maximo_contagens=round(self._contagens.erro_absoluto, 3))
+
+    def memoria_bytes(self):
+        """
+        Bytes ocupados pelos registradores e contadores dos sketches (sem o custo dos dicionários).
+        hyperloglog_por_entidade é o máximo de cada HyperLogLog (representação densa); os esparsos ocupam menos.
+        """
+        sketches = (list(self._conteudos_por_usuario.values()) + list(self._usuarios_por_conteudo.values())
+                    + list(self._usuarios_por_plataforma.values()))
+        return {'hyperloglog_por_entidade': 1 << self._precisao,
+                'hyperloglog_total': sum(sketch.memoria_bytes() for sketch in sketches),
+                'count_min_sketch': self._contagens.memoria_bytes(),
+                'count_min_sketch_usuarios': self._contagens_usuarios.memoria_bytes()}
+
+    def relatorio(self):
+        """
+        Relatório aproximado: por conteúdo, usuários distintos e contagens por tipo estimados; por usuário,
+        conteúdos distintos estimados; por plataforma, usuários distintos estimados. Linhas ordenadas por chave.
+        Complexidade: O((c + u + p) m + c t d), t = tipos de interação.
+        """
+        conteudos = [dict({'id_conteudo': id_conteudo, 'usuarios_distintos_estimados': sketch.estimativa()},
+                          **{f'quantidade_{tipo}_estimada': self.contagem_tipo(id_conteudo, tipo)
+                             for tipo in Interacao.TIPOS_INTERACAO})
+                     for id_conteudo, sketch in sorted(self._usuarios_por_conteudo.items())]
+        usuarios = [{'id_usuario': id_usuario, 'conteudos_distintos_estimados': sketch.estimativa()}
+                    for id_usuario, sketch in sorted(self._conteudos_por_usuario.items())]
+        plataformas = [{'nome_plataforma': chave, 'usuarios_distintos_estimados': sketch.estimativa()}
+                       for chave, sketch in sorted(self._usuarios_por_plataforma.items())]
+        return {'conteudos': conteudos, 'usuarios': usuarios, 'plataformas': plataformas}
+
+    # Mesclagem e serialização
+
+    def mesclar(self, outra):
+        """Une os sketches de `outra` (mesmos limites de erro) aos desta análise e retorna self."""
+        if outra._precisao != self._precisao:
+            raise ValueError("Só é possível mesclar análises aproximadas com o mesmo erro de distintos.")
+        self._contagens.mesclar(outra._contagens)
+        self._contagens_usuarios.mesclar(outra._contagens_usuarios)
+        for proprios, outros in ((self._conteudos_por_usuario, outra._conteudos_por_usuario),
+                                 (self._usuarios_por_conteudo, outra._usuarios_por_conteudo),
+                                 (self._usuarios_por_plataforma, outra._usuarios_por_plataforma)):
+            for chave, sketch in outros.items():
+                self._sketch(proprios, chave).mesclar(sketch)
+        return self
+
+    def para_dict(self):
+        """Representação JSON: limites, Count-Min Sketches e os HyperLogLog por entidade (chaves como texto)."""
+        return {
+            'versao': VERSAO_ESTADO_APROXIMADO, 'limites': self._limites, 'contagens': self._contagens.para_dict(),
+            'contagens_usuarios': self._contagens_usuarios.para_dict(),
+            'conteudos_por_usuario': {str(chave): s.para_dict()['registradores'] for chave, s in self._conteudos_por_usuario.items()},
+            'usuarios_por_conteudo': {str(chave): s.para_dict()['registradores'] for chave, s in self._usuarios_por_conteudo.items()},
+            'usuarios_por_plataforma': {chave: s.para_dict()['registradores'] for chave, s in self._usuarios_por_plataforma.items()},
+        }
+
+    @classmethod
+    def de_dict(cls, dados):
+        """Recria a análise a partir de para_dict(). Levanta ValueError se o formato não for reconhecido."""
+        if not isinstance(dados, dict) or dados.get('versao') != VERSAO_ESTADO_APROXIMADO:
+            raise ValueError(f"Formato de análise aproximada inválido ou de versão diferente de {VERSAO_ESTADO_APROXIMADO}.")
+        analise = cls(**dados['limites'])
+        analise._contagens = CountMinSketch.de_dict(dados['contagens'])
+        analise._contagens_usuarios = CountMinSketch.de_dict(dados['contagens_usuarios'])
+        for campo, destino, converter in (('conteudos_por_usuario', analise._conteudos_por_usuario, int),
+                                          ('usuarios_por_conteudo', analise._usuarios_por_conteudo, int),
+                                          ('usuarios_por_plataforma', analise._usuarios_por_plataforma, str)):
+            for chave, registradores in dados[campo].items():
+                destino[converter(chave)] = HyperLogLog.de_dict({'precisao': analise._precisao, 'registradores': registradores})
+        return analise
@@ -0,0 +1,434 @@
+"""
+Módulo armazenamento_colunar.py
+Armazenamento alternativo (opcional) das interações em colunas contíguas.
+
+Em vez de um objeto Interacao por linha, cada campo é guardado em um `array` do módulo padrão:
+índice do conteúdo, índice do usuário, código da plataforma, código do tipo de interação,
+timestamp em segundos desde a época e duração. Textos (nomes e plataformas) são codificados
+em dicionários, e os comentários ficam em um dicionário esparso por linha.
+Isso reduz o custo por interação de centenas para dezenas de bytes.
+
+As métricas por conteúdo, usuário e plataforma são calculadas por agregações em grupo:
+com NumPy instalado usam `bincount` vetorizado; sem NumPy, um laço único sobre as colunas.
+Conteúdos e usuários sem nenhuma interação válida não aparecem nos resultados de metricas_por_*.
+
+Com SistemaAnaliseEngajamento(armazenamento='colunar'), as colunas são a única cópia das interações:
+conteúdos, usuários e plataformas guardam apenas as posições das suas interações (ListaInteracoes), o índice
+temporal também guarda posições, e cada Interacao lida é recriada a partir das colunas (interacao(posicao)),
+com interacao_id = posição + 1. A tabela completa do motor de relatórios (tabela_relatorio) é calculada por
+agregações em grupo, sem recriar interações. Como a coluna de timestamps guarda segundos inteiros, datas com
+fuso ou frações de segundo voltam como o datetime UTC (sem fuso) do segundo correspondente.
+"""
+
+import csv
+from array import array
+
+from entidades.interacao import Interacao, para_epoch
+from analise.sistema import SistemaAnaliseEngajamento, converter_linha_interacao
+from analise.motor_relatorios import TabelaRelatorio, CHAVE_PERCENTUAL, calcular_percentual_consumido
+from estruturas_dados.sketch_quantis import SketchQuantis, quantis_vazios
+
+try:
+    import numpy as np
+except ImportError:  # NumPy é opcional; sem ele usa-se a agregação em Python puro
+    np = None
+
+TIPOS_INTERACAO = Interacao.TIPOS_INTERACAO  # A posição na tupla é o código do tipo
+TIPOS_ENGAJAMENTO = ('like', 'share', 'comment')
+
+
+class ArmazenamentoColunar:
+    """
+    Coleção colunar de interações com codificação por dicionário.
+    """
+
+    def __init__(self):
+        # Colunas (uma posição por interação)
+        self._col_conteudo = array('I')
+        self._col_usuario = array('I')
+        self._col_plataforma = array('H')
+        self._col_tipo = array('B')
+        self._col_timestamp = array('q')
+        self._col_duracao = array('l')
+        self._comentarios = {}  # posição da linha -> texto do comentário (apenas linhas com comentário)
+
+        # Dicionários de codificação: valor original -> índice denso, e o caminho inverso
+        self._indice_conteudo = {}
+        self._ids_conteudo = []
+        self._nomes_conteudo = []
+        self._conteudos = []           # índice -> Conteudo (None para linhas vindas do CSV, sem objetos)
+        self._indice_usuario = {}
+        self._ids_usuario = []
+        self._indice_plataforma = {}   # nome normalizado (minúsculo) -> código
+        self._nomes_plataforma = []
+        self._plataformas = []         # código -> Plataforma (None para linhas vindas do CSV, sem objetos)
+        self._codigo_tipo = {tipo: codigo for codigo, tipo in enumerate(TIPOS_INTERACAO)}
+
+    def __len__(self):
+        """Quantidade de interações armazenadas. Complexidade: O(1)."""
+        return len(self._col_tipo)
+
+    @classmethod
+    def a_partir_do_csv(cls, caminho_arquivo: str):
+        """
+        Constrói o armazenamento a partir do CSV, com as mesmas validações e conversões do sistema.
+        Linhas inválidas são ignoradas silenciosamente. Complexidade: O(n).
+        """
+        armazenamento = cls()
+        with open(caminho_arquivo, encoding='utf-8') as f:
+            for dados in csv.DictReader(f):
+                try:
+                    SistemaAnaliseEngajamento._validar_interacao(dados)
+                    linha = converter_linha_interacao(dados)
+                except Exception:
+                    continue
+                armazenamento.adicionar_linha(linha)
+        return armazenamento
+
+    def adicionar_linha(self, linha):
+        """
+        Acrescenta uma LinhaInteracao às colunas.
+        Retorna False (sem armazenar) se a linha não formaria uma Interacao válida.
+        Complexidade: O(1) amortizado.
+        """
+        if linha.id_conteudo not in self._indice_conteudo and linha.erro_conteudo:
+            return False
+        if linha.erro_interacao or linha.tipo_interacao not in self._codigo_tipo:
+            return False
+        self._acrescentar(linha.id_conteudo, linha.nome_conteudo, linha.id_usuario, linha.nome_plataforma,
+                          linha.tipo_interacao, para_epoch(linha.timestamp_interacao),
+                          linha.watch_duration_seconds, linha.comment_text)
+        return True
+
+    def adicionar_interacao(self, interacao: Interacao):
+        """
+        Acrescenta uma Interacao já construída às colunas e retorna a interação armazenada, recriada a partir
+        delas (interacao_id = posição + 1), que é a que deve ser vinculada às entidades. Complexidade: O(1) amortizado.
+        """
+        conteudo = interacao.conteudo_associado
+        plataforma = interacao.plataforma_interacao
+        self._acrescentar(conteudo.id_conteudo, conteudo.nome_conteudo, interacao.id_usuario,
+                          plataforma.nome_plataforma, interacao.tipo_interacao, interacao.timestamp_epoch,
+                          interacao.watch_duration_seconds, interacao.comment_text, conteudo, plataforma)
+        return self.interacao(len(self._col_tipo) - 1)
+
+    def interacao(self, posicao: int):
+        """
+        Recria a Interacao da posição a partir das colunas, com interacao_id = posição + 1. Levanta ValueError
+        se as linhas vieram do CSV (a_partir_do_csv/adicionar_linha), sem objetos de conteúdo e plataforma.
+        Complexidade: O(1).
+        """
+        conteudo = self._conteudos[self._col_conteudo[posicao]]
+        plataforma = self._plataformas[self._col_plataforma[posicao]]
+        if conteudo is None or plataforma is None:
+            raise ValueError("Só é possível recriar interações acrescentadas com adicionar_interacao.")
+        return Interacao.a_partir_de_campos(
+            conteudo, plataforma, self._ids_usuario[self._col_usuario[posicao]], self._col_timestamp[posicao],
+            TIPOS_INTERACAO[self._col_tipo[posicao]], self._col_duracao[posicao], self._comentarios.get(posicao, ""),
+            interacao_id=posicao + 1)
+
+    def posicao(self, interacao: Interacao) -> int:
+        """Posição nas colunas de uma interação devolvida por este armazenamento. Complexidade: O(1)."""
+        posicao = interacao.interacao_id - 1
+        if not 0 <= posicao < len(self._col_tipo):
+            raise ValueError(f"A interação {interacao.interacao_id} não pertence ao armazenamento colunar.")
+        return posicao
+
+    def nova_lista_interacoes(self):
+        """Cria uma ListaInteracoes vazia, para uma entidade guardar suas interações como posições nas colunas."""
+        return ListaInteracoes(self)
+
+    def _acrescentar(self, id_conteudo, nome_conteudo, id_usuario, nome_plataforma, tipo, timestamp, duracao,
+                     comentario, conteudo=None, plataforma=None):
+        """Codifica os textos e acrescenta uma posição a cada coluna. Complexidade: O(1) amortizado."""
+        indice_conteudo = self._indice_conteudo.get(id_conteudo)
+        if indice_conteudo is None:
+            indice_conteudo = self._indice_conteudo[id_conteudo] = len(self._ids_conteudo)
+            self._ids_conteudo.append(id_conteudo)
+            self._nomes_conteudo.append(nome_conteudo)
+            self._conteudos.append(conteudo)
+
+        indice_usuario = self._indice_usuario.get(id_usuario)
+        if indice_usuario is None:
+            indice_usuario = self._indice_usuario[id_usuario] = len(self._ids_usuario)
+            self._ids_usuario.append(id_usuario)
+
+        chave_plataforma = nome_plataforma.strip().lower()
+        codigo_plataforma = self._indice_plataforma.get(chave_plataforma)
+        if codigo_plataforma is None:
+            codigo_plataforma = self._indice_plataforma[chave_plataforma] = len(self._nomes_plataforma)
+            self._nomes_plataforma.append(nome_plataforma.strip())
+            self._plataformas.append(plataforma)
+
+        if comentario:
+            self._comentarios[len(self._col_tipo)] = comentario
+        self._col_conteudo.append(indice_conteudo)
+        self._col_usuario.append(indice_usuario)
+        self._col_plataforma.append(codigo_plataforma)
+        self._col_tipo.append(self._codigo_tipo[tipo])
+        self._col_timestamp.append(timestamp)
+        self._col_duracao.append(duracao)
+
+    # Agregações em grupo
+
+    def _somar_por_grupo(self, codigos, pesos, tamanho):
+        """
+        Soma `pesos` agrupando por `codigos` (None = contagem). Retorna uma lista de tamanho `tamanho`.
+        Complexidade: O(n).
+        """
+        if np is not None:
+            vetor_codigos = np.frombuffer(codigos, dtype=np.dtype(codigos.typecode)) if len(codigos) else np.zeros(0, dtype=np.int64)
+            vetor_pesos = None
+            if pesos is not None and len(pesos):
+                vetor_pesos = np.frombuffer(pesos, dtype=np.dtype(pesos.typecode)).astype(np.float64)
+            resultado = np.bincount(vetor_codigos, weights=vetor_pesos, minlength=tamanho)
+            return [int(v) for v in resultado]
+        resultado = [0] * tamanho
+        if pesos is None:
+            for codigo in codigos:
+                resultado[codigo] += 1
+        else:
+            for codigo, peso in zip(codigos, pesos):
+                resultado[codigo] += peso
+        return resultado
+
+    def _contagem_por_grupo_e_tipo(self, codigos, tamanho):
+        """Retorna, para cada grupo, a lista de contagens por código de tipo. Complexidade: O(n)."""
+        quantidade_tipos = len(TIPOS_INTERACAO)
+        if np is not None and len(codigos):
+            vetor_codigos = np.frombuffer(codigos, dtype=np.dtype(codigos.typecode)).astype(np.int64)
+            vetor_tipos = np.frombuffer(self._col_tipo, dtype=np.uint8).astype(np.int64)
+            combinados = np.bincount(vetor_codigos * quantidade_tipos + vetor_tipos,
+                                     minlength=tamanho * quantidade_tipos)
+            return combinados.reshape(tamanho, quantidade_tipos).tolist()
+        resultado = [[0] * quantidade_tipos for _ in range(tamanho)]
+        for codigo, tipo in zip(codigos, self._col_tipo):
+            resultado[codigo][tipo] += 1
+        return resultado
+
+    def _distintos_por_grupo(self, codigos, valores, tamanho):
+        """Conta quantos `valores` distintos existem em cada grupo. Complexidade: O(n) (O(n log n) com NumPy)."""
+        if np is not None and len(codigos):
+            vetor_codigos = np.frombuffer(codigos, dtype=np.dtype(codigos.typecode)).astype(np.int64)
+            vetor_valores = np.frombuffer(valores, dtype=np.dtype(valores.typecode)).astype(np.int64)
+            pares = np.unique(vetor_codigos * (int(vetor_valores.max()) + 1) + vetor_valores)
+            grupos = pares // (int(vetor_valores.max()) + 1)
+            return np.bincount(grupos, minlength=tamanho).tolist()
+        conjuntos = [set() for _ in range(tamanho)]
+        for codigo, valor in zip(codigos, valores):
+            conjuntos[codigo].add(valor)
+        return [len(conjunto) for conjunto in conjuntos]
+
+    def _frequencias_por_grupo(self, codigos, valores, tamanho):
+        """
+        Para cada grupo, lista de (valor, quantidade, primeira posição) dos `valores` que aparecem nele.
+        Complexidade: O(n) (O(n log n) com NumPy).
+        """
+        resultado = [[] for _ in range(tamanho)]
+        if np is not None and len(codigos):
+            vetor_codigos = np.frombuffer(codigos, dtype=np.dtype(codigos.typecode)).astype(np.int64)
+            vetor_valores = np.frombuffer(valores, dtype=np.dtype(valores.typecode)).astype(np.int64)
+            base = int(vetor_valores.max()) + 1
+            pares, primeiras, quantidades = np.unique(vetor_codigos * base + vetor_valores,
+                                                      return_index=True, return_counts=True)
+            for par, primeira, quantidade in zip(pares.tolist(), primeiras.tolist(), quantidades.tolist()):
+                resultado[par // base].append((par % base, quantidade, primeira))
+            return resultado
+        por_par = {}
+        for posicao, (codigo, valor) in enumerate(zip(codigos, valores)):
+            frequencia = por_par.get((codigo, valor))
+            if frequencia is None:
+                por_par[(codigo, valor)] = [1, posicao]
+            else:
+                frequencia[0] += 1
+        for (codigo, valor), (quantidade, primeira) in por_par.items():
+            resultado[codigo].append((valor, quantidade, primeira))
+        return resultado
+
+    def _quantis_por_entidade(self):
+        """
+        Quantis do tempo das sessões de consumo ('view_start' ou duração positiva, ver e_sessao_consumo)
+        de cada conteúdo, usuário e plataforma, em uma única passada. Complexidade: O(n).
+        """
+        sketches = ([None] * len(self._ids_conteudo), [None] * len(self._ids_usuario),
+                    [None] * len(self._nomes_plataforma))  # Cada sketch é criado na primeira sessão da entidade
+        codigo_visualizacao = self._codigo_tipo['view_start']
+        for conteudo, usuario, plataforma, tipo, duracao in zip(self._col_conteudo, self._col_usuario,
+                                                                self._col_plataforma, self._col_tipo,
+                                                                self._col_duracao):
+            if tipo == codigo_visualizacao or duracao > 0:
+                for grupo, indice in zip(sketches, (conteudo, usuario, plataforma)):
+                    if grupo[indice] is None:
+                        grupo[indice] = SketchQuantis()
+                    grupo[indice].adicionar(duracao)
+        return tuple([quantis_vazios() if sketch is None else sketch.quantis() for sketch in grupo]
+                     for grupo in sketches)
+
+    def _metricas_base(self, codigos, tamanho):
+        """Contagens por tipo, engajamento, tempo total e média para cada grupo. Complexidade: O(n)."""
+        por_tipo = self._contagem_por_grupo_e_tipo(codigos, tamanho)
+        totais = self._somar_por_grupo(codigos, None, tamanho)
+        tempos = self._somar_por_grupo(codigos, self._col_duracao, tamanho)
+        codigos_engajamento = [self._codigo_tipo[t] for t in TIPOS_ENGAJAMENTO]
+        metricas = []
+        for grupo in range(tamanho):
+            contagens = por_tipo[grupo]
+            metricas.append({
+                "total_interacoes": totais[grupo],
+                "total_interacoes_engajamento": sum(contagens[c] for c in codigos_engajamento),
+                "contagem_por_tipo_interacao": {TIPOS_INTERACAO[c]: q for c, q in enumerate(contagens) if q},
+                "tempo_total_consumo": tempos[grupo],
+                "media_tempo_consumo": tempos[grupo] / totais[grupo] if totais[grupo] else 0,
+            })
+        return metricas
+
+    def metricas_por_conteudo(self):
+        """
+        Retorna {id_conteudo: métricas} com engajamento, contagem por tipo, tempo total,
+        média de consumo e quantidade de comentários. Complexidade: O(n).
+        """
+        metricas = self._metricas_base(self._col_conteudo, len(self._ids_conteudo))
+        codigo_comentario = self._codigo_tipo['comment']
+        comentarios = [0] * len(self._ids_conteudo)
+        for posicao in self._comentarios:
+            if self._col_tipo[posicao] == codigo_comentario:
+                comentarios[self._col_conteudo[posicao]] += 1
+        resultado = {}
+        for indice, id_conteudo in enumerate(self._ids_conteudo):
+            metricas[indice]["nome_conteudo"] = self._nomes_conteudo[indice]
+            metricas[indice]["quantidade_comentarios"] = comentarios[indice]
+            resultado[id_conteudo] = metricas[indice]
+        return resultado
+
+    def metricas_por_usuario(self):
+        """
+        Retorna {id_usuario: métricas} com quantidade de interações, contagem por tipo,
+        tempo total assistido e quantidade de conteúdos distintos. Complexidade: O(n).
+        """
+        metricas = self._metricas_base(self._col_usuario, len(self._ids_usuario))
+        distintos = self._distintos_por_grupo(self._col_usuario, self._col_conteudo, len(self._ids_usuario))
+        resultado = {}
+        for indice, id_usuario in enumerate(self._ids_usuario):
+            metricas[indice]["quantidade_conteudos"] = distintos[indice]
+            resultado[id_usuario] = metricas[indice]
+        return resultado
+
+    def metricas_por_plataforma(self):
+        """
+        Retorna {nome_plataforma: métricas} com engajamento, tempo total e médio de consumo.
+        Complexidade: O(n).
+        """
+        metricas = self._metricas_base(self._col_plataforma, len(self._nomes_plataforma))
+        return {nome: metricas[codigo] for codigo, nome in enumerate(self._nomes_plataforma)}
+
+    def comentarios_do_conteudo(self, id_conteudo: int):
+        """Lista os comentários de um conteúdo, na ordem de chegada. Complexidade: O(c), c = comentários totais."""
+        indice = self._indice_conteudo.get(id_conteudo)
+        codigo_comentario = self._codigo_tipo['comment']
+        return [texto for posicao, texto in self._comentarios.items()
+                if self._col_conteudo[posicao] == indice and self._col_tipo[posicao] == codigo_comentario]
+
+    # Motor de relatórios
+
+    def tabela_relatorio(self, conteudos, usuarios, plataformas):
+        """
+        Monta a TabelaRelatorio do motor de relatórios (as mesmas linhas e métricas de calcular_tabela)
+        pelas agregações em grupo sobre as colunas, sem percorrer objetos Interacao.
+        `conteudos`, `usuarios` e `plataformas` (pares (chave normalizada, Plataforma)) definem as linhas
+        e sua ordem; toda entidade presente nas colunas deve estar entre eles.
+        Empates em plataformas_mais_frequentes seguem a posição da primeira interação em cada plataforma.
+        Complexidade: O(k + c + u + p) (O(k log k) com NumPy, pela contagem de distintos).
+        """
+        metricas_conteudos = self._metricas_base(self._col_conteudo, len(self._ids_conteudo))
+        metricas_usuarios = self._metricas_base(self._col_usuario, len(self._ids_usuario))
+        metricas_plataformas = self._metricas_base(self._col_plataforma, len(self._nomes_plataforma))
+        distintos = self._distintos_por_grupo(self._col_usuario, self._col_conteudo, len(self._ids_usuario))
+        frequencias = self._frequencias_por_grupo(self._col_usuario, self._col_plataforma, len(self._ids_usuario))
+        quantis_conteudos, quantis_usuarios, quantis_plataformas = self._quantis_por_entidade()
+        comentarios = [[] for _ in self._ids_conteudo]
+        codigo_comentario = self._codigo_tipo['comment']
+        for posicao, texto in self._comentarios.items():  # Posições em ordem crescente: ordem de chegada
+            if self._col_tipo[posicao] == codigo_comentario:
+                comentarios[self._col_conteudo[posicao]].append(texto)
+        vazia = {"total_interacoes": 0, "total_interacoes_engajamento": 0, "contagem_por_tipo_interacao": {},
+                 "tempo_total_consumo": 0, "media_tempo_consumo": 0}
+        sem_quantis = quantis_vazios()
+
+        linhas_conteudos = {}
+        for conteudo in conteudos:
+            indice = self._indice_conteudo.get(conteudo.id_conteudo)
+            metricas = vazia if indice is None else metricas_conteudos[indice]
+            linha = {'conteudo': conteudo, 'id_conteudo': conteudo.id_conteudo, 'nome_conteudo': conteudo.nome_conteudo,
+                     'total_interacoes': metricas['total_interacoes'],
+                     'total_interacoes_engajamento': metricas['total_interacoes_engajamento'],
+                     'contagem_por_tipo_interacao': dict(metricas['contagem_por_tipo_interacao']),
+                     'tempo_total_consumo': metricas['tempo_total_consumo'],
+                     'comentarios': [] if indice is None else comentarios[indice],
+                     'media_tempo_consumo': metricas['media_tempo_consumo']}
+            linha[CHAVE_PERCENTUAL.get(type(conteudo).__name__, 'percentual_medio_assistido')] = \
+                calcular_percentual_consumido(linha['media_tempo_consumo'], conteudo.duracao_total)
+            linha['quantis_tempo_consumo'] = dict(sem_quantis) if indice is None else quantis_conteudos[indice]
+            linhas_conteudos[conteudo.id_conteudo] = linha
+
+        objetos_plataforma = {}  # código -> Plataforma
+        for chave, plataforma in plataformas:
+            codigo = self._indice_plataforma.get(chave)
+            if codigo is not None:
+                objetos_plataforma[codigo] = plataforma
+        linhas_usuarios = {}
+        for usuario in usuarios:
+            indice = self._indice_usuario.get(usuario.id_usuario)
+            metricas = vazia if indice is None else metricas_usuarios[indice]
+            ordenadas = [] if indice is None else sorted(frequencias[indice], key=lambda f: (-f[1], f[2]))
+            linhas_usuarios[usuario.id_usuario] = {
+                'id_usuario': usuario.id_usuario, 'quantidade_interacoes': metricas['total_interacoes'],
+                'contagem_por_tipo_interacao': dict(metricas['contagem_por_tipo_interacao']),
+                'tempo_total_assistido': metricas['tempo_total_consumo'],
+                'quantidade_conteudos': 0 if indice is None else distintos[indice],
+                'plataformas_mais_frequentes': [(objetos_plataforma[codigo], quantidade)
+                                                for codigo, quantidade, _ in ordenadas],
+                'quantis_tempo_consumo': dict(sem_quantis) if indice is None else quantis_usuarios[indice],
+            }
+
+        linhas_plataformas = {}
+        for chave, plataforma in plataformas:
+            codigo = self._indice_plataforma.get(chave)
+            metricas = vazia if codigo is None else metricas_plataformas[codigo]
+            linhas_plataformas[chave] = {
+                'plataforma': plataforma, 'nome_plataforma': plataforma.nome_plataforma,
+                'total_interacoes': metricas['total_interacoes'],
+                'total_interacoes_engajamento': metricas['total_interacoes_engajamento'],
+                'tempo_total_consumo': metricas['tempo_total_consumo'],
+                'media_tempo_consumo': metricas['media_tempo_consumo'],
+                'quantis_tempo_consumo': dict(sem_quantis) if codigo is None else quantis_plataformas[codigo],
+            }
+        return TabelaRelatorio(linhas_conteudos, linhas_usuarios, linhas_plataformas)
+
+
+class ListaInteracoes:
+    """
+    Interações de uma entidade no armazenamento colunar: guarda apenas as posições nas colunas (4 bytes cada)
+    e recria as interações ao ser percorrida. Só aceita interações devolvidas pelo próprio armazenamento.
+    """
+    __slots__ = ('_armazenamento', '_posicoes')
+
+    def __init__(self, armazenamento: ArmazenamentoColunar):
+        self._armazenamento = armazenamento
+        self._posicoes = array('I')
+
+    def append(self, interacao):
+        """Acrescenta a interação pela sua posição nas colunas. Complexidade: O(1) amortizado."""
+        self._posicoes.append(self._armazenamento.posicao(interacao))
+
+    def __len__(self):
+        return len(self._posicoes)
+
+    def __iter__(self):
+        """Gera as interações recriadas, na ordem em que foram acrescentadas. Complexidade: O(k)."""
+        recriar = self._armazenamento.interacao
+        return (recriar(posicao) for posicao in self._posicoes)
+
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            return [self._armazenamento.interacao(posicao) for posicao in self._posicoes[indice]]
+        return self._armazenamento.interacao(self._posicoes[indice])
@@ -0,0 +1,71 @@
+"""
+Módulo carga_diretorio.py
+Carga de vários arquivos CSV de interações (um diretório ou um padrão glob) em paralelo.
+
+Cada arquivo é lido, validado e convertido de forma independente em um processo (ou thread) do pool,
+produzindo um EstadoParcial: as LinhaInteracao do arquivo, os avisos de validação e as contagens.
+Os estados parciais são então mesclados no sistema na ordem dos arquivos (ver
+SistemaAnaliseEngajamento.mesclar_estado_parcial): conteúdos e usuários são unificados pelo ID nas árvores
+e plataformas pelo nome normalizado, de modo que o resultado é o mesmo da carga serial dos arquivos
+concatenados. A vinculação acontece no processo principal porque as entidades e os IDs das interações
+são compartilhados entre todos os arquivos.
+"""
+
+import glob
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from analise.carga_paralela import dividir_em_intervalos, _processar_intervalo
+
+# Resultado da leitura de um arquivo, serializável para ser devolvido por outro processo.
+# `linhas` contém LinhaInteracao ou mensagens de erro de conversão; `avisos` contém (linha, mensagem).
+EstadoParcial = namedtuple('EstadoParcial', ['arquivo', 'linhas', 'avisos', 'total_registros'])
+
+
+def listar_arquivos_csv(caminho_ou_padrao: str):
+    """
+    Retorna, em ordem alfabética, os arquivos .csv do diretório informado ou os arquivos que
+    correspondem ao padrão glob (ex.: 'dados/interacoes_*.csv').
+    Levanta FileNotFoundError se nenhum arquivo for encontrado. Complexidade: O(a log a), a = arquivos.
+    """
+    if os.path.isdir(caminho_ou_padrao):
+        arquivos = glob.glob(os.path.join(caminho_ou_padrao, '*.csv'))
+    else:
+        arquivos = glob.glob(caminho_ou_padrao)
+    arquivos = sorted(arquivo for arquivo in arquivos if os.path.isfile(arquivo))
+    if not arquivos:
+        raise FileNotFoundError(f"Nenhum arquivo CSV encontrado em: {caminho_ou_padrao}")
+    return arquivos
+
+
+def ler_estado_parcial(caminho_arquivo: str):
+    """
+    Executado no pool: lê, valida e converte um arquivo inteiro, com os números de linha dos avisos
+    relativos ao próprio arquivo (o cabeçalho é a linha 1).
+    Complexidade: O(k), k = linhas do arquivo.
+    """
+    cabecalho, intervalos = dividir_em_intervalos(caminho_arquivo, 1)
+    if not intervalos:
+        return EstadoParcial(caminho_arquivo, [], [], 0)
+    inicio, fim = intervalos[0][0], intervalos[-1][1]
+    linhas, avisos, total_registros, _ = _processar_intervalo(caminho_arquivo, cabecalho, inicio, fim)
+    avisos = [(1 + numero, mensagem) for numero, mensagem in avisos]
+    return EstadoParcial(caminho_arquivo, linhas, avisos, total_registros)
+
+
+def carregar_estados_parciais(arquivos, processos: int = None, usar_threads: bool = False):
+    """
+    Gerador que distribui os arquivos entre `processos` trabalhadores (padrão: núcleos da CPU) e produz
+    os EstadoParcial na ordem da lista, assim que cada um (e todos os anteriores) estiver pronto.
+    Com usar_threads=True usa um pool de threads, que evita copiar os resultados entre processos,
+    mas a leitura fica limitada pelo GIL.
+    """
+    processos = min(processos or os.cpu_count() or 1, len(arquivos)) or 1
+    if processos == 1:
+        for arquivo in arquivos:
+            yield ler_estado_parcial(arquivo)
+        return
+    executor = ThreadPoolExecutor if usar_threads else ProcessPoolExecutor
+    with executor(max_workers=processos) as pool:
+        yield from pool.map(ler_estado_parcial, arquivos)
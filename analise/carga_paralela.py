@@ -0,0 +1,153 @@
+"""
+Módulo carga_paralela.py
+Leitura e validação do CSV de interações em múltiplos processos.
+
+O arquivo é dividido em intervalos de bytes cujas fronteiras são ajustadas para o início de uma linha.
+Cada processo lê apenas o seu intervalo, valida as linhas e devolve tuplas LinhaInteracao já convertidas.
+Observação: como a divisão é feita por quebras de linha físicas, o arquivo não pode conter
+campos entre aspas com quebras de linha internas.
+"""
+
+import csv
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from analise.sistema import SistemaAnaliseEngajamento, converter_linha_interacao
+
+
+def dividir_em_intervalos(caminho_arquivo: str, partes: int):
+    """
+    Lê o cabeçalho e divide o restante do arquivo em até `partes` intervalos [inicio, fim) de bytes,
+    cada um começando no início de uma linha.
+    Retorna (cabecalho, intervalos). Complexidade: O(partes) leituras de linha.
+    """
+    tamanho = os.path.getsize(caminho_arquivo)
+    with open(caminho_arquivo, 'rb') as f:
+        linha_cabecalho = f.readline()
+        inicio_dados = f.tell()
+        cabecalho = next(csv.reader([linha_cabecalho.decode('utf-8')]), [])
+
+        fronteiras = [inicio_dados]
+        passo = max(1, (tamanho - inicio_dados) // max(1, partes))
+        for i in range(1, partes):
+            posicao = inicio_dados + i * passo
+            if posicao <= fronteiras[-1]:
+                continue
+            f.seek(posicao - 1)
+            f.readline()  # Avança até o fim da linha em que a posição caiu
+            fronteira = f.tell()
+            if fronteira >= tamanho:
+                break
+            if fronteira > fronteiras[-1]:
+                fronteiras.append(fronteira)
+        fronteiras.append(tamanho)
+
+    intervalos = [(fronteiras[i], fronteiras[i + 1]) for i in range(len(fronteiras) - 1) if fronteiras[i] < fronteiras[i + 1]]
+    return cabecalho, intervalos
+
+
+def posicao_apos_ultima_quebra(arquivo, inicio: int, fim: int, tamanho_bloco: int = 8192):
+    """
+    Retorna a posição logo após a última quebra de linha do intervalo [inicio, fim) do arquivo binário
+    aberto, ou `inicio` se não houver nenhuma. Lê blocos de trás para frente a partir de `fim`.
+    Complexidade: O(tamanho da última linha).
+    """
+    posicao = fim
+    while posicao > inicio:
+        inicio_bloco = max(inicio, posicao - tamanho_bloco)
+        arquivo.seek(inicio_bloco)
+        indice = arquivo.read(posicao - inicio_bloco).rfind(b'\n')
+        if indice >= 0:
+            return inicio_bloco + indice + 1
+        posicao = inicio_bloco
+    return inicio
+
+
+def iterar_intervalo(caminho_arquivo: str, cabecalho: list, inicio: int, fim: int, contagens: dict,
+                     max_registros: int = None):
+    """
+    Gerador que lê o intervalo [inicio, fim) em fluxo, linha a linha, validando e convertendo cada registro.
+    Produz pares (numero_linha, resultado), com o número de linha relativo ao início do intervalo e
+    o resultado sendo uma LinhaInteracao, a mensagem (str) de uma falha de conversão ou o ValueError
+    da validação. Com max_registros, para depois dessa quantidade de registros.
+    Ao final, `contagens` recebe 'total_registros', 'linhas_fisicas' e 'posicao' (byte logo após
+    a última linha lida).
+    Complexidade: O(k) tempo, k = linhas do intervalo; O(1) de memória além de cada linha.
+    """
+    with open(caminho_arquivo, 'rb') as f:
+        f.seek(inicio)
+        restante = fim - inicio
+
+        def linhas_texto():
+            nonlocal restante
+            while restante > 0:
+                linha = f.readline(restante)
+                if not linha:
+                    return
+                restante -= len(linha)
+                yield linha.decode('utf-8')
+
+        leitor = csv.DictReader(linhas_texto(), fieldnames=cabecalho)
+        total_registros = 0
+        for dados in leitor:
+            total_registros += 1
+            try:
+                SistemaAnaliseEngajamento._validar_interacao(dados)
+            except ValueError as e:
+                yield leitor.line_num, e
+            else:
+                try:
+                    resultado = converter_linha_interacao(dados)
+                except Exception as e:
+                    resultado = str(e)  # Mensagem de erro repassada a quem vincula as linhas
+                yield leitor.line_num, resultado
+            if total_registros == max_registros:
+                break
+        # O leitor consome uma linha física por registro, então `restante` marca exatamente onde a leitura parou
+        contagens.update(total_registros=total_registros, linhas_fisicas=leitor.line_num, posicao=fim - restante)
+
+
+def _processar_intervalo(caminho_arquivo: str, cabecalho: list, inicio: int, fim: int):
+    """
+    Executado em um processo filho: lê o intervalo [inicio, fim), valida e converte cada linha.
+    Retorna (linhas, avisos, total_registros, linhas_fisicas), onde os números de linha dos avisos
+    são relativos ao início do intervalo.
+    Complexidade: O(k), k = linhas do intervalo.
+    """
+    linhas = []
+    avisos = []
+    contagens = {}
+    for numero_linha, resultado in iterar_intervalo(caminho_arquivo, cabecalho, inicio, fim, contagens):
+        if isinstance(resultado, ValueError):
+            avisos.append((numero_linha, str(resultado)))
+        else:
+            linhas.append(resultado)
+    return linhas, avisos, contagens['total_registros'], contagens['linhas_fisicas']
+
+
+def carregar_lotes_paralelo(caminho_arquivo: str, processos: int = None, checkpoint: dict = None):
+    """
+    Gerador que distribui os intervalos do arquivo entre `processos` processos (padrão: núcleos da CPU)
+    e produz, na ordem do arquivo, tuplas (linhas, avisos, total_registros) com os números
+    de linha dos avisos já convertidos para a numeração global do arquivo.
+    Se `checkpoint` for informado, recebe ao final o ponto de parada para a carga incremental
+    ({'offset', 'linha', 'cabecalho'}).
+    """
+    processos = processos or os.cpu_count() or 1
+    cabecalho, intervalos = dividir_em_intervalos(caminho_arquivo, processos)
+    if not intervalos:
+        if checkpoint is not None and cabecalho:  # Apenas o cabeçalho
+            checkpoint.update(offset=os.path.getsize(caminho_arquivo), linha=1, cabecalho=cabecalho)
+        return
+
+    linhas_anteriores = 1  # O cabeçalho ocupa a primeira linha
+    with ProcessPoolExecutor(max_workers=min(processos, len(intervalos))) as executor:
+        futuros = [executor.submit(_processar_intervalo, caminho_arquivo, cabecalho, inicio, fim)
+                   for inicio, fim in intervalos]
+        for futuro in futuros:
+            linhas, avisos, total_registros, linhas_fisicas = futuro.result()
+            avisos = [(linhas_anteriores + numero, mensagem) for numero, mensagem in avisos]
+            linhas_anteriores += linhas_fisicas
+            yield linhas, avisos, total_registros
+    if checkpoint is not None:
+        checkpoint.update(offset=intervalos[-1][1], linha=linhas_anteriores, cabecalho=cabecalho)
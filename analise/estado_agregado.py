@@ -0,0 +1,383 @@
+"""
+Módulo estado_agregado.py
+Estado agregado serializável e mesclável, para processar as interações em shards (por exemplo,
+um processo ou máquina por faixa de IDs de usuário) e combinar os resultados depois.
+
+O EstadoAgregado guarda, por conteúdo, usuário e plataforma, apenas contagens, somas, contadores por tipo
+de interação e conjuntos de IDs distintos, além de um sketch de quantis (SketchQuantis) dos tempos das
+sessões de consumo, 'view_start' ou duração positiva (nunca as interações em si); o sketch só é criado na
+primeira sessão, e entidades sem consumo guardam None (null no JSON). A mesclagem soma contagens e une
+conjuntos, então é associativa: combinar os shards em qualquer agrupamento produz o mesmo estado, e o
+relatório gerado a partir dele é exatamente o de um único processo com todas as interações.
+Para que o resultado não dependa da ordem dos shards, os comentários são guardados com o timestamp e
+listados em ordem cronológica, e as linhas do relatório são ordenadas por ID (ou nome da plataforma).
+Se o mesmo ID de conteúdo aparecer com nomes diferentes em shards diferentes, vale o do primeiro estado mesclado.
+
+O estado é gravado em JSON compacto (salvar/carregar). Uso local, dividindo um CSV em shards por usuário:
+    python -m analise.estado_agregado dividir interacoes.csv --partes 4 --saida shards/
+    python -m analise.estado_agregado estado shards/shard_0.csv --saida estados/shard_0.json
+    python -m analise.estado_agregado mesclar estados/*.json --saida total.json --relatorio relatorio.json
+"""
+
+import argparse
+import csv
+import json
+import os
+
+from analise.motor_relatorios import (TIPOS_ENGAJAMENTO, CHAVE_PERCENTUAL, calcular_percentual_consumido,
+                                      adicionar_sessao, quantis_do_sketch)
+from entidades.interacao import e_sessao_consumo
+from estruturas_dados.sketch_quantis import SketchQuantis
+
+VERSAO_ESTADO = 2
+
+
+class EstadoAgregado:
+    """
+    Agregados de engajamento por entidade:
+    - conteudos: id_conteudo -> tipo, nome, duração total, contagens, tempo de consumo e comentários (timestamp, texto);
+    - usuarios: id_usuario -> contagens, tempo assistido, IDs de conteúdos distintos e interações por plataforma
+      (na ordem da primeira interação em cada uma, para o desempate de plataformas_mais_frequentes);
+    - plataformas: nome normalizado (minúsculo) -> nome, contagens e tempo de consumo.
+    """
+
+    def __init__(self):
+        self.conteudos = {}
+        self.usuarios = {}
+        self.plataformas = {}
+
+    # Construção
+
+    def registrar_conteudo(self, conteudo):
+        """Inclui o conteúdo (mesmo sem interações), se ainda não estiver no estado. Complexidade: O(1)."""
+        linha = self.conteudos.get(conteudo.id_conteudo)
+        if linha is None:
+            linha = self.conteudos[conteudo.id_conteudo] = {
+                'tipo': type(conteudo).__name__, 'nome': conteudo.nome_conteudo, 'duracao_total': conteudo.duracao_total,
+                'total_interacoes': 0, 'total_interacoes_engajamento': 0, 'contagem_por_tipo_interacao': {},
+                'tempo_total_consumo': 0, 'comentarios': [], 'quantis_consumo': None,
+            }
+        return linha
+
+    def registrar_usuario(self, id_usuario: int):
+        """Inclui o usuário (mesmo sem interações), se ainda não estiver no estado. Complexidade: O(1)."""
+        linha = self.usuarios.get(id_usuario)
+        if linha is None:
+            linha = self.usuarios[id_usuario] = {
+                'quantidade_interacoes': 0, 'contagem_por_tipo_interacao': {}, 'tempo_total_assistido': 0,
+                'conteudos': set(), 'plataformas': {}, 'quantis_consumo': None,
+            }
+        return linha
+
+    def registrar_plataforma(self, plataforma):
+        """Inclui a plataforma (mesmo sem interações), se ainda não estiver no estado. Complexidade: O(1)."""
+        chave = plataforma.nome_plataforma.strip().lower()
+        linha = self.plataformas.get(chave)
+        if linha is None:
+            linha = self.plataformas[chave] = {
+                'nome_plataforma': plataforma.nome_plataforma, 'total_interacoes': 0,
+                'total_interacoes_engajamento': 0, 'tempo_total_consumo': 0, 'quantis_consumo': None,
+            }
+        return linha
+
+    def adicionar_interacao(self, interacao):
+        """Acumula uma interação nos agregados do conteúdo, do usuário e da plataforma. Complexidade: O(1)."""
+        conteudo = interacao.conteudo_associado
+        tipo = interacao.tipo_interacao
+        duracao = interacao.watch_duration_seconds
+        engajamento = tipo in TIPOS_ENGAJAMENTO
+        sessao = e_sessao_consumo(tipo, duracao)
+
+        linha = self.registrar_conteudo(conteudo)
+        linha['total_interacoes'] += 1
+        linha['contagem_por_tipo_interacao'][tipo] = linha['contagem_por_tipo_interacao'].get(tipo, 0) + 1
+        if engajamento:
+            linha['total_interacoes_engajamento'] += 1
+            if tipo == 'comment' and interacao.comment_text:
+                linha['comentarios'].append((interacao.timestamp_epoch, interacao.comment_text))
+        linha['tempo_total_consumo'] += duracao
+        if sessao:
+            adicionar_sessao(linha, duracao)
+
+        linha = self.registrar_plataforma(interacao.plataforma_interacao)
+        linha['total_interacoes'] += 1
+        if engajamento:
+            linha['total_interacoes_engajamento'] += 1
+        linha['tempo_total_consumo'] += duracao
+        if sessao:
+            adicionar_sessao(linha, duracao)
+
+        linha = self.registrar_usuario(interacao.id_usuario)
+        linha['quantidade_interacoes'] += 1
+        linha['contagem_por_tipo_interacao'][tipo] = linha['contagem_por_tipo_interacao'].get(tipo, 0) + 1
+        linha['tempo_total_assistido'] += duracao
+        if sessao:
+            adicionar_sessao(linha, duracao)
+        linha['conteudos'].add(conteudo.id_conteudo)
+        chave = interacao.plataforma_interacao.nome_plataforma.strip().lower()
+        linha['plataformas'][chave] = linha['plataformas'].get(chave, 0) + 1
+
+    @classmethod
+    def de_sistema(cls, sistema):
+        """
+        Cria o estado de um SistemaAnaliseEngajamento já carregado, incluindo entidades sem interações.
+        As interações são percorridas usuário a usuário, na ordem em que cada um as registrou.
+        Complexidade: O(k + c + u + p), k = interações.
+        """
+        estado = cls()
+        for conteudo in sistema.listar_conteudos():
+            estado.registrar_conteudo(conteudo)
+        for plataforma in sistema.listar_plataformas():
+            estado.registrar_plataforma(plataforma)
+        for usuario in sistema.listar_usuarios():
+            estado.registrar_usuario(usuario.id_usuario)
+            for interacao in usuario.interacoes:
+                estado.adicionar_interacao(interacao)
+        return estado
+
+    # Mesclagem
+
+    def mesclar(self, outro):
+        """
+        Acumula `outro` neste estado e retorna self. Entidades presentes nos dois são unificadas pelo ID
+        (ou nome normalizado da plataforma); os dados descritivos (nome, tipo, duração) do primeiro prevalecem.
+        Complexidade: O(c + u + p + d) do outro estado, d = conteúdos distintos somados de todos os usuários.
+        """
+        for id_conteudo, dados in outro.conteudos.items():
+            linha = self.conteudos.get(id_conteudo)
+            if linha is None:
+                self.conteudos[id_conteudo] = _copiar_linha(dados)
+                continue
+            for campo in ('total_interacoes', 'total_interacoes_engajamento', 'tempo_total_consumo'):
+                linha[campo] += dados[campo]
+            _somar_contagens(linha['contagem_por_tipo_interacao'], dados['contagem_por_tipo_interacao'])
+            linha['comentarios'].extend(dados['comentarios'])
+            _mesclar_quantis(linha, dados)
+        for id_usuario, dados in outro.usuarios.items():
+            linha = self.usuarios.get(id_usuario)
+            if linha is None:
+                self.usuarios[id_usuario] = _copiar_linha(dados)
+                continue
+            linha['quantidade_interacoes'] += dados['quantidade_interacoes']
+            linha['tempo_total_assistido'] += dados['tempo_total_assistido']
+            _somar_contagens(linha['contagem_por_tipo_interacao'], dados['contagem_por_tipo_interacao'])
+            _somar_contagens(linha['plataformas'], dados['plataformas'])
+            linha['conteudos'] |= dados['conteudos']
+            _mesclar_quantis(linha, dados)
+        for chave, dados in outro.plataformas.items():
+            linha = self.plataformas.get(chave)
+            if linha is None:
+                self.plataformas[chave] = _copiar_linha(dados)
+                continue
+            for campo in ('total_interacoes', 'total_interacoes_engajamento', 'tempo_total_consumo'):
+                linha[campo] += dados[campo]
+            _mesclar_quantis(linha, dados)
+        return self
+
+    # Relatório
+
+    def relatorio(self):
+        """
+        Retorna o relatório geral (listas de dicionários 'conteudos', 'usuarios' e 'plataformas'),
+        com as métricas definidas como em Conteudo, Usuario e Plataforma e no motor de relatórios.
+        Complexidade: O(c log c + u log u + p log p + m log m), m = comentários.
+        """
+        conteudos = []
+        for id_conteudo in sorted(self.conteudos):
+            dados = self.conteudos[id_conteudo]
+            media = dados['tempo_total_consumo'] / dados['total_interacoes'] if dados['total_interacoes'] else 0
+            conteudos.append({
+                'id_conteudo': id_conteudo, 'nome_conteudo': dados['nome'], 'tipo_conteudo': dados['tipo'],
+                'total_interacoes': dados['total_interacoes'],
+                'total_interacoes_engajamento': dados['total_interacoes_engajamento'],
+                'contagem_por_tipo_interacao': dict(dados['contagem_por_tipo_interacao']),
+                'tempo_total_consumo': dados['tempo_total_consumo'], 'media_tempo_consumo': media,
+                CHAVE_PERCENTUAL.get(dados['tipo'], 'percentual_medio_assistido'):
+                    calcular_percentual_consumido(media, dados['duracao_total']),
+                'quantis_tempo_consumo': quantis_do_sketch(dados['quantis_consumo']),
+                'comentarios': [texto for _, texto in sorted(dados['comentarios'])],
+            })
+        usuarios = []
+        for id_usuario in sorted(self.usuarios):
+            dados = self.usuarios[id_usuario]
+            frequentes = sorted(dados['plataformas'].items(), key=lambda item: -item[1])  # Estável: empates na ordem de chegada
+            usuarios.append({
+                'id_usuario': id_usuario, 'quantidade_interacoes': dados['quantidade_interacoes'],
+                'contagem_por_tipo_interacao': dict(dados['contagem_por_tipo_interacao']),
+                'quantidade_conteudos': len(dados['conteudos']), 'tempo_total_assistido': dados['tempo_total_assistido'],
+                'quantis_tempo_consumo': quantis_do_sketch(dados['quantis_consumo']),
+                'plataformas_mais_frequentes': [(self._nome_plataforma(chave), quantidade) for chave, quantidade in frequentes],
+            })
+        plataformas = []
+        for chave in sorted(self.plataformas):
+            dados = self.plataformas[chave]
+            plataformas.append({
+                'nome_plataforma': dados['nome_plataforma'], 'total_interacoes': dados['total_interacoes'],
+                'total_interacoes_engajamento': dados['total_interacoes_engajamento'],
+                'tempo_total_consumo': dados['tempo_total_consumo'],
+                'media_tempo_consumo': dados['tempo_total_consumo'] / dados['total_interacoes'] if dados['total_interacoes'] else 0,
+                'quantis_tempo_consumo': quantis_do_sketch(dados['quantis_consumo']),
+            })
+        return {'conteudos': conteudos, 'usuarios': usuarios, 'plataformas': plataformas}
+
+    def _nome_plataforma(self, chave):
+        plataforma = self.plataformas.get(chave)
+        return plataforma['nome_plataforma'] if plataforma else chave
+
+    # Serialização
+
+    def para_dict(self):
+        """
+        Representação JSON do estado: IDs como texto, conjuntos como listas ordenadas e comentários em
+        ordem cronológica, de modo que estados iguais produzam o mesmo texto. Complexidade: O(tamanho do estado).
+        """
+        conteudos = {}
+        for id_conteudo, dados in self.conteudos.items():
+            conteudos[str(id_conteudo)] = dict(dados, comentarios=sorted(dados['comentarios']),
+                                               quantis_consumo=_sketch_para_dict(dados['quantis_consumo']))
+        usuarios = {}
+        for id_usuario, dados in self.usuarios.items():
+            usuarios[str(id_usuario)] = dict(dados, conteudos=sorted(dados['conteudos']),
+                                             quantis_consumo=_sketch_para_dict(dados['quantis_consumo']))
+        plataformas = {chave: dict(dados, quantis_consumo=_sketch_para_dict(dados['quantis_consumo']))
+                       for chave, dados in self.plataformas.items()}
+        return {'versao': VERSAO_ESTADO, 'conteudos': conteudos, 'usuarios': usuarios, 'plataformas': plataformas}
+
+    @classmethod
+    def de_dict(cls, dados):
+        """Recria o estado a partir de para_dict(). Levanta ValueError se o formato não for reconhecido."""
+        if not isinstance(dados, dict) or dados.get('versao') != VERSAO_ESTADO:
+            raise ValueError(f"Formato de estado agregado inválido ou de versão diferente de {VERSAO_ESTADO}.")
+        estado = cls()
+        for id_conteudo, linha in dados['conteudos'].items():
+            estado.conteudos[int(id_conteudo)] = dict(linha, comentarios=[tuple(c) for c in linha['comentarios']],
+                                                      quantis_consumo=_sketch_de_dict(linha['quantis_consumo']))
+        for id_usuario, linha in dados['usuarios'].items():
+            estado.usuarios[int(id_usuario)] = dict(linha, conteudos=set(linha['conteudos']),
+                                                    quantis_consumo=_sketch_de_dict(linha['quantis_consumo']))
+        estado.plataformas = {chave: dict(linha, quantis_consumo=_sketch_de_dict(linha['quantis_consumo']))
+                              for chave, linha in dados['plataformas'].items()}
+        return estado
+
+    def salvar(self, caminho_arquivo: str):
+        """Grava o estado em JSON compacto. Complexidade: O(tamanho do estado)."""
+        with open(caminho_arquivo, 'w', encoding='utf-8') as f:
+            json.dump(self.para_dict(), f, ensure_ascii=False, separators=(',', ':'))
+
+    @classmethod
+    def carregar(cls, caminho_arquivo: str):
+        """Lê um estado gravado por salvar(). Complexidade: O(tamanho do estado)."""
+        with open(caminho_arquivo, encoding='utf-8') as f:
+            return cls.de_dict(json.load(f))
+
+    def __eq__(self, outro):
+        if not isinstance(outro, EstadoAgregado):
+            return NotImplemented
+        return self.para_dict() == outro.para_dict()
+
+
+def _copiar_linha(dados):
+    """Cópia de uma linha de agregados, sem compartilhar dicionários, listas, conjuntos ou sketches com a original."""
+    return {campo: valor.copiar() if isinstance(valor, SketchQuantis)
+            else valor.copy() if isinstance(valor, (dict, list, set)) else valor
+            for campo, valor in dados.items()}
+
+
+def _mesclar_quantis(linha, dados):
+    """Soma o sketch de quantis de `dados` ao da linha, criando-o (como cópia) se a linha ainda não tiver um."""
+    if dados['quantis_consumo'] is None:
+        return
+    if linha['quantis_consumo'] is None:
+        linha['quantis_consumo'] = dados['quantis_consumo'].copiar()
+    else:
+        linha['quantis_consumo'].mesclar(dados['quantis_consumo'])
+
+
+def _sketch_para_dict(sketch):
+    return None if sketch is None else sketch.para_dict()
+
+
+def _sketch_de_dict(dados):
+    return None if dados is None else SketchQuantis.de_dict(dados)
+
+
+def _somar_contagens(destino, origem):
+    for chave, quantidade in origem.items():
+        destino[chave] = destino.get(chave, 0) + quantidade
+
+
+def mesclar_estados(estados):
+    """Mescla uma sequência de estados em um novo EstadoAgregado (os originais não são alterados)."""
+    resultado = EstadoAgregado()
+    for estado in estados:
+        resultado.mesclar(estado)
+    return resultado
+
+
+def dividir_csv_por_usuario(caminho_csv: str, partes: int, diretorio_saida: str):
+    """
+    Divide o CSV em `partes` arquivos shard_<i>.csv pelo resto de id_usuario por `partes`
+    (linhas com ID inválido vão para o shard 0, onde serão rejeitadas na carga, como no arquivo original).
+    Retorna a lista de caminhos gerados. Complexidade: O(n).
+    """
+    if not isinstance(partes, int) or partes <= 0:
+        raise ValueError("A quantidade de shards deve ser um inteiro positivo.")
+    os.makedirs(diretorio_saida, exist_ok=True)
+    caminhos = [os.path.join(diretorio_saida, f'shard_{i}.csv') for i in range(partes)]
+    arquivos = [open(caminho, 'w', encoding='utf-8', newline='') for caminho in caminhos]
+    try:
+        with open(caminho_csv, encoding='utf-8', newline='') as f:
+            leitor = csv.reader(f)
+            cabecalho = next(leitor, [])
+            escritores = [csv.writer(arquivo, lineterminator='\n') for arquivo in arquivos]
+            for escritor in escritores:
+                escritor.writerow(cabecalho)
+            coluna = cabecalho.index('id_usuario') if 'id_usuario' in cabecalho else None
+            for linha in leitor:
+                try:
+                    shard = int(linha[coluna]) % partes
+                except (TypeError, ValueError, IndexError):
+                    shard = 0
+                escritores[shard].writerow(linha)
+    finally:
+        for arquivo in arquivos:
+            arquivo.close()
+    return caminhos
+
+
+def _executar_linha_comando():
+    from analise.sistema import SistemaAnaliseEngajamento # Importação tardia evita importação circular
+
+    parser = argparse.ArgumentParser(description="Estado agregado mesclável para processamento em shards.")
+    comandos = parser.add_subparsers(dest='comando', required=True)
+    dividir = comandos.add_parser('dividir', help="Divide um CSV em shards por id_usuario.")
+    dividir.add_argument('csv')
+    dividir.add_argument('--partes', type=int, required=True)
+    dividir.add_argument('--saida', required=True, help="Diretório dos shards.")
+    estado = comandos.add_parser('estado', help="Carrega um CSV e grava seu estado agregado.")
+    estado.add_argument('csv')
+    estado.add_argument('--saida', required=True, help="Arquivo JSON do estado.")
+    mesclar = comandos.add_parser('mesclar', help="Mescla estados agregados.")
+    mesclar.add_argument('estados', nargs='+')
+    mesclar.add_argument('--saida', help="Arquivo JSON do estado mesclado.")
+    mesclar.add_argument('--relatorio', help="Arquivo JSON do relatório gerado a partir do estado mesclado.")
+    argumentos = parser.parse_args()
+
+    if argumentos.comando == 'dividir':
+        for caminho in dividir_csv_por_usuario(argumentos.csv, argumentos.partes, argumentos.saida):
+            print(caminho)
+    elif argumentos.comando == 'estado':
+        sistema = SistemaAnaliseEngajamento()
+        sistema._carregar_interacoes_csv(argumentos.csv, streaming=True)
+        sistema.estado_agregado().salvar(argumentos.saida)
+    else:
+        resultado = mesclar_estados(EstadoAgregado.carregar(caminho) for caminho in argumentos.estados)
+        if argumentos.saida:
+            resultado.salvar(argumentos.saida)
+        if argumentos.relatorio:
+            with open(argumentos.relatorio, 'w', encoding='utf-8') as f:
+                json.dump(resultado.relatorio(), f, ensure_ascii=False, indent=2)
+
+
+if __name__ == '__main__':
+    _executar_linha_comando()
@@ -0,0 +1,169 @@
+"""
+Módulo exportacao.py
+Exportação não interativa de todos os relatórios para arquivos CSV ou JSON.
+
+Os valores vêm da tabela do motor de relatórios (SistemaAnaliseEngajamento.tabela_relatorio), calculada
+uma única vez, e dos rankings de top_n_por_metrica. Cada relatório é gravado em fluxo, linha a linha,
+por um arquivo com buffer grande: nada é montado inteiro em memória além da própria tabela,
+então a exportação funciona sem terminal e escala para milhões de usuários.
+
+Arquivos gerados no diretório de saída (extensão .csv ou .json):
+- conteudos, usuarios, plataformas: relatório geral de cada entidade;
+- comentarios: um comentário por linha, com o conteúdo de origem;
+- interacoes_usuarios: todas as interações de cada usuário, em ordem cronológica;
+- top_<entidade>_<metrica>: top N de cada métrica de METRICAS_RANKING;
+- aproximado_conteudos, aproximado_usuarios, aproximado_plataformas: estimativas do modo aproximado
+  (apenas se o sistema foi criado com modo_aproximado=True).
+Em JSON, cada arquivo é uma lista de objetos; em CSV, listas são unidas por '; '.
+"""
+
+import csv
+import json
+import os
+
+from analise.motor_relatorios import CHAVE_PERCENTUAL
+from entidades.interacao import Interacao
+
+FORMATOS_EXPORTACAO = ('csv', 'json')
+TAMANHO_BUFFER = 1 << 20  # 1 MiB
+TIPOS_INTERACAO = Interacao.TIPOS_INTERACAO
+
+
+def _valor_csv(valor):
+    """Converte listas em texto e None em vazio para uma célula de CSV."""
+    if isinstance(valor, (list, tuple)):
+        return '; '.join(str(item) for item in valor)
+    return '' if valor is None else valor
+
+
+def gravar_relatorio(caminho_arquivo: str, formato: str, campos, linhas):
+    """
+    Grava as `linhas` (iteráveis de valores na ordem de `campos`) em CSV ou JSON, em fluxo.
+    Retorna a quantidade de linhas gravadas. Complexidade: O(n) tempo; O(1) de memória adicional por linha.
+    """
+    quantidade = 0
+    with open(caminho_arquivo, 'w', encoding='utf-8', newline='', buffering=TAMANHO_BUFFER) as f:
+        if formato == 'csv':
+            escritor = csv.writer(f, lineterminator='\n')
+            escritor.writerow(campos)
+            for linha in linhas:
+                escritor.writerow([_valor_csv(valor) for valor in linha])
+                quantidade += 1
+        else:
+            f.write('[')
+            for linha in linhas:
+                f.write(',\n' if quantidade else '\n')
+                f.write(json.dumps(dict(zip(campos, linha)), ensure_ascii=False, default=str))
+                quantidade += 1
+            f.write('\n]\n' if quantidade else ']\n')
+    return quantidade
+
+
+def _linhas_conteudos(tabela):
+    for linha in tabela.linhas('conteudo'):
+        contagem = linha['contagem_por_tipo_interacao']
+        percentual = linha.get(CHAVE_PERCENTUAL.get(type(linha['conteudo']).__name__))
+        yield ([linha['id_conteudo'], linha['nome_conteudo'], type(linha['conteudo']).__name__,
+                linha['total_interacoes'], linha['total_interacoes_engajamento']]
+               + [contagem.get(tipo, 0) for tipo in TIPOS_INTERACAO]
+               + [linha['tempo_total_consumo'], round(linha['media_tempo_consumo'], 2),
+                  percentual if isinstance(percentual, (int, float)) else None]
+               + list(linha['quantis_tempo_consumo'].values()) + [len(linha['comentarios'])])
+
+
+def _linhas_usuarios(tabela):
+    for linha in tabela.linhas('usuario'):
+        contagem = linha['contagem_por_tipo_interacao']
+        plataformas = [f"{plataforma.nome_plataforma}({quantidade})"
+                       for plataforma, quantidade in linha['plataformas_mais_frequentes'][:3]]
+        yield ([linha['id_usuario'], linha['quantidade_interacoes'], linha['quantidade_conteudos'],
+                linha['tempo_total_assistido']] + list(linha['quantis_tempo_consumo'].values())
+               + [contagem.get(tipo, 0) for tipo in TIPOS_INTERACAO] + [plataformas])
+
+
+def _linhas_plataformas(tabela):
+    for linha in tabela.linhas('plataforma'):
+        yield [linha['nome_plataforma'], linha['total_interacoes'], linha['total_interacoes_engajamento'],
+               linha['tempo_total_consumo'], round(linha['media_tempo_consumo'], 2)] + list(linha['quantis_tempo_consumo'].values())
+
+
+def _linhas_comentarios(tabela):
+    for linha in tabela.linhas('conteudo'):
+        for comentario in linha['comentarios']:
+            yield [linha['id_conteudo'], linha['nome_conteudo'], comentario]
+
+
+def _linhas_interacoes_usuarios(sistema):
+    for usuario in sistema.listar_usuarios():
+        for interacao in sorted(usuario.interacoes, key=lambda i: i.timestamp_epoch):
+            yield [usuario.id_usuario, interacao.interacao_id, interacao.tipo_interacao,
+                   interacao.conteudo_associado.id_conteudo, interacao.conteudo_associado.nome_conteudo,
+                   interacao.plataforma_interacao.nome_plataforma, interacao.timestamp_interacao.isoformat(sep=' '),
+                   interacao.watch_duration_seconds, interacao.comment_text]
+
+
+def _linhas_top(sistema, entidade, metrica, funcao, top_n):
+    for posicao, objeto in enumerate(sistema.top_n_por_metrica(entidade, metrica, top_n), 1):
+        if entidade == 'conteudo':
+            yield [posicao, objeto.id_conteudo, objeto.nome_conteudo, funcao(objeto)]
+        elif entidade == 'usuario':
+            yield [posicao, objeto.id_usuario, str(objeto), funcao(objeto)]
+        else:
+            yield [posicao, objeto.nome_plataforma.strip().lower(), objeto.nome_plataforma, funcao(objeto)]
+
+
+def exportar_relatorios(sistema, diretorio_saida: str, formato: str = 'csv', top_n: int = 10):
+    """
+    Calcula todos os relatórios uma vez e grava cada um em `diretorio_saida` no formato escolhido.
+    top_n=None exporta o ranking completo de cada métrica.
+    Retorna um dicionário nome do relatório -> (caminho do arquivo, linhas gravadas).
+    Complexidade: O(k + c + u + p) para a tabela, mais O(k log k) para ordenar as interações de cada usuário
+    e O(m (N + log n)) para os m rankings.
+    """
+    from analise.sistema import METRICAS_RANKING  # Importação tardia evita importação circular
+
+    if formato not in FORMATOS_EXPORTACAO:
+        raise ValueError(f"Formato de exportação inválido: {formato}. Deve ser um de {FORMATOS_EXPORTACAO}.")
+    os.makedirs(diretorio_saida, exist_ok=True)
+    tabela = sistema.tabela_relatorio()
+    contagens_tipo = [f'quantidade_{tipo}' for tipo in TIPOS_INTERACAO]
+    quantis = [f'tempo_consumo_{quantil}' for quantil in ('p50', 'p90', 'p99')]
+
+    relatorios = {
+        'conteudos': (['id_conteudo', 'nome_conteudo', 'tipo_conteudo', 'total_interacoes', 'total_interacoes_engajamento']
+                      + contagens_tipo + ['tempo_total_consumo', 'media_tempo_consumo', 'percentual_medio_consumido']
+                      + quantis + ['quantidade_comentarios'],
+                      _linhas_conteudos(tabela)),
+        'usuarios': (['id_usuario', 'quantidade_interacoes', 'quantidade_conteudos', 'tempo_total_assistido'] + quantis
+                     + contagens_tipo + ['plataformas_mais_frequentes'],
+                     _linhas_usuarios(tabela)),
+        'plataformas': (['nome_plataforma', 'total_interacoes', 'total_interacoes_engajamento',
+                         'tempo_total_consumo', 'media_tempo_consumo'] + quantis,
+                        _linhas_plataformas(tabela)),
+        'comentarios': (['id_conteudo', 'nome_conteudo', 'comentario'], _linhas_comentarios(tabela)),
+        'interacoes_usuarios': (['id_usuario', 'id_interacao', 'tipo_interacao', 'id_conteudo', 'nome_conteudo',
+                                 'plataforma', 'timestamp_interacao', 'watch_duration_seconds', 'comment_text'],
+                                _linhas_interacoes_usuarios(sistema)),
+    }
+    for entidade, metricas in METRICAS_RANKING.items():
+        for metrica, funcao in metricas.items():
+            relatorios[f'top_{entidade}_{metrica}'] = (['posicao', 'chave', 'nome', metrica],
+                                                       _linhas_top(sistema, entidade, metrica, funcao, top_n))
+
+    relatorio_aproximado = sistema.relatorio_aproximado()
+    if relatorio_aproximado is not None:
+        campos_aproximados = {
+            'conteudos': ['id_conteudo', 'usuarios_distintos_estimados']
+                         + [f'quantidade_{tipo}_estimada' for tipo in TIPOS_INTERACAO],
+            'usuarios': ['id_usuario', 'conteudos_distintos_estimados'],
+            'plataformas': ['nome_plataforma', 'usuarios_distintos_estimados'],
+        }
+        for entidade, campos in campos_aproximados.items():
+            relatorios[f'aproximado_{entidade}'] = (campos, ([linha[campo] for campo in campos]
+                                                             for linha in relatorio_aproximado[entidade]))
+
+    resultado = {}
+    for nome, (campos, linhas) in relatorios.items():
+        caminho_arquivo = os.path.join(diretorio_saida, f'{nome}.{formato}')
+        resultado[nome] = (caminho_arquivo, gravar_relatorio(caminho_arquivo, formato, campos, linhas))
+    return resultado
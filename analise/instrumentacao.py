@@ -0,0 +1,132 @@
+"""
+Módulo instrumentacao.py
+Medição opcional, por etapa, da carga das interações e dos relatórios.
+
+A instrumentação não adiciona verificações ao código medido: quando habilitada, os métodos de interesse
+(leitura do CSV, validação, operações da fila e das árvores, criação das interações, vinculação às
+entidades e relatórios) são substituídos, apenas na instância medida, por versões envolvidas que
+acumulam chamadas e tempo. Sem instrumentação, nenhum desses métodos é alterado e o custo é nulo.
+
+Observação: etapas aninhadas (ex.: 'carga.csv' contém 'validacao') incluem o tempo das etapas internas
+e o pequeno custo da própria medição delas.
+"""
+
+import json
+import time
+from functools import wraps
+
+
+class EstatisticaEtapa:
+    """Chamadas e tempo acumulados de uma etapa."""
+
+    __slots__ = ('chamadas', 'segundos')
+
+    def __init__(self):
+        self.chamadas = 0
+        self.segundos = 0.0
+
+    def como_dict(self):
+        """
+        Resumo da etapa, com média por chamada (µs) e vazão (chamadas/s). Nas etapas executadas uma vez
+        por linha (leitura, validação, vinculação...), a vazão é a quantidade de linhas por segundo.
+        Complexidade: O(1).
+        """
+        return {
+            'chamadas': self.chamadas,
+            'segundos': round(self.segundos, 6),
+            'media_us': round(self.segundos / self.chamadas * 1e6, 3) if self.chamadas else None,
+            'chamadas_por_segundo': round(self.chamadas / self.segundos, 1) if self.segundos > 0 else None,
+        }
+
+
+class Instrumentacao:
+    """
+    Acumula, por nome de etapa, chamadas e tempo de parede (time.perf_counter),
+    além de medidores de valor máximo (ex.: pico de ocupação da fila).
+    """
+
+    def __init__(self):
+        self._etapas = {}    # nome da etapa -> EstatisticaEtapa
+        self._maximos = {}   # nome do medidor -> maior valor observado
+        self._inicio = time.perf_counter()
+
+    def etapa(self, nome):
+        """Retorna (criando se necessário) a estatística da etapa. Complexidade: O(1)."""
+        estatistica = self._etapas.get(nome)
+        if estatistica is None:
+            estatistica = self._etapas[nome] = EstatisticaEtapa()
+        return estatistica
+
+    def registrar(self, nome, segundos):
+        """Soma à etapa uma chamada que durou `segundos`. Complexidade: O(1)."""
+        estatistica = self.etapa(nome)
+        estatistica.chamadas += 1
+        estatistica.segundos += segundos
+
+    def registrar_maximo(self, nome, valor):
+        """Guarda o maior valor já observado para o medidor. Complexidade: O(1)."""
+        if nome not in self._maximos or valor > self._maximos[nome]:
+            self._maximos[nome] = valor
+
+    def envolver(self, nome, funcao, depois=None):
+        """
+        Retorna uma versão de `funcao` que registra cada chamada na etapa `nome`.
+        `depois`, se informado, é chamado sem argumentos após cada chamada (ex.: para atualizar um medidor).
+        """
+        estatistica = self.etapa(nome)
+        relogio = time.perf_counter
+
+        @wraps(funcao)
+        def funcao_medida(*args, **kwargs):
+            inicio = relogio()
+            try:
+                return funcao(*args, **kwargs)
+            finally:
+                estatistica.chamadas += 1
+                estatistica.segundos += relogio() - inicio
+                if depois is not None:
+                    depois()
+        return funcao_medida
+
+    def iterar(self, nome, iteravel):
+        """
+        Gera os itens de `iteravel` medindo o tempo gasto para produzir cada um (ex.: leitura de
+        linhas do csv.DictReader). Cada item produzido conta como uma chamada.
+        """
+        estatistica = self.etapa(nome)
+        relogio = time.perf_counter
+        iterador = iter(iteravel)
+        while True:
+            inicio = relogio()
+            try:
+                item = next(iterador)
+            except StopIteration:
+                estatistica.segundos += relogio() - inicio
+                return
+            estatistica.segundos += relogio() - inicio
+            estatistica.chamadas += 1
+            yield item
+
+    def resumo(self):
+        """
+        Retorna um dicionário com o tempo total desde a criação, as etapas (em ordem decrescente de tempo)
+        e os medidores de máximo. Complexidade: O(e log e), e = quantidade de etapas.
+        """
+        etapas = sorted(self._etapas.items(), key=lambda par: par[1].segundos, reverse=True)
+        return {
+            'segundos_desde_inicio': round(time.perf_counter() - self._inicio, 6),
+            'etapas': {nome: estatistica.como_dict() for nome, estatistica in etapas if estatistica.chamadas},
+            'maximos': dict(self._maximos),
+        }
+
+    def para_json(self, **opcoes_json):
+        """Resumo serializado em JSON."""
+        return json.dumps(self.resumo(), ensure_ascii=False, **opcoes_json)
+
+    def reiniciar(self):
+        """Zera etapas e medidores, mantendo as funções já envolvidas ligadas às mesmas etapas."""
+        for estatistica in self._etapas.values():
+            estatistica.chamadas = 0
+            estatistica.segundos = 0.0
+        self._maximos.clear()
+        self._inicio = time.perf_counter()
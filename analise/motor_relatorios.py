@@ -0,0 +1,221 @@
+"""
+Módulo motor_relatorios.py
+Motor de relatórios em passada única.
+
+calcular_tabela percorre as interações uma única vez e acumula, ao mesmo tempo, todas as métricas
+de conteúdos, usuários e plataformas usadas nos menus de relatório, produzindo uma TabelaRelatorio.
+Os menus leem os valores dessa tabela em vez de consultar métrica por métrica em cada entidade,
+então um relatório completo custa uma varredura linear das interações (e a tabela pode ser reaproveitada
+enquanto não houver novas interações). Os quantis do tempo de consumo (p50, p90 e p99) vêm de um
+SketchQuantis por linha com consumo (criado na primeira sessão), preenchido na mesma passada com as sessões de consumo ('view_start' ou duração
+positiva, ver e_sessao_consumo), sem ordenar nem guardar as durações.
+
+As métricas seguem exatamente as definições das entidades (Conteudo, Usuario e Plataforma).
+"""
+
+from entidades.interacao import Interacao, e_sessao_consumo
+from estruturas_dados.sketch_quantis import SketchQuantis, quantis_vazios
+
+TIPOS_ENGAJAMENTO = ('like', 'share', 'comment')
+
+# Nome da métrica de percentual consumido em calcular_metricas(), por tipo de conteúdo
+CHAVE_PERCENTUAL = {'Video': 'percentual_medio_assistido', 'Podcast': 'percentual_medio_ouvido',
+                    'Artigo': 'percentual_medio_lido'}
+
+
+class TabelaRelatorio:
+    """
+    Resultado do motor de relatórios: uma linha (dicionário de métricas) por entidade.
+    - conteudos: id_conteudo -> linha, em ordem crescente de ID;
+    - usuarios: id_usuario -> linha, em ordem crescente de ID;
+    - plataformas: nome normalizado (minúsculo) -> linha, na ordem em que foram informadas.
+    """
+
+    def __init__(self, conteudos, usuarios, plataformas):
+        self.conteudos = conteudos
+        self.usuarios = usuarios
+        self.plataformas = plataformas
+
+    def linhas(self, entidade):
+        """Retorna as linhas de 'conteudo', 'usuario' ou 'plataforma', na ordem da tabela. Complexidade: O(n)."""
+        return list(self._por_entidade(entidade).values())
+
+    def linha(self, entidade, chave):
+        """Retorna a linha da entidade com a chave informada, ou None. Complexidade: O(1)."""
+        return self._por_entidade(entidade).get(chave)
+
+    def _por_entidade(self, entidade):
+        if entidade == 'conteudo':
+            return self.conteudos
+        if entidade == 'usuario':
+            return self.usuarios
+        if entidade == 'plataforma':
+            return self.plataformas
+        raise ValueError(f"Entidade inválida: {entidade}. Deve ser 'conteudo', 'usuario' ou 'plataforma'.")
+
+
+def calcular_percentual_consumido(media_tempo_consumo, duracao_total):
+    """Percentual médio consumido de um conteúdo, como em calcular_metricas(). Complexidade: O(1)."""
+    if not duracao_total:
+        return "Não há informação da duração total do conteúdo"
+    return round((media_tempo_consumo / duracao_total) * 100, 2)
+
+
+def adicionar_sessao(linha, duracao):
+    """
+    Registra a duração de uma sessão de consumo no sketch 'quantis_consumo' da linha, criado apenas na primeira
+    sessão (linhas sem consumo ficam com None, sem o custo de um SketchQuantis). Complexidade: O(1) amortizado.
+    """
+    sketch = linha['quantis_consumo']
+    if sketch is None:
+        sketch = linha['quantis_consumo'] = SketchQuantis()
+    sketch.adicionar(duracao)
+
+
+def quantis_do_sketch(sketch):
+    """Quantis padrão de um sketch de linha, ou os quantis vazios se ele não chegou a ser criado."""
+    return quantis_vazios() if sketch is None else sketch.quantis()
+
+
+def _nova_linha_conteudo(conteudo):
+    return {
+        'conteudo': conteudo, 'id_conteudo': conteudo.id_conteudo, 'nome_conteudo': conteudo.nome_conteudo,
+        'total_interacoes': 0, 'total_interacoes_engajamento': 0, 'contagem_por_tipo_interacao': {},
+        'tempo_total_consumo': 0, 'quantidade_consumo': 0, 'comentarios': [], 'quantis_consumo': None,
+    }
+
+
+def _nova_linha_usuario(id_usuario):
+    return {
+        'id_usuario': id_usuario, 'quantidade_interacoes': 0, 'contagem_por_tipo_interacao': {},
+        'conteudos': set(), 'tempo_total_assistido': 0, 'frequencia_plataformas': {}, 'quantis_consumo': None,
+    }
+
+
+def _nova_linha_plataforma(plataforma):
+    return {
+        'plataforma': plataforma, 'nome_plataforma': plataforma.nome_plataforma, 'total_interacoes': 0,
+        'total_interacoes_engajamento': 0, 'tempo_total_consumo': 0, 'quantidade_consumo': 0,
+        'quantis_consumo': None,
+    }
+
+
+def calcular_tabela(interacoes, conteudos=(), usuarios=(), plataformas=(), aproximada=None):
+    """
+    Calcula a TabelaRelatorio em uma única passada por `interacoes`.
+    `conteudos`, `usuarios` e `plataformas` (pares (chave, Plataforma)) são incluídos na tabela mesmo
+    sem interações e definem a ordem das linhas; entidades que só aparecem nas interações entram
+    ao final, ordenadas por ID (conteúdos e usuários) ou na ordem em que aparecem (plataformas).
+    Empates em plataformas_mais_frequentes seguem a ordem da primeira interação em cada plataforma,
+    como em Usuario.plataformas_mais_frequentes.
+    Com `aproximada` (a AnaliseAproximada do modo aproximado), as contagens por tipo de conteúdos e usuários e a
+    quantidade de conteúdos distintos de cada usuário são as estimativas dos sketches, as mesmas usadas pelos
+    rankings, e a passada não monta os dicionários por tipo nem os conjuntos de conteúdos.
+    Complexidade: O(k + c + u + p), k = interações; mais O(c log c + u log u) se houver entidades não informadas;
+    com `aproximada`, mais O((c + u) t d + u m) das estimativas.
+    """
+    linhas_conteudos = {conteudo.id_conteudo: _nova_linha_conteudo(conteudo) for conteudo in conteudos}
+    linhas_usuarios = {usuario.id_usuario: _nova_linha_usuario(usuario.id_usuario) for usuario in usuarios}
+    linhas_plataformas = {chave: _nova_linha_plataforma(plataforma) for chave, plataforma in plataformas}
+    por_objeto_plataforma = {id(linha['plataforma']): linha for linha in linhas_plataformas.values()}
+    quantidade_conteudos, quantidade_usuarios = len(linhas_conteudos), len(linhas_usuarios)
+    exata = aproximada is None
+
+    for interacao in interacoes:
+        conteudo = interacao.conteudo_associado
+        plataforma = interacao.plataforma_interacao
+        id_usuario = interacao.id_usuario
+        tipo = interacao.tipo_interacao
+        duracao = interacao.watch_duration_seconds
+        engajamento = tipo in TIPOS_ENGAJAMENTO
+        sessao = e_sessao_consumo(tipo, duracao)
+
+        linha = linhas_conteudos.get(conteudo.id_conteudo)
+        if linha is None:
+            linha = linhas_conteudos[conteudo.id_conteudo] = _nova_linha_conteudo(conteudo)
+        linha['total_interacoes'] += 1
+        if exata:
+            contagem = linha['contagem_por_tipo_interacao']
+            contagem[tipo] = contagem.get(tipo, 0) + 1
+        if engajamento:
+            linha['total_interacoes_engajamento'] += 1
+            if tipo == 'comment' and interacao.comment_text:
+                linha['comentarios'].append(interacao.comment_text)
+        linha['tempo_total_consumo'] += duracao
+        linha['quantidade_consumo'] += 1
+        if sessao:
+            adicionar_sessao(linha, duracao)
+
+        linha = linhas_usuarios.get(id_usuario)
+        if linha is None:
+            linha = linhas_usuarios[id_usuario] = _nova_linha_usuario(id_usuario)
+        linha['quantidade_interacoes'] += 1
+        if exata:
+            contagem = linha['contagem_por_tipo_interacao']
+            contagem[tipo] = contagem.get(tipo, 0) + 1
+            linha['conteudos'].add(conteudo.id_conteudo)
+        linha['tempo_total_assistido'] += duracao
+        if sessao:
+            adicionar_sessao(linha, duracao)
+        frequencia = linha['frequencia_plataformas'].get(id(plataforma))
+        if frequencia is None:
+            linha['frequencia_plataformas'][id(plataforma)] = [plataforma, 1, interacao.interacao_id]
+        else:
+            frequencia[1] += 1
+            frequencia[2] = min(frequencia[2], interacao.interacao_id)
+
+        linha = por_objeto_plataforma.get(id(plataforma))
+        if linha is None:
+            linha = _nova_linha_plataforma(plataforma)
+            linhas_plataformas[plataforma.nome_plataforma.strip().lower()] = por_objeto_plataforma[id(plataforma)] = linha
+        linha['total_interacoes'] += 1
+        if engajamento:
+            linha['total_interacoes_engajamento'] += 1
+        linha['tempo_total_consumo'] += duracao
+        linha['quantidade_consumo'] += 1
+        if sessao:
+            adicionar_sessao(linha, duracao)
+
+    # Métricas derivadas, calculadas uma vez por entidade
+    for linha in linhas_conteudos.values():
+        quantidade = linha.pop('quantidade_consumo')
+        linha['media_tempo_consumo'] = linha['tempo_total_consumo'] / quantidade if quantidade else 0
+        percentual = calcular_percentual_consumido(linha['media_tempo_consumo'], linha['conteudo'].duracao_total)
+        linha[CHAVE_PERCENTUAL.get(type(linha['conteudo']).__name__, 'percentual_medio_assistido')] = percentual
+        linha['quantis_tempo_consumo'] = quantis_do_sketch(linha.pop('quantis_consumo'))
+        if not exata:
+            linha['contagem_por_tipo_interacao'] = _contagens_estimadas(aproximada.contagem_tipo, linha['id_conteudo'])
+    for linha in linhas_usuarios.values():
+        conteudos = linha.pop('conteudos')
+        if exata:
+            linha['quantidade_conteudos'] = len(conteudos)
+        else:
+            linha['quantidade_conteudos'] = aproximada.conteudos_distintos_usuario(linha['id_usuario'])
+            linha['contagem_por_tipo_interacao'] = _contagens_estimadas(aproximada.contagem_tipo_usuario,
+                                                                        linha['id_usuario'])
+        frequencias = sorted(linha.pop('frequencia_plataformas').values(), key=lambda f: (-f[1], f[2]))
+        linha['plataformas_mais_frequentes'] = [(plataforma, quantidade) for plataforma, quantidade, _ in frequencias]
+        linha['quantis_tempo_consumo'] = quantis_do_sketch(linha.pop('quantis_consumo'))
+    for linha in linhas_plataformas.values():
+        quantidade = linha.pop('quantidade_consumo')
+        linha['media_tempo_consumo'] = linha['tempo_total_consumo'] / quantidade if quantidade else 0
+        linha['quantis_tempo_consumo'] = quantis_do_sketch(linha.pop('quantis_consumo'))
+
+    # Entidades que apareceram apenas nas interações vão para o final, em ordem de ID
+    if len(linhas_conteudos) > quantidade_conteudos:
+        linhas_conteudos = _ordenar_novas(linhas_conteudos, quantidade_conteudos)
+    if len(linhas_usuarios) > quantidade_usuarios:
+        linhas_usuarios = _ordenar_novas(linhas_usuarios, quantidade_usuarios)
+    return TabelaRelatorio(linhas_conteudos, linhas_usuarios, linhas_plataformas)
+
+
+def _contagens_estimadas(estimar, chave):
+    """Contagens por tipo estimadas para a entidade (só os tipos com estimativa positiva), como em Conteudo."""
+    contagens = {tipo: estimar(chave, tipo) for tipo in Interacao.TIPOS_INTERACAO}
+    return {tipo: quantidade for tipo, quantidade in contagens.items() if quantidade}
+
+
+def _ordenar_novas(linhas, quantidade_informadas):
+    """Mantém as primeiras `quantidade_informadas` linhas na ordem e ordena as demais por chave."""
+    itens = list(linhas.items())
+    return dict(itens[:quantidade_informadas] + sorted(itens[quantidade_informadas:], key=lambda item: item[0]))
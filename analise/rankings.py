@@ -0,0 +1,69 @@
+"""
+Módulo rankings.py
+Rankings mantidos ao vivo durante a carga das interações.
+
+Cada RankingAoVivo guarda as entidades em uma ArvoreBinariaBusca (AVL com tamanhos de subárvore)
+cuja chave é (-valor, desempate). A ordem crescente da árvore é, portanto, a ordem decrescente
+da métrica, com empates resolvidos pelo desempate (ID ou nome), o mesmo critério de identificar_top_n.
+"""
+
+from estruturas_dados.arvore_binaria_busca import ArvoreBinariaBusca
+
+
+class RankingAoVivo:
+    """
+    Índice de estatística de ordem para uma métrica de um tipo de entidade.
+    """
+
+    def __init__(self, metrica, desempate):
+        """
+        metrica: função que calcula o valor da métrica para a entidade (deve ser O(1)).
+        desempate: função que retorna a chave de desempate da entidade (ex.: id_conteudo).
+        """
+        self._metrica = metrica
+        self._desempate = desempate
+        self._arvore = ArvoreBinariaBusca()
+        self._chaves = {}  # desempate da entidade -> chave atual na árvore
+
+    def __len__(self):
+        """Quantidade de entidades no ranking. Complexidade: O(1)."""
+        return len(self._arvore)
+
+    def atualizar(self, entidade):
+        """
+        Reposiciona a entidade de acordo com o valor atual da métrica.
+        Complexidade: O(log n).
+        """
+        desempate = self._desempate(entidade)
+        nova_chave = (-self._metrica(entidade), desempate)
+        chave_atual = self._chaves.get(desempate)
+        if chave_atual == nova_chave:
+            return
+        if chave_atual is not None:
+            self._arvore.remover(chave_atual)
+        self._arvore.inserir(nova_chave, entidade)
+        self._chaves[desempate] = nova_chave
+
+    def topo(self, k):
+        """
+        Retorna as k entidades com maior valor da métrica.
+        Complexidade: O(k + log n).
+        """
+        return self._arvore.primeiros(k)
+
+    def posicao(self, entidade):
+        """
+        Retorna a posição (começando em 1) da entidade no ranking, ou None se ela não estiver nele.
+        Complexidade: O(log n).
+        """
+        chave = self._chaves.get(self._desempate(entidade))
+        if chave is None:
+            return None
+        return self._arvore.posicao(chave)
+
+    def na_posicao(self, posicao):
+        """
+        Retorna a entidade na posição informada (começando em 1), ou None.
+        Complexidade: O(log n).
+        """
+        return self._arvore.k_esimo(posicao)
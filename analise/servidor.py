@@ -0,0 +1,328 @@
+"""
+Módulo servidor.py
+Servidor HTTP/JSON local (asyncio, apenas biblioteca padrão) para consultas sobre um sistema já carregado.
+
+Rotas (todas GET, exceto a ingestão):
+- /saude                                   estado do servidor e versão dos dados
+- /metricas                                métricas disponíveis por entidade
+- /top/<entidade>/<metrica>?n=10           top N ('conteudo', 'usuario' ou 'plataforma'); n=0 = ranking completo
+- /usuarios/<id>                           métricas do usuário
+- /usuarios/<id>/interacoes                interações do usuário em ordem cronológica
+- /conteudos/<id>                          métricas e comentários do conteúdo
+- /plataformas/<nome>                      métricas da plataforma (nome sem diferenciar maiúsculas)
+- /tendencias?k=10                         conteúdos em alta (se o sistema monitora tendências)
+- POST /ingerir                            carga incremental das linhas novas do CSV configurado
+
+As respostas ficam em cache (LRU limitado) associadas à versão dos dados (versao_dados do sistema);
+quando novas interações são carregadas, a versão muda e o cache é descartado na próxima consulta.
+Painéis podem consultar repetidamente sem recalcular nada enquanto não houver ingestão.
+Todas as consultas e ingestões rodam na thread do laço de eventos, então o sistema nunca é acessado
+concorrentemente; muitos clientes são atendidos ao mesmo tempo porque cada resposta é curta ou já está em cache.
+A ingestão vincula as linhas novas em lotes de LINHAS_POR_LOTE_INGESTAO, devolvendo o controle ao laço entre
+um lote e outro, para que um acréscimo grande não bloqueie as consultas; ingestões simultâneas (periódica e
+POST /ingerir) são serializadas.
+"""
+
+import asyncio
+import contextlib
+import io
+import json
+from collections import OrderedDict
+from datetime import timedelta
+from urllib.parse import urlsplit, parse_qs, unquote
+
+MOTIVOS_HTTP = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed', 413: 'Payload Too Large',
+                500: 'Internal Server Error'}
+TEMPO_LIMITE_CONEXAO = 30  # Segundos de inatividade antes de encerrar uma conexão keep-alive
+TAMANHO_MAXIMO_CORPO = 1 << 16
+LINHAS_POR_LOTE_INGESTAO = 2000  # Registros do CSV vinculados antes de devolver o controle ao laço de eventos
+
+
+class ErroConsulta(Exception):
+    """Erro de consulta convertido em uma resposta HTTP com o código informado."""
+
+    def __init__(self, codigo, mensagem):
+        super().__init__(mensagem)
+        self.codigo = codigo
+
+
+class ServidorConsultas:
+    """
+    Servidor de consultas sobre um SistemaAnaliseEngajamento carregado.
+    caminho_csv: CSV usado pela ingestão incremental (POST /ingerir e, se intervalo_ingestao for informado,
+    verificação periódica de linhas novas a cada intervalo_ingestao segundos).
+    """
+
+    def __init__(self, sistema, host: str = '127.0.0.1', porta: int = 8080, caminho_csv: str = None,
+                 intervalo_ingestao: float = None, tamanho_cache: int = 1024):
+        if tamanho_cache <= 0:
+            raise ValueError("O tamanho do cache deve ser um inteiro positivo.")
+        self.sistema = sistema
+        self.host = host
+        self.porta = porta
+        self.caminho_csv = caminho_csv
+        self.intervalo_ingestao = intervalo_ingestao
+        self._cache = OrderedDict()  # (caminho, parâmetros da consulta) -> corpo JSON já codificado
+        self._tamanho_cache = tamanho_cache
+        self._versao_cache = sistema.versao_dados()
+        self._trava_ingestao = asyncio.Lock()
+        self.acertos_cache = 0
+        self.falhas_cache = 0
+
+    # Ciclo de vida
+
+    async def iniciar(self):
+        """Abre o socket e, se configurada, inicia a ingestão periódica. Retorna o asyncio.Server."""
+        self._servidor = await asyncio.start_server(self._atender_conexao, self.host, self.porta)
+        self.porta = self._servidor.sockets[0].getsockname()[1]  # Porta real, útil com porta=0
+        self._tarefa_ingestao = None
+        if self.intervalo_ingestao and self.caminho_csv:
+            self._tarefa_ingestao = asyncio.create_task(self._ingerir_periodicamente())
+        return self._servidor
+
+    async def servir_para_sempre(self):
+        """Inicia o servidor e atende conexões até ser cancelado."""
+        servidor = await self.iniciar()
+        print(f"Servidor de consultas em http://{self.host}:{self.porta}")
+        async with servidor:
+            await servidor.serve_forever()
+
+    async def encerrar(self):
+        """Fecha o socket e interrompe a ingestão periódica."""
+        if self._tarefa_ingestao is not None:
+            self._tarefa_ingestao.cancel()
+        self._servidor.close()
+        await self._servidor.wait_closed()
+
+    async def _ingerir_periodicamente(self):
+        while True:
+            await asyncio.sleep(self.intervalo_ingestao)
+            try:
+                await self._ingerir()
+            except (OSError, ValueError) as e:  # Arquivo ausente ou truncado: tenta de novo no próximo intervalo
+                print(f"[AVISO] Falha na ingestão periódica: {e}")
+
+    async def _ingerir(self):
+        """
+        Carrega as linhas novas do CSV em lotes de LINHAS_POR_LOTE_INGESTAO, cedendo o laço de eventos entre
+        os lotes; as mensagens da carga são devolvidas em vez de impressas.
+        """
+        async with self._trava_ingestao:
+            registradas = 0
+            mensagens = []
+            while True:
+                antes = self.sistema.checkpoint_incremental(self.caminho_csv)
+                saida = io.StringIO()
+                with contextlib.redirect_stdout(saida):
+                    registradas += self.sistema.carregar_interacoes_incremental(
+                        self.caminho_csv, max_linhas=LINHAS_POR_LOTE_INGESTAO)
+                mensagens.extend(saida.getvalue().splitlines())
+                if self.sistema.checkpoint_incremental(self.caminho_csv) == antes:  # Nada novo a ler
+                    break
+                await asyncio.sleep(0)
+        return {'interacoes_registradas': registradas, 'mensagens': mensagens,
+                'versao_dados': list(self.sistema.versao_dados())}
+
+    # HTTP
+
+    async def _atender_conexao(self, leitor, escritor):
+        """Atende as requisições de uma conexão (HTTP/1.1 com keep-alive)."""
+        try:
+            while True:
+                try:
+                    linha_requisicao = await asyncio.wait_for(leitor.readline(), TEMPO_LIMITE_CONEXAO)
+                except asyncio.TimeoutError:
+                    break
+                if not linha_requisicao.strip():
+                    break
+                partes = linha_requisicao.decode('latin-1').split()
+                cabecalhos = {}
+                while True:
+                    linha = await leitor.readline()
+                    if linha in (b'\r\n', b'\n', b''):
+                        break
+                    nome, _, valor = linha.decode('latin-1').partition(':')
+                    cabecalhos[nome.strip().lower()] = valor.strip()
+                tamanho_corpo = int(cabecalhos.get('content-length') or 0)
+                if tamanho_corpo > TAMANHO_MAXIMO_CORPO:  # O corpo não é lido: responde e encerra a conexão
+                    corpo = self._json({'erro': f"Corpo da requisição maior que {TAMANHO_MAXIMO_CORPO} bytes."})
+                    escritor.write(self._resposta_http(413, corpo, False))
+                    await escritor.drain()
+                    break
+                if tamanho_corpo:
+                    await leitor.readexactly(tamanho_corpo)  # O corpo não é usado por nenhuma rota
+
+                if len(partes) != 3:
+                    codigo, corpo = 400, self._json({'erro': 'Linha de requisição inválida.'})
+                else:
+                    codigo, corpo = await self.responder(partes[0].upper(), partes[1])
+                manter = partes[-1].upper() == 'HTTP/1.1' and cabecalhos.get('connection', '').lower() != 'close'
+                escritor.write(self._resposta_http(codigo, corpo, manter))
+                await escritor.drain()
+                if not manter:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            escritor.close()
+            with contextlib.suppress(ConnectionError):
+                await escritor.wait_closed()
+
+    @staticmethod
+    def _resposta_http(codigo, corpo, manter_conexao):
+        cabecalho = (f"HTTP/1.1 {codigo} {MOTIVOS_HTTP.get(codigo, '')}\r\n"
+                     f"Content-Type: application/json; charset=utf-8\r\n"
+                     f"Content-Length: {len(corpo)}\r\n"
+                     f"Connection: {'keep-alive' if manter_conexao else 'close'}\r\n\r\n")
+        return cabecalho.encode('latin-1') + corpo
+
+    @staticmethod
+    def _json(dados):
+        return json.dumps(dados, ensure_ascii=False, default=str).encode('utf-8')
+
+    async def responder(self, metodo: str, alvo: str):
+        """
+        Resolve uma requisição e retorna (código HTTP, corpo JSON em bytes), usando o cache quando possível.
+        É uma corrotina porque a ingestão (POST /ingerir) cede o laço de eventos entre os lotes;
+        as consultas GET são respondidas sem ceder. Complexidade: O(1) para respostas em cache.
+        """
+        versao = self.sistema.versao_dados()
+        if versao != self._versao_cache:  # Houve ingestão desde que o cache foi preenchido
+            self._cache.clear()
+            self._versao_cache = versao
+
+        url = urlsplit(alvo)
+        partes = [unquote(parte) for parte in url.path.split('/') if parte]
+        consulta = {chave: valores[-1] for chave, valores in parse_qs(url.query).items()}
+        try:
+            if metodo == 'POST':
+                if partes != ['ingerir']:
+                    raise ErroConsulta(404, f"Rota não encontrada: {url.path}")
+                if not self.caminho_csv:
+                    raise ErroConsulta(400, "O servidor não tem um CSV configurado para ingestão.")
+                return 200, self._json(await self._ingerir())
+            if metodo != 'GET':
+                raise ErroConsulta(405, f"Método não suportado: {metodo}")
+
+            chave_cache = (url.path, tuple(sorted(consulta.items())))
+            corpo = self._cache.get(chave_cache)
+            if corpo is not None:
+                self._cache.move_to_end(chave_cache)
+                self.acertos_cache += 1
+                return 200, corpo
+            self.falhas_cache += 1
+            corpo = self._json(self._consultar(partes, consulta))
+            if partes and partes[0] != 'saude':  # A rota de saúde reflete contadores e não é guardada
+                self._cache[chave_cache] = corpo
+                if len(self._cache) > self._tamanho_cache:
+                    self._cache.popitem(last=False)
+            return 200, corpo
+        except ErroConsulta as e:
+            return e.codigo, self._json({'erro': str(e)})
+        except ValueError as e:
+            return 400, self._json({'erro': str(e)})
+        except Exception as e:  # Uma consulta com defeito não deve derrubar o servidor
+            return 500, self._json({'erro': f"Erro interno: {e}"})
+
+    # Consultas
+
+    def _consultar(self, partes, consulta):
+        from analise.sistema import METRICAS_RANKING  # Importação tardia evita importação circular
+
+        if partes == ['saude']:
+            return {'status': 'ok', 'versao_dados': list(self.sistema.versao_dados()),
+                    'cache': {'entradas': len(self._cache), 'acertos': self.acertos_cache, 'falhas': self.falhas_cache}}
+        if partes == ['metricas']:
+            return {entidade: list(metricas) for entidade, metricas in METRICAS_RANKING.items()}
+        if len(partes) == 3 and partes[0] == 'top':
+            entidade, metrica = partes[1], partes[2]
+            if metrica not in METRICAS_RANKING.get(entidade, {}):
+                raise ErroConsulta(404, f"Métrica desconhecida: {entidade}/{metrica}")
+            n = int(consulta.get('n', 10))
+            if n < 0:
+                raise ValueError("n deve ser um inteiro não negativo.")
+            funcao = METRICAS_RANKING[entidade][metrica]
+            return [dict(self._identificacao(entidade, objeto), posicao=posicao, valor=funcao(objeto))
+                    for posicao, objeto in enumerate(self.sistema.top_n_por_metrica(entidade, metrica, n or None), 1)]
+        if partes and partes[0] == 'usuarios' and len(partes) in (2, 3):
+            usuario = self._buscar(self.sistema.buscar_usuario, partes[1], 'Usuário')
+            if len(partes) == 3:
+                if partes[2] != 'interacoes':
+                    raise ErroConsulta(404, f"Rota não encontrada: /{'/'.join(partes)}")
+                return [self._descrever_interacao(i) for i in sorted(usuario.interacoes, key=lambda i: i.timestamp_epoch)]
+            return self._descrever_usuario(usuario)
+        if len(partes) == 2 and partes[0] == 'conteudos':
+            return self._descrever_conteudo(self._buscar(self.sistema.buscar_conteudo, partes[1], 'Conteúdo'))
+        if partes == ['tendencias']:
+            k = int(consulta.get('k', 10))
+            if k < 0:
+                raise ValueError("k deve ser um inteiro não negativo.")
+            return [dict(self._identificacao('conteudo', conteudo), posicao=posicao, pontuacao=round(pontuacao, 3),
+                         erro_maximo=round(erro, 3))
+                    for posicao, (conteudo, pontuacao, erro) in enumerate(self.sistema.conteudos_em_alta(k), 1)]
+        if len(partes) == 2 and partes[0] == 'plataformas':
+            plataforma = self.sistema.buscar_plataforma(partes[1])
+            if plataforma is None:
+                raise ErroConsulta(404, f"Plataforma não encontrada: {partes[1]}")
+            return self._descrever_plataforma(plataforma)
+        raise ErroConsulta(404, f"Rota não encontrada: /{'/'.join(partes)}")
+
+    @staticmethod
+    def _buscar(buscar, identificador, descricao):
+        if not identificador.isdigit():
+            raise ValueError(f"ID inválido: {identificador}")
+        objeto = buscar(int(identificador))
+        if objeto is None:
+            raise ErroConsulta(404, f"{descricao} não encontrado: {identificador}")
+        return objeto
+
+    @staticmethod
+    def _identificacao(entidade, objeto):
+        if entidade == 'conteudo':
+            return {'id_conteudo': objeto.id_conteudo, 'nome_conteudo': objeto.nome_conteudo}
+        if entidade == 'usuario':
+            return {'id_usuario': objeto.id_usuario}
+        return {'nome_plataforma': objeto.nome_plataforma}
+
+    @staticmethod
+    def _descrever_usuario(usuario):
+        return {
+            'id_usuario': usuario.id_usuario,
+            'quantidade_interacoes': usuario.quantidade_interacoes(),
+            'quantidade_conteudos': usuario.quantidade_conteudos_unicos(),
+            'tempo_total_assistido': usuario.calcular_tempo_total_assistido(),
+            'tempo_total_assistido_formatado': str(timedelta(seconds=int(usuario.calcular_tempo_total_assistido()))),
+            'quantis_tempo_consumo': usuario.calcular_quantis_tempo_consumo(),
+            'contagem_por_tipo_interacao': {tipo: usuario.contar_interacoes_por_tipo(tipo)
+                                            for tipo in ('view_start', 'like', 'share', 'comment')},
+            'plataformas_mais_frequentes': [[p.nome_plataforma, quantidade]
+                                            for p, quantidade in usuario.plataformas_mais_frequentes(3)],
+        }
+
+    @staticmethod
+    def _descrever_conteudo(conteudo):
+        return dict(conteudo.calcular_metricas(), id_conteudo=conteudo.id_conteudo,
+                    nome_conteudo=conteudo.nome_conteudo, tipo_conteudo=type(conteudo).__name__,
+                    quantis_tempo_consumo=conteudo.calcular_quantis_tempo_consumo(),
+                    comentarios=conteudo.listar_comentarios())
+
+    @staticmethod
+    def _descrever_plataforma(plataforma):
+        return {
+            'nome_plataforma': plataforma.nome_plataforma,
+            'total_interacoes_engajamento': plataforma.calcular_total_interacoes_engajamento(),
+            'tempo_total_consumo': plataforma.calcular_tempo_total_consumo(),
+            'media_tempo_consumo': plataforma.calcular_media_tempo_consumo(),
+            'quantis_tempo_consumo': plataforma.calcular_quantis_tempo_consumo(),
+        }
+
+    @staticmethod
+    def _descrever_interacao(interacao):
+        return {
+            'id_interacao': interacao.interacao_id, 'tipo_interacao': interacao.tipo_interacao,
+            'id_conteudo': interacao.conteudo_associado.id_conteudo,
+            'nome_conteudo': interacao.conteudo_associado.nome_conteudo,
+            'plataforma': interacao.plataforma_interacao.nome_plataforma,
+            'timestamp_interacao': interacao.timestamp_interacao.isoformat(sep=' '),
+            'watch_duration_seconds': interacao.watch_duration_seconds, 'comment_text': interacao.comment_text,
+        }
@@ -10,29 +10,167 @@ Responsável por:
 """
 
 import csv
+import heapq
+import json
+import math
+import threading
+import time
+from collections import namedtuple
 from entidades.plataforma import Plataforma
 from entidades.conteudo import Video, Podcast, Artigo
-from entidades.interacao import Interacao
+from entidades.interacao import Interacao, para_epoch
 from entidades.usuario import Usuario
-from datetime import timedelta
+from datetime import datetime, timedelta
 from estruturas_dados.fila import Fila
 from estruturas_dados.arvore_binaria_busca import ArvoreBinariaBusca
+from estruturas_dados.indice_temporal import IndiceTemporal, SEGUNDOS_POR_DIA
+from estruturas_dados.space_saving import SpaceSaving
+from analise.rankings import RankingAoVivo
+from analise.instrumentacao import Instrumentacao
+from analise.motor_relatorios import calcular_tabela
+from analise import snapshot
+from analise import exportacao
+from analise.estado_agregado import EstadoAgregado
+from analise.analise_aproximada import AnaliseAproximada
 import os
 
 
+# Linha do CSV já validada e convertida para tipos nativos, pronta para ser vinculada às entidades.
+# É compacta e serializável, podendo ser produzida em outro processo (ver analise/carga_paralela.py).
+LinhaInteracao = namedtuple('LinhaInteracao', [
+    'id_conteudo', 'nome_conteudo', 'id_usuario', 'nome_plataforma', 'tipo_conteudo',
+    'duracao_total', 'erro_conteudo', 'timestamp_interacao', 'tipo_interacao',
+    'watch_duration_seconds', 'comment_text', 'erro_interacao'
+])
+
+
+def converter_linha_interacao(dados):
+    """
+    Converte uma linha já validada do CSV em uma LinhaInteracao.
+    Erros que no processamento só se manifestam mais tarde (duração total inválida ao criar o conteúdo,
+    campos inválidos ao criar a Interacao) são guardados como mensagens para preservar a mesma ordem de efeitos.
+    Complexidade: O(1).
+    """
+    id_conteudo = int(dados['id_conteudo'])
+    id_usuario = int(dados['id_usuario'])
+    tipo_conteudo = dados.get('tipo_conteudo', 'video').strip().lower()
+    try:
+        duracao_total, erro_conteudo = int(dados.get('duracao_total_seg', 0)), None
+    except (ValueError, TypeError) as e:
+        duracao_total, erro_conteudo = None, str(e)
+    try:
+        _, timestamp, tipo, duracao, comentario = Interacao.converter_dados_brutos(dados)
+        erro_interacao = None
+    except ValueError as err:
+        timestamp = tipo = duracao = comentario = None
+        erro_interacao = str(err)
+    return LinhaInteracao(id_conteudo, dados['nome_conteudo'].strip(), id_usuario, dados['plataforma'],
+                          tipo_conteudo, duracao_total, erro_conteudo, timestamp, tipo, duracao, comentario,
+                          erro_interacao)
+
+
+# Marcador enfileirado pelo produtor de uma carga em fluxo depois da última linha (ver _carregar_em_fluxo).
+FIM_DA_CARGA = object()
+
+
+# Métricas ranqueáveis de cada tipo de entidade (todas O(1)) e a chave de desempate usada nos rankings.
+# Os nomes das métricas são os mesmos usados nos menus de relatório.
+METRICAS_RANKING = {
+    'conteudo': {
+        "total_interacoes_engajamento": lambda c: c.calcular_total_interacoes_engajamento(),
+        "visualizacoes": lambda c: c.contar_interacoes_por_tipo("view_start"),
+        "likes": lambda c: c.contar_interacoes_por_tipo("like"),
+        "comentarios": lambda c: c.contar_interacoes_por_tipo("comment"),
+        "shares": lambda c: c.contar_interacoes_por_tipo("share"),
+        "tempo_total_consumo": lambda c: c.calcular_tempo_total_consumo(),
+        "media_tempo_consumo": lambda c: c.calcular_media_tempo_consumo(),
+    },
+    'usuario': {
+        "quantidade_interacoes": lambda u: u.quantidade_interacoes(),
+        "quantidade_conteudos": lambda u: u.quantidade_conteudos_unicos(),
+        "tempo_total_assistido": lambda u: u.calcular_tempo_total_assistido(),
+    },
+    'plataforma': {
+        "quantidade_interacoes": lambda p: p.calcular_total_interacoes_engajamento(),
+        "tempo_medio_consumo": lambda p: p.calcular_media_tempo_consumo(),
+        "tempo_total_assistido": lambda p: p.calcular_tempo_total_consumo(),
+    },
+}
+DESEMPATE_RANKING = {
+    'conteudo': lambda c: c.id_conteudo,
+    'usuario': lambda u: u.id_usuario,
+    'plataforma': lambda p: p.nome_plataforma.lower(),
+}
+
+
 class SistemaAnaliseEngajamento:
     """
     Classe de orquestração do sistema de análise de engajamento.
     Gerencia plataformas, conteúdos, usuários e processa interações.
     """
 
-    def __init__(self):
+    def __init__(self, rankings_ao_vivo: bool = False, instrumentar: bool = False, modo_aproximado: bool = False,
+                 erro_distintos: float = 0.05, erro_contagens: float = 0.001, armazenamento: str = 'objetos'):
+        """
+        Com rankings_ao_vivo=True, cada métrica de METRICAS_RANKING ganha um índice de estatística de ordem
+        atualizado a cada interação vinculada (O(log n) por métrica), e os relatórios de top N passam a
+        consultá-los em O(k + log n) em vez de ranquear a lista inteira.
+        Com instrumentar=True, cada etapa da carga e dos relatórios tem chamadas e tempo medidos
+        (ver resumo_instrumentacao); sem ela, nenhum método é envolvido e não há custo adicional.
+        Com modo_aproximado=True, cada interação também alimenta os sketches de AnaliseAproximada
+        (HyperLogLog com erro relativo erro_distintos e Count-Min Sketch com erro erro_contagens),
+        consultados por relatorio_aproximado com memória fixa por entidade. Nesse modo os usuários não
+        guardam conjuntos de conteúdos distintos nem contagens por tipo, e os conteúdos não guardam
+        contagens por tipo: a métrica quantidade_conteudos usa a estimativa do HyperLogLog do usuário, e as
+        contagens por tipo de conteúdos e usuários são as estimativas dos Count-Min Sketches, tanto nos
+        rankings quanto na tabela de relatórios. O modo aproximado não pode ser combinado com
+        rankings_ao_vivo (as estimativas de uma entidade mudam com as interações de outras, por colisões
+        no Count-Min Sketch, e o índice ficaria desatualizado) nem com armazenamento='colunar' (cuja tabela
+        é exata); nesses casos, levanta ValueError.
+        Com armazenamento='colunar', as interações são guardadas apenas em um ArmazenamentoColunar (colunas
+        contíguas com textos codificados por dicionário): entidades e índice temporal guardam posições nas
+        colunas, e cada interação lida é recriada a partir delas (com interacao_id = posição + 1). A tabela
+        completa do motor de relatórios (tabela_relatorio, usada pelos menus e pela exportação) é calculada
+        por agregações em grupo sobre essas colunas. Com 'objetos' (padrão), cada interação é um objeto
+        Interacao referenciado pelas entidades e pelo índice, e a tabela é calculada percorrendo as
+        interações de cada conteúdo.
+        """
+        if armazenamento not in ('objetos', 'colunar'):
+            raise ValueError(f"Armazenamento inválido: {armazenamento}. Deve ser 'objetos' ou 'colunar'.")
+        if modo_aproximado and rankings_ao_vivo:
+            raise ValueError("O modo aproximado não pode ser usado com rankings ao vivo.")
+        if modo_aproximado and armazenamento == 'colunar':
+            raise ValueError("O modo aproximado não pode ser usado com o armazenamento colunar.")
         self._fila_interacoes_brutas = Fila() # Fila para armazenar interações brutas do CSV
         self._arvore_conteudos = ArvoreBinariaBusca() # Árvore para armazenar conteúdos
         self._arvore_usuarios = ArvoreBinariaBusca()   # Árvore para armazenar usuários
         self._plataformas_registradas = {}  # Dicionário para armazenar plataformas registradas
+        self._rankings = None  # (entidade, métrica) -> RankingAoVivo, apenas com rankings_ao_vivo=True
+        self._checkpoints = {}  # caminho absoluto do CSV -> ponto de parada da carga incremental
+        self._indice_temporal = IndiceTemporal()  # Todas as interações (ou suas posições nas colunas), indexadas por hora
+        self._nova_interacao = Interacao.a_partir_de_campos  # Ponto de medição da criação das interações
+        self._instrumentacao = None  # Instrumentacao, apenas com instrumentar=True
+        self._tabela_relatorio = None  # (versão dos dados, TabelaRelatorio) da última tabela completa calculada
+        self._analise_aproximada = None  # AnaliseAproximada, apenas com modo_aproximado=True
+        self._tendencias = None  # SpaceSaving dos conteúdos em alta, apenas após monitorar_tendencias()
+        self._armazenamento_colunar = None  # ArmazenamentoColunar, apenas com armazenamento='colunar'
+        if armazenamento == 'colunar':
+            from analise.armazenamento_colunar import ArmazenamentoColunar  # Importação local: o módulo importa este
+            self._armazenamento_colunar = ArmazenamentoColunar()
+            self._indice_temporal = IndiceTemporal(tipo_itens='I')
+        if modo_aproximado:
+            self._analise_aproximada = AnaliseAproximada(erro_distintos, erro_contagens)
+        if rankings_ao_vivo:
+            self._rankings = {
+                (entidade, metrica): RankingAoVivo(funcao, DESEMPATE_RANKING[entidade])
+                for entidade, metricas in METRICAS_RANKING.items()
+                for metrica, funcao in metricas.items()
+            }
+        if instrumentar:
+            self._habilitar_instrumentacao()
   
-    def _validar_interacao(self, interacao):
+    @staticmethod
+    def _validar_interacao(interacao):
         """Executa todas as validações necessárias para uma interação."""
 
         # Validação de id_conteudo
@@ -68,91 +206,750 @@ class SistemaAnaliseEngajamento:
         
         return True
     
-    def _carregar_interacoes_csv(self, caminho_arquivo: str):
+    def _ler_lotes_validados(self, caminho_arquivo: str, tamanho_lote: int, estatisticas: dict, checkpoint: dict = None):
+        """
+        Gerador que lê o CSV, valida cada linha e produz listas de até `tamanho_lote` linhas válidas.
+        As contagens de linhas lidas, carregadas e ignoradas são acumuladas em `estatisticas`.
+        Se `checkpoint` for informado, recebe ao final da leitura o ponto de parada para a carga incremental
+        ({'offset', 'linha', 'cabecalho'}).
+        Complexidade: O(n) tempo no total; O(tamanho_lote) de memória por lote.
+        """
+        with open(caminho_arquivo, encoding='utf-8') as f:
+            leitor = csv.DictReader(f) # considera automaticamente que o arquivo possui cabeçalho
+            linhas = leitor if self._instrumentacao is None else self._instrumentacao.iterar('leitura_csv', leitor)
+            lote = []
+            for linha in linhas:
+                estatisticas['total_linhas'] += 1
+                try:
+                    self._validar_interacao(linha) # Valida linha antes de enfileirar
+                    lote.append(linha)
+                    estatisticas['linhas_carregadas'] += 1
+                except ValueError as e:
+                    print(f"[AVISO] Linha {leitor.line_num} ignorada: {e}")
+                    estatisticas['linhas_ignoradas'] += 1
+                if len(lote) >= tamanho_lote:
+                    yield lote
+                    lote = []
+            if lote:
+                yield lote
+            if checkpoint is not None and leitor.fieldnames is not None:
+                # Após o fim da iteração, o buffer binário está no fim dos bytes lidos
+                checkpoint.update(offset=f.buffer.tell(), linha=leitor.line_num, cabecalho=list(leitor.fieldnames))
+
+    def _carregar_interacoes_csv(self, caminho_arquivo: str, streaming: bool = False, tamanho_lote: int = 1000):
         """
         Carrega interações de um arquivo CSV, valida cada linha e enfileira as interações.
         Se ocorrerem erros de validação, as linhas problemáticas são ignoradas com uma mensagem de aviso.
+        Com streaming=True, leitura e validação acontecem em uma thread produtora que enfileira lotes de
+        `tamanho_lote` linhas em uma Fila limitada (2 * tamanho_lote, política 'bloquear'), enquanto esta
+        thread os desenfileira e vincula (ver _processar_fila). Se a vinculação for mais lenta que a leitura,
+        o produtor espera por espaço na fila (contrapressão): a memória fica proporcional ao tamanho do lote
+        em vez do tamanho do arquivo.
+        Ao final, registra o checkpoint do arquivo, para que carregar_interacoes_incremental leia apenas
+        as linhas acrescentadas depois desta carga.
         """
-        total_linhas = 0
-        linhas_carregadas = 0
-        linhas_ignoradas = 0
+        estatisticas = {'total_linhas': 0, 'linhas_carregadas': 0, 'linhas_ignoradas': 0}
+        checkpoint = {}
+        linhas_processadas = 0
         try:
-            with open(caminho_arquivo, encoding='utf-8') as f:
-                leitor = csv.DictReader(f) # considera automaticamente que o arquivo possui cabeçalho
-                for linha in leitor:
-                    total_linhas +=1
-                    try:
-                        self._validar_interacao(linha) # Valida linha antes de enfileirar
-                        self._fila_interacoes_brutas.enfileirar(linha)
-                        linhas_carregadas += 1
-                    except ValueError as e:
-                        print(f"[AVISO] Linha {leitor.line_num} ignorada: {e}")
-                        linhas_ignoradas += 1
-            print(f"\nTotal de linhas do Arquivo: {total_linhas}")
-            print(f"Linhas carregadas com sucesso: {linhas_carregadas}")
-            print(f"Linhas ignoradas devido a erros de validação: {linhas_ignoradas}")
+            if streaming:
+                linhas_processadas = self._carregar_em_fluxo(caminho_arquivo, tamanho_lote, estatisticas, checkpoint)
+            else:
+                for lote in self._ler_lotes_validados(caminho_arquivo, tamanho_lote, estatisticas, checkpoint):
+                    self._fila_interacoes_brutas.enfileirar_lote(lote)
         except (FileNotFoundError, PermissionError) as e:
             print(f"Erro crítico ao carregar CSV: {e}")
             raise
+        print(f"\nTotal de linhas do Arquivo: {estatisticas['total_linhas']}")
+        print(f"Linhas carregadas com sucesso: {estatisticas['linhas_carregadas']}")
+        print(f"Linhas ignoradas devido a erros de validação: {estatisticas['linhas_ignoradas']}")
+
+        if streaming:
+            print(f"Total de interações processadas: {linhas_processadas}")
+        else:
+            self.processar_interacoes_da_fila()  # Processa as interações após carregar o CSV
+        self._registrar_checkpoint(caminho_arquivo, checkpoint)
+
+    def _carregar_em_fluxo(self, caminho_arquivo: str, tamanho_lote: int, estatisticas: dict, checkpoint: dict):
+        """
+        Carga em fluxo com produtor e consumidor ligados por uma Fila limitada com política 'bloquear'.
+        A thread produtora lê e valida o CSV e enfileira os lotes, terminando com o marcador FIM_DA_CARGA;
+        esta thread consome a fila até o marcador. Um erro de leitura no produtor é levantado aqui.
+        Retorna a quantidade de interações registradas.
+        Complexidade: O(n log n) tempo; O(tamanho_lote) de memória para as linhas brutas.
+        """
+        fila = Fila(capacidade_maxima=2 * tamanho_lote, politica_transbordo='bloquear')
+        if self._instrumentacao is not None:
+            self._instrumentar_fila(fila)
+        erros = []
+
+        def produzir():
+            try:
+                for lote in self._ler_lotes_validados(caminho_arquivo, tamanho_lote, estatisticas, checkpoint):
+                    fila.enfileirar_lote(lote)
+            except BaseException as e:  # Repassado ao consumidor, que o levanta na thread que pediu a carga
+                erros.append(e)
+            finally:
+                fila.enfileirar(FIM_DA_CARGA)
+
+        produtor = threading.Thread(target=produzir, name='leitura-csv', daemon=True)
+        produtor.start()
+        linhas_processadas = self._processar_fila(fila, tamanho_lote, ate_o_fim_da_carga=True)
+        produtor.join()
+        if erros:
+            raise erros[0]
+        return linhas_processadas
 
-        self.processar_interacoes_da_fila()  # Processa as interações após carregar o CSV
+    def _registrar_checkpoint(self, caminho_arquivo: str, checkpoint: dict):
+        """
+        Guarda o ponto de parada de uma carga completa do arquivo ({'offset', 'linha', 'cabecalho'}),
+        a partir do qual carregar_interacoes_incremental continua. Arquivos vazios não registram checkpoint.
+        """
+        if checkpoint:
+            self._checkpoints[os.path.abspath(caminho_arquivo)] = dict(checkpoint)
 
     def processar_interacoes_da_fila(self):
         """
         Processa as interações enfileiradas, validando e registrando cada uma.
         Cria ou atualiza conteúdos, usuários e plataformas conforme necessário.
         """
+        linhas_processadas = self._processar_fila()
+        print(f"Total de interações processadas: {linhas_processadas}") 
+
+    def _processar_fila(self, fila=None, tamanho_lote: int = 1000, ate_o_fim_da_carga: bool = False):
+        """
+        Consome a fila de interações brutas (por padrão, a do sistema) em lotes de até `tamanho_lote` linhas
+        (desenfileirar_lote), vinculando cada linha às entidades.
+        Sem ate_o_fim_da_carga, para quando a fila fica vazia. Com ele (carga em fluxo, fila com política
+        'bloquear'), espera pelos lotes do produtor até encontrar o marcador FIM_DA_CARGA.
+        Retorna a quantidade de interações registradas com sucesso.
+        Complexidade: O(k log n), k = itens na fila, n = conteúdos/usuários nas árvores.
+        """
+        fila = self._fila_interacoes_brutas if fila is None else fila
         linhas_processadas = 0
-        while not self._fila_interacoes_brutas.is_empty(): # Enquanto houver interações na fila
-            dados = self._fila_interacoes_brutas.desenfileirar() # Obtém a próxima interação da fila
-            try: # Valida e processa a interação
-                id_conteudo = int(dados['id_conteudo'])
-                id_usuario = int(dados['id_usuario'])
-                nome_plataforma = dados['plataforma']
-                nome_conteudo = dados['nome_conteudo'].strip()
-
-                # Conteúdo
-                conteudo = self._arvore_conteudos.buscar(id_conteudo) # Busca conteúdo na árvore
-                if conteudo is None: # Se não encontrar, cria um novo conteúdo
-                    tipo_conteudo = dados.get('tipo_conteudo', 'video').strip().lower()
-                    duracao = int(dados.get('duracao_total_seg', 0))
-                    if tipo_conteudo == "video":
-                        conteudo = Video(id_conteudo, nome_conteudo, duracao)
-                    elif tipo_conteudo == "podcast":
-                        conteudo = Podcast(id_conteudo, nome_conteudo, duracao)
-                    else:
-                        conteudo = Artigo(id_conteudo, nome_conteudo, duracao)
-                    self._arvore_conteudos.inserir(id_conteudo, conteudo) # Insere o conteúdo na árvore
-
-                # Usuário
-                usuario = self._arvore_usuarios.buscar(id_usuario)
-                if usuario is None:
-                    usuario = Usuario(id_usuario)
-                    self._arvore_usuarios.inserir(id_usuario, usuario) # Insere o usuário na árvore
-
-                # Plataforma
-                if nome_plataforma not in self._plataformas_registradas:
-                    plataforma = self.obter_plataforma(nome_plataforma) # Obtém ou cadastra a plataforma
+        while True:
+            lote = fila.desenfileirar_lote(tamanho_lote, aguardar=ate_o_fim_da_carga)
+            if not lote and not ate_o_fim_da_carga:
+                return linhas_processadas
+            for dados in lote:
+                if dados is FIM_DA_CARGA:
+                    return linhas_processadas
+                if self._processar_linha(dados):
+                    linhas_processadas += 1 # Incrementa o contador de linhas processadas
+
+    def _processar_linha(self, dados):
+        """
+        Converte e vincula uma linha bruta (dicionário do CSV) já validada.
+        Retorna True se a interação foi registrada.
+        Complexidade: O(log n).
+        """
+        try:
+            linha = converter_linha_interacao(dados)
+        except Exception as e:
+            print(f"[ERRO] Falha ao processar interação: {e}")
+            return False
+        return self._vincular_linha(linha)
+
+    def _vincular_linha(self, linha):
+        """
+        Vincula uma LinhaInteracao a conteúdo, usuário e plataforma, criando-os se necessário.
+        Retorna True se a interação foi registrada.
+        Complexidade: O(log n).
+        """
+        try: # Valida e processa a interação
+            # Conteúdo
+            conteudo = self._arvore_conteudos.buscar(linha.id_conteudo) # Busca conteúdo na árvore
+            if conteudo is None: # Se não encontrar, cria um novo conteúdo
+                if linha.erro_conteudo:
+                    raise ValueError(linha.erro_conteudo)
+                if linha.tipo_conteudo == "video":
+                    conteudo = Video(linha.id_conteudo, linha.nome_conteudo, linha.duracao_total)
+                elif linha.tipo_conteudo == "podcast":
+                    conteudo = Podcast(linha.id_conteudo, linha.nome_conteudo, linha.duracao_total)
                 else:
-                    plataforma = self._plataformas_registradas[nome_plataforma]
+                    conteudo = Artigo(linha.id_conteudo, linha.nome_conteudo, linha.duracao_total)
+                self._inserir_conteudo(conteudo) # Insere o conteúdo na árvore
 
-                # Interação
-                try:
-                    interacao = Interacao(dados, conteudo, plataforma)
-                except ValueError as err:
-                    print(f"[Linha ignorada]: Erro ao criar Interacao: {err}.")
-                    continue
+            # Usuário
+            usuario = self._arvore_usuarios.buscar(linha.id_usuario)
+            if usuario is None:
+                usuario = Usuario(linha.id_usuario)
+                self._inserir_usuario(usuario) # Insere o usuário na árvore
 
-                # Vincula interação a conteúdo, usuário e plataforma
-                conteudo.adicionar_interacao(interacao)
-                usuario.adicionar_interacao(interacao)
-                plataforma.adicionar_interacao(interacao)
+            # Plataforma
+            nome_plataforma = linha.nome_plataforma
+            if nome_plataforma not in self._plataformas_registradas:
+                plataforma = self.obter_plataforma(nome_plataforma) # Obtém ou cadastra a plataforma
+            else:
+                plataforma = self._plataformas_registradas[nome_plataforma]
 
-                linhas_processadas += 1 # Incrementa o contador de linhas processadas
+            # Interação
+            if linha.erro_interacao:
+                print(f"[Linha ignorada]: Erro ao criar Interacao: {linha.erro_interacao}.")
+                if self._rankings is not None: # Entidades recém-criadas entram nos rankings mesmo sem interações
+                    self._atualizar_rankings(conteudo, usuario, plataforma)
+                return False
+            interacao = self._nova_interacao(
+                conteudo, plataforma, linha.id_usuario, linha.timestamp_interacao,
+                linha.tipo_interacao, linha.watch_duration_seconds, linha.comment_text
+            )
 
-            except Exception as e:
-                print(f"[ERRO] Falha ao processar interação: {e}")
-        print(f"Total de interações processadas: {linhas_processadas}") 
+            self._registrar_interacao(interacao, conteudo, usuario, plataforma)
+            return True
+
+        except Exception as e:
+            print(f"[ERRO] Falha ao processar interação: {e}")
+            return False
+
+    def _inserir_conteudo(self, conteudo):
+        """
+        Insere um conteúdo novo na árvore; no modo aproximado, ele passa a ler as contagens por tipo
+        do Count-Min Sketch em vez de mantê-las, e no armazenamento colunar guarda só as posições das
+        suas interações. Complexidade: O(log n).
+        """
+        if self._analise_aproximada is not None:
+            conteudo.usar_contagens_aproximadas(self._analise_aproximada.contagens)
+        if self._armazenamento_colunar is not None:
+            conteudo.usar_lista_interacoes(self._armazenamento_colunar.nova_lista_interacoes())
+        self._arvore_conteudos.inserir(conteudo.id_conteudo, conteudo)
+
+    def _inserir_usuario(self, usuario):
+        """
+        Insere um usuário novo na árvore; no modo aproximado, ele não mantém o conjunto de conteúdos
+        distintos nem as contagens por tipo, e lê a quantidade de distintos do seu HyperLogLog e as
+        contagens por tipo do Count-Min Sketch dos usuários; no armazenamento colunar, guarda só as
+        posições das suas interações. Complexidade: O(log n).
+        """
+        if self._analise_aproximada is not None:
+            usuario.usar_distintos_aproximados(self._analise_aproximada.sketch_conteudos_usuario(usuario.id_usuario),
+                                               self._analise_aproximada.contagens_usuarios)
+        if self._armazenamento_colunar is not None:
+            usuario.usar_lista_interacoes(self._armazenamento_colunar.nova_lista_interacoes())
+        self._arvore_usuarios.inserir(usuario.id_usuario, usuario)
+
+    def _registrar_interacao(self, interacao, conteudo, usuario, plataforma, atualizar_rankings: bool = True):
+        """
+        Vincula a interação a conteúdo, usuário e plataforma e a registra nos índices do sistema
+        (índice temporal e, se habilitados, sketches e rankings ao vivo). No armazenamento colunar, ela é
+        antes acrescentada às colunas, e entidades e índice guardam a sua posição.
+        Complexidade: O(log n).
+        """
+        colunar = self._armazenamento_colunar
+        if colunar is not None:
+            interacao = colunar.adicionar_interacao(interacao)
+        conteudo.adicionar_interacao(interacao)
+        usuario.adicionar_interacao(interacao)
+        plataforma.adicionar_interacao(interacao)
+        self._indice_temporal.adicionar(interacao.timestamp_epoch,
+                                        interacao if colunar is None else colunar.posicao(interacao))
+        if self._analise_aproximada is not None:
+            self._analise_aproximada.adicionar_interacao(interacao)
+        if self._tendencias is not None:
+            self._tendencias.adicionar(conteudo.id_conteudo, interacao.timestamp_epoch)
+        if atualizar_rankings and self._rankings is not None:
+            self._atualizar_rankings(conteudo, usuario, plataforma)
+
+    def _registrar_interacao_medido(self, interacao, conteudo, usuario, plataforma, atualizar_rankings: bool = True):
+        """
+        Mesmo comportamento de _registrar_interacao, medindo separadamente cada vinculação.
+        Usado no lugar dele quando a instrumentação está habilitada.
+        """
+        relogio = time.perf_counter
+        registrar = self._instrumentacao.registrar
+        colunar = self._armazenamento_colunar
+        if colunar is not None:
+            inicio = relogio()
+            interacao = colunar.adicionar_interacao(interacao)
+            registrar('armazenamento_colunar.adicionar', relogio() - inicio)
+        inicio = relogio()
+        conteudo.adicionar_interacao(interacao)
+        meio = relogio()
+        registrar('conteudo.adicionar_interacao', meio - inicio)
+        usuario.adicionar_interacao(interacao)
+        inicio = relogio()
+        registrar('usuario.adicionar_interacao', inicio - meio)
+        plataforma.adicionar_interacao(interacao)
+        meio = relogio()
+        registrar('plataforma.adicionar_interacao', meio - inicio)
+        self._indice_temporal.adicionar(interacao.timestamp_epoch,
+                                        interacao if colunar is None else colunar.posicao(interacao))
+        inicio = relogio()
+        registrar('indice_temporal.adicionar', inicio - meio)
+        if self._analise_aproximada is not None:
+            self._analise_aproximada.adicionar_interacao(interacao)
+            meio = relogio()
+            registrar('analise_aproximada.adicionar', meio - inicio)
+            inicio = meio
+        if self._tendencias is not None:
+            self._tendencias.adicionar(conteudo.id_conteudo, interacao.timestamp_epoch)
+            meio = relogio()
+            registrar('tendencias.adicionar', meio - inicio)
+            inicio = meio
+        if atualizar_rankings and self._rankings is not None:
+            self._atualizar_rankings(conteudo, usuario, plataforma)
+            registrar('rankings.atualizar', relogio() - inicio)
+
+    def _atualizar_rankings(self, conteudo, usuario, plataforma):
+        """
+        Reposiciona as entidades afetadas por uma nova interação em todos os rankings ao vivo.
+        Complexidade: O(m log n), m = quantidade de métricas ranqueadas.
+        """
+        for (entidade, _), ranking in self._rankings.items():
+            if entidade == 'conteudo':
+                ranking.atualizar(conteudo)
+            elif entidade == 'usuario':
+                ranking.atualizar(usuario)
+            else:
+                ranking.atualizar(plataforma)
+
+    # Instrumentação
+
+    def _habilitar_instrumentacao(self):
+        """
+        Substitui, apenas nesta instância, os métodos de cada etapa por versões medidas.
+        O pico de ocupação da fila é atualizado a cada enfileiramento e a profundidade das árvores
+        é lida no momento do resumo.
+        """
+        instrumentacao = self._instrumentacao = Instrumentacao()
+        envolver = instrumentacao.envolver
+
+        # Carga: o prefixo 'carga.' fica reservado às cargas de nível mais alto, cujos tempos são somados no
+        # resumo; etapas executadas dentro delas (como a mesclagem de cada arquivo de carregar_diretorio_csv)
+        # recebem outros nomes para não serem contadas duas vezes.
+        for nome, metodo in (('carga.csv', '_carregar_interacoes_csv'), ('carga.paralela', 'carregar_interacoes_csv_paralelo'),
+                             ('carga.diretorio', 'carregar_diretorio_csv'), ('mesclagem_estado_parcial', 'mesclar_estado_parcial'),
+                             ('carga.incremental', 'carregar_interacoes_incremental'), ('carga.snapshot', 'carregar_snapshot'),
+                             ('validacao', '_validar_interacao'), ('processamento_fila', '_processar_fila'),
+                             ('conversao_e_vinculacao', '_processar_linha'), ('vinculacao', '_vincular_linha'),
+                             ('criacao_interacao', '_nova_interacao')):
+            setattr(self, metodo, envolver(nome, getattr(self, metodo)))
+        self._registrar_interacao = self._registrar_interacao_medido
+        self._instrumentar_fila(self._fila_interacoes_brutas)
+        for nome, arvore in (('arvore_conteudos', self._arvore_conteudos), ('arvore_usuarios', self._arvore_usuarios)):
+            arvore.buscar = envolver(f'{nome}.buscar', arvore.buscar)
+            arvore.inserir = envolver(f'{nome}.inserir', arvore.inserir)
+
+        # Relatórios e consultas
+        for metodo in ('gerar_relatorio_engajamento_conteudos', 'gerar_relatorio_atividade_usuarios',
+                       'gerar_relatorio_engajamento_plataformas', 'buscar_interacoes_usuario',
+                       'top_n_por_metrica', 'identificar_top_n', 'posicao_no_ranking', '_ordenar_lista',
+                       'interacoes_no_intervalo', 'metricas_conteudos_no_intervalo', 'metricas_usuarios_no_intervalo',
+                       'metricas_plataformas_no_intervalo', 'agregar_por_periodo', 'tabela_relatorio',
+                       'conteudos_em_alta'):
+            setattr(self, metodo, envolver(f'relatorio.{metodo.lstrip("_")}', getattr(self, metodo)))
+
+    def _instrumentar_fila(self, fila):
+        """
+        Mede as operações da fila (a do sistema ou a fila limitada de uma carga em fluxo) e atualiza o pico
+        de ocupação a cada enfileiramento.
+        """
+        instrumentacao = self._instrumentacao
+        pico = lambda: instrumentacao.registrar_maximo('fila.pico_ocupacao', len(fila))
+        for metodo in ('enfileirar', 'enfileirar_lote'):
+            setattr(fila, metodo, instrumentacao.envolver(f'fila.{metodo}', getattr(fila, metodo), depois=pico))
+        for metodo in ('desenfileirar', 'desenfileirar_lote'):
+            setattr(fila, metodo, instrumentacao.envolver(f'fila.{metodo}', getattr(fila, metodo)))
+
+    def resumo_instrumentacao(self, como_json: bool = False):
+        """
+        Retorna o resumo da instrumentação (dicionário, ou texto JSON com como_json=True), ou None se ela
+        não estiver habilitada. Além das etapas e medidores, inclui o estado atual das estruturas
+        (tamanho e profundidade das árvores, ocupação da fila) e a vazão das cargas em interações por segundo.
+        Os relatórios de menu incluem o tempo de espera pela entrada do usuário.
+        O tempo de carga é a soma das etapas 'carga.*', que nunca são aninhadas umas nas outras.
+        """
+        if self._instrumentacao is None:
+            return None
+        resumo = self._instrumentacao.resumo()
+        segundos_carga = sum(etapa['segundos'] for nome, etapa in resumo['etapas'].items() if nome.startswith('carga.'))
+        interacoes = len(self._indice_temporal)
+        resumo['carga'] = {
+            'interacoes_registradas': interacoes,
+            'segundos': round(segundos_carga, 6),
+            'interacoes_por_segundo': round(interacoes / segundos_carga, 1) if segundos_carga > 0 else None,
+        }
+        resumo['estruturas'] = {
+            'arvore_conteudos': {'tamanho': len(self._arvore_conteudos), 'altura': self._arvore_conteudos.altura()},
+            'arvore_usuarios': {'tamanho': len(self._arvore_usuarios), 'altura': self._arvore_usuarios.altura()},
+            'fila': {'ocupacao': len(self._fila_interacoes_brutas),
+                     'pico_ocupacao': resumo['maximos'].get('fila.pico_ocupacao', 0)},
+            'plataformas': len(self._plataformas_registradas),
+        }
+        if como_json:
+            return json.dumps(resumo, ensure_ascii=False, indent=2)
+        return resumo
+
+    def carregar_interacoes_csv_paralelo(self, caminho_arquivo: str, processos: int = None):
+        """
+        Carrega o CSV dividindo-o em intervalos de bytes alinhados a quebras de linha.
+        Cada intervalo é lido, validado e convertido em um processo separado; este processo apenas
+        vincula as linhas convertidas às árvores e plataformas, na ordem original do arquivo.
+        Produz os mesmos avisos, contagens, entidades e checkpoint que `_carregar_interacoes_csv`.
+        Complexidade: O(n / p) para leitura e validação com p processos, O(n log n) para vinculação.
+        """
+        from analise.carga_paralela import carregar_lotes_paralelo # Importação tardia evita importação circular
+
+        estatisticas = {'total_linhas': 0, 'linhas_carregadas': 0, 'linhas_ignoradas': 0}
+        checkpoint = {}
+        lotes = []
+        try:
+            for linhas, avisos, total_linhas in carregar_lotes_paralelo(caminho_arquivo, processos, checkpoint):
+                for numero_linha, mensagem in avisos:
+                    print(f"[AVISO] Linha {numero_linha} ignorada: {mensagem}")
+                estatisticas['total_linhas'] += total_linhas
+                estatisticas['linhas_ignoradas'] += len(avisos)
+                estatisticas['linhas_carregadas'] += total_linhas - len(avisos)
+                lotes.append(linhas)
+        except (FileNotFoundError, PermissionError) as e:
+            print(f"Erro crítico ao carregar CSV: {e}")
+            raise
+        print(f"\nTotal de linhas do Arquivo: {estatisticas['total_linhas']}")
+        print(f"Linhas carregadas com sucesso: {estatisticas['linhas_carregadas']}")
+        print(f"Linhas ignoradas devido a erros de validação: {estatisticas['linhas_ignoradas']}")
+
+        linhas_processadas = 0
+        for linhas in lotes:
+            for linha in linhas:
+                if isinstance(linha, str): # Falha de conversão ocorrida no processo de leitura
+                    print(f"[ERRO] Falha ao processar interação: {linha}")
+                elif self._vincular_linha(linha):
+                    linhas_processadas += 1
+        print(f"Total de interações processadas: {linhas_processadas}")
+        self._registrar_checkpoint(caminho_arquivo, checkpoint)
+
+    def carregar_diretorio_csv(self, caminho_ou_padrao: str, processos: int = None, usar_threads: bool = False):
+        """
+        Carrega todos os arquivos CSV de um diretório (ou que correspondem a um padrão glob), em ordem alfabética.
+        Cada arquivo é lido, validado e convertido em paralelo em um EstadoParcial; os estados são mesclados
+        neste sistema na ordem dos arquivos, unificando as entidades pelo ID e pelo nome normalizado da plataforma.
+        Retorna a quantidade total de interações registradas.
+        Complexidade: O(n / p) para leitura e validação com p trabalhadores, O(n log n) para a mesclagem.
+        """
+        from analise.carga_diretorio import listar_arquivos_csv, carregar_estados_parciais # Importação tardia evita importação circular
+
+        arquivos = listar_arquivos_csv(caminho_ou_padrao)
+        totais = {'total_linhas': 0, 'linhas_ignoradas': 0, 'interacoes': 0}
+        for estado in carregar_estados_parciais(arquivos, processos, usar_threads):
+            totais['total_linhas'] += estado.total_registros
+            totais['linhas_ignoradas'] += len(estado.avisos)
+            totais['interacoes'] += self.mesclar_estado_parcial(estado)
+        print(f"\nArquivos carregados: {len(arquivos)}")
+        print(f"Total de linhas dos arquivos: {totais['total_linhas']}")
+        print(f"Linhas ignoradas devido a erros de validação: {totais['linhas_ignoradas']}")
+        print(f"Total de interações processadas: {totais['interacoes']}")
+        return totais['interacoes']
+
+    def mesclar_estado_parcial(self, estado):
+        """
+        Mescla um EstadoParcial (ver analise/carga_diretorio.py) ao sistema: exibe os avisos do arquivo
+        e vincula suas linhas, na ordem original, às entidades já existentes ou a novas entidades.
+        Retorna a quantidade de interações registradas. Complexidade: O(k log n), k = linhas do arquivo.
+        """
+        nome_arquivo = os.path.basename(estado.arquivo)
+        for numero_linha, mensagem in estado.avisos:
+            print(f"[AVISO] {nome_arquivo}, linha {numero_linha} ignorada: {mensagem}")
+        linhas_processadas = 0
+        for linha in estado.linhas:
+            if isinstance(linha, str): # Falha de conversão ocorrida no trabalhador
+                print(f"[ERRO] Falha ao processar interação: {linha}")
+            elif self._vincular_linha(linha):
+                linhas_processadas += 1
+        return linhas_processadas
+
+    def carregar_interacoes_incremental(self, caminho_arquivo: str, arquivo_finalizado: bool = False, max_linhas: int = None):
+        """
+        Carrega apenas as linhas acrescentadas ao CSV desde a chamada anterior para o mesmo arquivo
+        (ou desde a sua carga completa, por _carregar_interacoes_csv, pela carga paralela ou por um snapshot),
+        vinculando-as às árvores e plataformas já existentes.
+        O checkpoint guarda o deslocamento em bytes e o número de linhas já consumidas. Uma última linha
+        sem quebra de linha é tratada como escrita em andamento e fica para a próxima chamada, a não ser
+        que arquivo_finalizado=True.
+        O fim do intervalo novo é encontrado lendo blocos de trás para frente a partir do fim do arquivo,
+        e as linhas novas são lidas uma única vez, em fluxo, e vinculadas à medida que são convertidas.
+        Com max_linhas, lê no máximo essa quantidade de registros; os demais ficam para as próximas chamadas
+        (permite ingerir um acréscimo grande em lotes limitados).
+        Retorna a quantidade de interações registradas.
+        Complexidade: O(k log n) tempo, k = linhas novas; O(1) de memória além das interações registradas.
+        """
+        from analise.carga_paralela import iterar_intervalo, posicao_apos_ultima_quebra # Importação tardia evita importação circular
+
+        caminho_absoluto = os.path.abspath(caminho_arquivo)
+        checkpoint = self._checkpoints.get(caminho_absoluto)
+        tamanho = os.path.getsize(caminho_absoluto)
+
+        with open(caminho_absoluto, 'rb') as f:
+            if checkpoint is None:
+                linha_cabecalho = f.readline()
+                if not linha_cabecalho.endswith(b'\n') and not arquivo_finalizado:
+                    return 0  # Nem o cabeçalho foi escrito por completo
+                cabecalho = next(csv.reader([linha_cabecalho.decode('utf-8')]), [])
+                checkpoint = {'offset': f.tell(), 'linha': 1, 'cabecalho': cabecalho}
+                self._checkpoints[caminho_absoluto] = checkpoint
+            if tamanho < checkpoint['offset']:
+                raise ValueError(f"O arquivo {caminho_arquivo} diminuiu desde o último checkpoint; a carga incremental exige um arquivo apenas acrescido.")
+
+            # O intervalo termina na última quebra de linha, deixando uma eventual linha parcial para depois
+            fim = tamanho if arquivo_finalizado else posicao_apos_ultima_quebra(f, checkpoint['offset'], tamanho)
+        if fim <= checkpoint['offset']:
+            return 0
+
+        contagens = {}
+        linhas_ignoradas = 0
+        linhas_processadas = 0
+        for numero_linha, linha in iterar_intervalo(caminho_absoluto, checkpoint['cabecalho'],
+                                                    checkpoint['offset'], fim, contagens, max_linhas):
+            if isinstance(linha, ValueError):
+                print(f"[AVISO] Linha {checkpoint['linha'] + numero_linha} ignorada: {linha}")
+                linhas_ignoradas += 1
+            elif isinstance(linha, str):
+                print(f"[ERRO] Falha ao processar interação: {linha}")
+            elif self._vincular_linha(linha):
+                linhas_processadas += 1
+
+        checkpoint['offset'] = contagens['posicao']
+        checkpoint['linha'] += contagens['linhas_fisicas']
+        print(f"Linhas novas lidas: {contagens['total_registros']} | ignoradas: {linhas_ignoradas} | interações processadas: {linhas_processadas}")
+        return linhas_processadas
+
+    def checkpoint_incremental(self, caminho_arquivo: str):
+        """
+        Retorna uma cópia do checkpoint da carga incremental do arquivo ({'offset', 'linha', 'cabecalho'}),
+        ou None se o arquivo ainda não foi carregado.
+        """
+        checkpoint = self._checkpoints.get(os.path.abspath(caminho_arquivo))
+        return dict(checkpoint) if checkpoint else None
+
+    # Consultas por intervalo de tempo
+
+    @staticmethod
+    def _limite_epoch(momento):
+        """
+        Converte um limite de intervalo (datetime, epoch inteiro ou fracionário, ou None) para epoch inteiro.
+        Como os timestamps são inteiros, um epoch fracionário é arredondado para cima: tanto inicio <= t
+        quanto t < fim continuam selecionando exatamente os mesmos instantes.
+        Levanta ValueError para outros tipos e para epochs não finitos.
+        """
+        if momento is None or (isinstance(momento, int) and not isinstance(momento, bool)):
+            return momento
+        if isinstance(momento, float):
+            if not math.isfinite(momento):
+                raise ValueError(f"Limite de intervalo inválido: {momento}.")
+            return math.ceil(momento)
+        if isinstance(momento, datetime):
+            return para_epoch(momento)
+        raise ValueError(f"Limite de intervalo inválido: {momento!r}. Use datetime, epoch em segundos ou None.")
+
+    def interacoes_no_intervalo(self, inicio=None, fim=None):
+        """
+        Retorna as interações com inicio <= timestamp < fim (datetime ou epoch; None = sem limite),
+        em ordem de hora. Complexidade: O(log H + k), k = interações no intervalo.
+        """
+        return self._interacoes_indexadas(self._indice_temporal.intervalo(self._limite_epoch(inicio), self._limite_epoch(fim)))
+
+    def _interacoes_indexadas(self, itens):
+        """
+        Lista de interações a partir de itens do índice temporal: os próprios objetos ou, no armazenamento
+        colunar, posições nas colunas (as interações são recriadas). Complexidade: O(k).
+        """
+        if self._armazenamento_colunar is None:
+            return list(itens)
+        recriar = self._armazenamento_colunar.interacao
+        return [recriar(posicao) for posicao in itens]
+
+    def _agregar_interacoes(self, interacoes, chave, contar_conteudos=False):
+        """
+        Agrega interações por `chave` em uma única passada, com as mesmas métricas das entidades:
+        total de interações, engajamento, contagem por tipo, tempo total e média de consumo
+        (e, opcionalmente, conteúdos distintos). Complexidade: O(k).
+        """
+        resultado = {}
+        for interacao in interacoes:
+            grupo = chave(interacao)
+            metricas = resultado.get(grupo)
+            if metricas is None:
+                metricas = resultado[grupo] = {
+                    "total_interacoes": 0, "total_interacoes_engajamento": 0,
+                    "contagem_por_tipo_interacao": {}, "tempo_total_consumo": 0,
+                }
+                if contar_conteudos:
+                    metricas["conteudos"] = set()
+            tipo = interacao.tipo_interacao
+            metricas["total_interacoes"] += 1
+            metricas["contagem_por_tipo_interacao"][tipo] = metricas["contagem_por_tipo_interacao"].get(tipo, 0) + 1
+            if tipo in ('like', 'share', 'comment'):
+                metricas["total_interacoes_engajamento"] += 1
+            metricas["tempo_total_consumo"] += interacao.watch_duration_seconds
+            if contar_conteudos:
+                metricas["conteudos"].add(interacao.conteudo_associado)
+        for metricas in resultado.values():
+            metricas["media_tempo_consumo"] = metricas["tempo_total_consumo"] / metricas["total_interacoes"]
+            if contar_conteudos:
+                metricas["quantidade_conteudos"] = len(metricas.pop("conteudos"))
+        return resultado
+
+    def metricas_conteudos_no_intervalo(self, inicio=None, fim=None):
+        """Métricas por id_conteudo considerando apenas as interações do intervalo. Complexidade: O(log H + k)."""
+        return self._agregar_interacoes(self.interacoes_no_intervalo(inicio, fim),
+                                        lambda i: i.conteudo_associado.id_conteudo)
+
+    def metricas_usuarios_no_intervalo(self, inicio=None, fim=None):
+        """Métricas por id_usuario considerando apenas as interações do intervalo. Complexidade: O(log H + k)."""
+        return self._agregar_interacoes(self.interacoes_no_intervalo(inicio, fim),
+                                        lambda i: i.id_usuario, contar_conteudos=True)
+
+    def metricas_plataformas_no_intervalo(self, inicio=None, fim=None):
+        """Métricas por nome de plataforma considerando apenas as interações do intervalo. Complexidade: O(log H + k)."""
+        return self._agregar_interacoes(self.interacoes_no_intervalo(inicio, fim),
+                                        lambda i: i.plataforma_interacao.nome_plataforma)
+
+    def agregar_por_periodo(self, inicio=None, fim=None, granularidade: str = 'hora'):
+        """
+        Consolida as interações do intervalo por 'hora' ou 'dia'.
+        Retorna uma lista, em ordem cronológica e apenas com períodos que têm interações, de dicionários
+        com 'inicio_periodo' (datetime) e as métricas de _agregar_interacoes.
+        Complexidade: O(log H + h + k).
+        """
+        if granularidade not in ('hora', 'dia'):
+            raise ValueError(f"Granularidade inválida: {granularidade}. Deve ser 'hora' ou 'dia'.")
+        periodos = {}
+        for hora, interacoes in self._indice_temporal.horas(self._limite_epoch(inicio), self._limite_epoch(fim)):
+            periodo = hora if granularidade == 'hora' else hora // SEGUNDOS_POR_DIA * SEGUNDOS_POR_DIA
+            periodos.setdefault(periodo, []).extend(self._interacoes_indexadas(interacoes))
+        resultado = []
+        for periodo, interacoes in periodos.items():
+            metricas = self._agregar_interacoes(interacoes, lambda i: None)[None]
+            metricas["inicio_periodo"] = datetime(1970, 1, 1) + timedelta(seconds=periodo)
+            resultado.append(metricas)
+        return resultado
+
+    # Motor de relatórios
+
+    def versao_dados(self):
+        """
+        Identifica o estado dos dados carregados: muda sempre que uma interação, conteúdo, usuário ou
+        plataforma é registrado (o sistema nunca remove dados). Complexidade: O(1).
+        """
+        return (len(self._indice_temporal), len(self._arvore_conteudos), len(self._arvore_usuarios),
+                len(self._plataformas_registradas))
+
+    def tabela_relatorio(self, inicio=None, fim=None):
+        """
+        Retorna a TabelaRelatorio com todas as métricas de conteúdos, usuários e plataformas, calculada
+        em uma única passada pelas interações (ver analise/motor_relatorios.py).
+        Sem limites, a tabela inclui todas as entidades cadastradas e é reaproveitada enquanto versao_dados()
+        não mudar; com armazenamento='colunar', ela vem das agregações em grupo das colunas, e no modo
+        aproximado as contagens por tipo e os conteúdos distintos vêm dos sketches, como nos rankings.
+        Com inicio/fim (datetime ou epoch), considera apenas as interações do intervalo e inclui
+        só as entidades que têm interações nele (sempre com valores exatos: os sketches não são por intervalo).
+        Complexidade: O(k + c + u + p) ao calcular; O(1) quando reaproveitada.
+        """
+        if inicio is not None or fim is not None:
+            return calcular_tabela(self.interacoes_no_intervalo(inicio, fim))
+        versao = self.versao_dados()
+        if self._tabela_relatorio is None or self._tabela_relatorio[0] != versao:
+            conteudos = self._arvore_conteudos.percurso_em_ordem()
+            usuarios = self._arvore_usuarios.percurso_em_ordem()
+            plataformas = sorted(self._plataformas_registradas.items())  # Plataformas por nome, como em listar_plataformas
+            if self._armazenamento_colunar is not None:
+                tabela = self._armazenamento_colunar.tabela_relatorio(conteudos, usuarios, plataformas)
+            else:
+                # Percorrer conteúdo a conteúdo mantém os comentários de cada um na ordem de chegada
+                interacoes = (interacao for conteudo in conteudos for interacao in conteudo.interacoes)
+                tabela = calcular_tabela(interacoes, conteudos, usuarios, plataformas, self._analise_aproximada)
+            self._tabela_relatorio = (versao, tabela)
+        return self._tabela_relatorio[1]
+
+    # Métodos de snapshot (reinício rápido)
+
+    def salvar_snapshot(self, caminho_snapshot: str, caminho_csv: str):
+        """
+        Grava o estado carregado em um snapshot binário associado ao CSV de origem.
+        Complexidade: O(n log n).
+        """
+        snapshot.salvar_snapshot(self, caminho_snapshot, caminho_csv)
+
+    def carregar_snapshot(self, caminho_snapshot: str, caminho_csv: str, verificar_hash: bool = True):
+        """
+        Restaura o estado a partir do snapshot, se ele for válido para o CSV informado.
+        Retorna True se o snapshot foi usado. Levanta ValueError se o sistema já tiver dados carregados.
+        Complexidade: O(n).
+        """
+        if any(self.versao_dados()):
+            raise ValueError("O snapshot só pode ser carregado em um sistema vazio.")
+        if not snapshot.snapshot_valido(caminho_snapshot, caminho_csv, verificar_hash):
+            return False
+        total = snapshot.carregar_snapshot(self, caminho_snapshot, caminho_csv)
+        print(f"Estado restaurado do snapshot: {total} interações.")
+        return True
+
+    def carregar_interacoes_com_snapshot(self, caminho_csv: str, caminho_snapshot: str = None, verificar_hash: bool = True, **opcoes_carga):
+        """
+        Usa o snapshot de `caminho_csv` se ele existir e estiver atualizado; caso contrário, carrega o CSV
+        (repassando `opcoes_carga` para _carregar_interacoes_csv) e grava um novo snapshot.
+        Por padrão o snapshot fica ao lado do CSV, com a extensão '.snapshot'.
+        Levanta ValueError se o sistema já tiver dados carregados (ver carregar_snapshot).
+        """
+        caminho_snapshot = caminho_snapshot or caminho_csv + '.snapshot'
+        if self.carregar_snapshot(caminho_snapshot, caminho_csv, verificar_hash):
+            return
+        self._carregar_interacoes_csv(caminho_csv, **opcoes_carga)
+        try:
+            self.salvar_snapshot(caminho_snapshot, caminho_csv)
+        except OSError as e:
+            print(f"[AVISO] Não foi possível gravar o snapshot: {e}")
+
+    # Exportação não interativa
+
+    def exportar_relatorios(self, diretorio_saida: str, formato: str = 'csv', top_n: int = 10):
+        """
+        Grava todos os relatórios em arquivos CSV ou JSON no diretório informado, sem interação com o terminal.
+        Retorna um dicionário nome do relatório -> (caminho, linhas gravadas). Ver analise/exportacao.py.
+        """
+        return exportacao.exportar_relatorios(self, diretorio_saida, formato, top_n)
+
+    def analise_aproximada(self):
+        """Retorna a AnaliseAproximada alimentada durante a carga, ou None fora do modo aproximado."""
+        return self._analise_aproximada
+
+    def relatorio_aproximado(self):
+        """
+        Retorna o relatório aproximado (ver AnaliseAproximada.relatorio) com os limites de erro e a memória
+        dos sketches, ou None fora do modo aproximado.
+        """
+        if self._analise_aproximada is None:
+            return None
+        relatorio = self._analise_aproximada.relatorio()
+        relatorio['limites_erro'] = self._analise_aproximada.limites_erro()
+        relatorio['memoria_bytes'] = self._analise_aproximada.memoria_bytes()
+        return relatorio
+
+    def monitorar_tendencias(self, capacidade: int = 100, meia_vida_segundos: float = None):
+        """
+        Passa a acompanhar, a cada interação registrada, os conteúdos em alta com um Space-Saving de memória
+        fixa (`capacidade` conteúdos monitorados). Com meia_vida_segundos, o peso de cada interação cai pela
+        metade a cada meia-vida, contada a partir da interação mais recente. Apenas as interações registradas
+        depois da chamada são consideradas. Complexidade: O(1).
+        """
+        self._tendencias = SpaceSaving(capacidade, meia_vida_segundos)
+
+    def conteudos_em_alta(self, k: int = 10):
+        """
+        Retorna até k tuplas (Conteudo, pontuação, erro máximo), da maior para a menor pontuação,
+        a qualquer momento da carga. A pontuação é a quantidade (decaída, se houver meia-vida) de interações
+        e superestima a real em no máximo o erro. Levanta ValueError se monitorar_tendencias não foi chamado.
+        Complexidade: O(k log n).
+        """
+        if self._tendencias is None:
+            raise ValueError("O monitoramento de tendências não está habilitado (ver monitorar_tendencias).")
+        return [(self._arvore_conteudos.buscar(id_conteudo), pontuacao, erro)
+                for id_conteudo, pontuacao, erro in self._tendencias.top(k)]
+
+    def estado_agregado(self):
+        """
+        Retorna o EstadoAgregado (serializável e mesclável) das interações carregadas, para combinar
+        com os estados de outros shards. Ver analise/estado_agregado.py. Complexidade: O(k + c + u + p).
+        """
+        return EstadoAgregado.de_sistema(self)
 
     # Métodos de gerenciamento de plataforma
 
@@ -166,9 +963,18 @@ class SistemaAnaliseEngajamento:
 
         # Cria e registra a plataforma
         plataforma = Plataforma(nome_plataforma)
-        self._plataformas_registradas[nome] = plataforma
+        self._inserir_plataforma(nome, plataforma)
         return plataforma
 
+    def _inserir_plataforma(self, chave: str, plataforma):
+        """
+        Registra uma plataforma nova pelo nome normalizado; no armazenamento colunar, ela guarda só as
+        posições das suas interações. Complexidade: O(1).
+        """
+        if self._armazenamento_colunar is not None:
+            plataforma.usar_lista_interacoes(self._armazenamento_colunar.nova_lista_interacoes())
+        self._plataformas_registradas[chave] = plataforma
+
     def obter_plataforma(self, nome_plataforma: str):
         """
         Retorna uma plataforma pelo nome, cadastrando se não existir.
@@ -184,6 +990,25 @@ class SistemaAnaliseEngajamento:
         """
         return list(self._plataformas_registradas.values()) 
 
+    def buscar_plataforma(self, nome_plataforma: str):
+        """
+        Retorna a plataforma com o nome informado (sem diferenciar maiúsculas), ou None. Não cadastra.
+        Complexidade: O(1).
+        """
+        return self._plataformas_registradas.get(nome_plataforma.strip().lower())
+
+    def buscar_conteudo(self, id_conteudo: int):
+        """
+        Retorna o conteúdo com o ID informado, ou None. Complexidade: O(log n).
+        """
+        return self._arvore_conteudos.buscar(id_conteudo)
+
+    def buscar_usuario(self, id_usuario: int):
+        """
+        Retorna o usuário com o ID informado, ou None. Complexidade: O(log n).
+        """
+        return self._arvore_usuarios.buscar(id_usuario)
+
     def listar_conteudos(self):
         """
         Retorna uma lista de todos os conteúdos cadastrados.
@@ -210,13 +1035,42 @@ class SistemaAnaliseEngajamento:
 
     def identificar_top_n(self, lista, top_n, metrica):
         """
-        Ordena o top N de uma lista por uma métrica escolhida.
-        Utiliza quicksort para listas grandes por sua eficiência e insertion sort para listas pequenas pela simplicidade e rapidez.
-        Se a lista tiver 20 ou menos itens, usa insertion sort; caso contrário, usa quicksort.
+        Seleciona o top N de uma lista por uma métrica escolhida, em ordem decrescente.
+        A métrica é avaliada exatamente uma vez por item e a seleção usa um heap limitado a N elementos
+        (heapq.nlargest), em O(n log N) em vez de ordenar a lista inteira.
+        Empates mantêm a ordem original da lista (ordem crescente de ID para conteúdos e usuários),
+        o mesmo critério estável do insertion sort. Com top_n=None, retorna a lista inteira ordenada.
+        """
+        if top_n is None:
+            top_n = len(lista)
+        return heapq.nlargest(top_n, lista, key=metrica)
+
+    def top_n_por_metrica(self, entidade, metrica, top_n, lista=None):
+        """
+        Retorna o top N de 'conteudo', 'usuario' ou 'plataforma' por uma métrica de METRICAS_RANKING.
+        Usa o ranking ao vivo quando disponível (O(k + log n)); caso contrário, identificar_top_n sobre a lista.
+        Ambos produzem a mesma ordem, inclusive nos empates.
         """
-        algoritmo = 'insertion' if len(lista) <= 20 else 'quick'
-        self._ordenar_lista(lista, algoritmo=algoritmo, key=metrica, reverse=True)
-        return lista[:top_n] # Retorna o top N
+        if self._rankings is not None:
+            ranking = self._rankings[(entidade, metrica)]
+            return ranking.topo(len(ranking) if top_n is None else top_n)
+        if lista is None:
+            lista = {'conteudo': self.listar_conteudos, 'usuario': self.listar_usuarios,
+                     'plataforma': self.listar_plataformas}[entidade]()
+        return self.identificar_top_n(lista, top_n, METRICAS_RANKING[entidade][metrica])
+
+    def posicao_no_ranking(self, entidade, metrica, objeto):
+        """
+        Retorna a posição (começando em 1) de um conteúdo, usuário ou plataforma no ranking da métrica.
+        Com rankings ao vivo custa O(log n); sem eles, ranqueia a lista inteira (O(n log n)).
+        """
+        if self._rankings is not None:
+            return self._rankings[(entidade, metrica)].posicao(objeto)
+        ordenados = self.top_n_por_metrica(entidade, metrica, None)
+        for posicao, item in enumerate(ordenados, 1):
+            if item is objeto:
+                return posicao
+        return None
 
     def _ordenar_lista(self, lista, algoritmo, key=None, reverse=False):
         """
@@ -267,17 +1121,16 @@ class SistemaAnaliseEngajamento:
         """
         Gera relatórios de engajamento dos conteúdos cadastrados.
         Permite ao usuário escolher entre diferentes métricas de engajamento.
+        Os valores exibidos vêm da tabela do motor de relatórios (tabela_relatorio), calculada em uma única passada.
         """
-        conteudos = self._arvore_conteudos.percurso_em_ordem() # Obtém lista de todos conteúdos cadastrados
-
-        metricas_map = { # Mapeamento de métricas para funções de cálculo e nomes amigáveis usados no cabeçalho do relatório
-            "total_interacoes_engajamento": {'func': lambda c: c.calcular_total_interacoes_engajamento(),'nome':'TOTAL DE INTERAÇÕES DE ENGAJAMENTO'},
-            "visualizacoes": {'func': lambda c: c.calcular_contagem_por_tipo_interacao().get("view_start", 0),'nome':'VISUALIZAÇÕES'},
-            "likes": {'func': lambda c: c.calcular_contagem_por_tipo_interacao().get("like", 0),'nome':'CURTIDAS'},
-            "comentarios": {'func': lambda c: c.calcular_contagem_por_tipo_interacao().get("comment", 0),'nome':'COMENTÁRIOS'},
-            "shares": {'func': lambda c: c.calcular_contagem_por_tipo_interacao().get("share", 0),'nome':'COMPARTILHAMENTOS'},
-            "tempo_total_consumo": {'func': lambda c: c.calcular_tempo_total_consumo(),'nome':'TEMPO TOTAL DE CONSUMO'},
-            "media_tempo_consumo": {'func': lambda c: c.calcular_media_tempo_consumo(),'nome':'MÉDIA DE TEMPO DE CONSUMO'}
+        metricas_map = { # Mapeamento de métricas para a leitura na linha da tabela e nomes amigáveis usados no cabeçalho do relatório
+            "total_interacoes_engajamento": {'func': lambda l: l['total_interacoes_engajamento'],'nome':'TOTAL DE INTERAÇÕES DE ENGAJAMENTO'},
+            "visualizacoes": {'func': lambda l: l['contagem_por_tipo_interacao'].get("view_start", 0),'nome':'VISUALIZAÇÕES'},
+            "likes": {'func': lambda l: l['contagem_por_tipo_interacao'].get("like", 0),'nome':'CURTIDAS'},
+            "comentarios": {'func': lambda l: l['contagem_por_tipo_interacao'].get("comment", 0),'nome':'COMENTÁRIOS'},
+            "shares": {'func': lambda l: l['contagem_por_tipo_interacao'].get("share", 0),'nome':'COMPARTILHAMENTOS'},
+            "tempo_total_consumo": {'func': lambda l: l['tempo_total_consumo'],'nome':'TEMPO TOTAL DE CONSUMO'},
+            "media_tempo_consumo": {'func': lambda l: l['media_tempo_consumo'],'nome':'MÉDIA DE TEMPO DE CONSUMO'}
         }
 
         while True:  # Loop para usuário selecionar a métrica
@@ -299,10 +1152,9 @@ class SistemaAnaliseEngajamento:
                     os.system('cls')
 
                     print("--- RELATÓRIO GERAL DE ENGAJAMENTO DOS CONTEÚDOS ---\n")
-                    for conteudo in conteudos:
-                        metricas = conteudo.calcular_metricas()
-                        print(f"ID do Conteúdo: {conteudo.id_conteudo}")
-                        print(f"  Nome do Conteúdo: {conteudo.nome_conteudo}")
+                    for metricas in self.tabela_relatorio().linhas('conteudo'):
+                        print(f"ID do Conteúdo: {metricas['id_conteudo']}")
+                        print(f"  Nome do Conteúdo: {metricas['nome_conteudo']}")
                         print(f"  Total de Interações de Engajamento: {metricas.get('total_interacoes_engajamento', 0)}")
                         print("  Contagem por Tipo de Interação:")
                         for tipo, quantidade in metricas.get('contagem_por_tipo_interacao', {}).items():
@@ -311,7 +1163,7 @@ class SistemaAnaliseEngajamento:
                         print(f"  Média de Tempo de Consumo: {str(timedelta(seconds=int(metricas.get('media_tempo_consumo', 0))))}")
                         print(f"  Percentual Médio Assistido: {metricas.get('percentual_medio_assistido', 0)}")
                         print("  Comentários:")
-                        comentarios = conteudo.listar_comentarios()
+                        comentarios = metricas['comentarios']
                         if comentarios:
                             for comentario in comentarios:
                                 print(f"    - {comentario}")
@@ -322,7 +1174,7 @@ class SistemaAnaliseEngajamento:
             
                 elif sub_opcao in ["2", "3", "4", "5", "6", "7", "8"]:
                     os.system('cls')
-                    conteudos_ordenados = conteudos.copy()  # Cria ou reseta a lista ordenada para o estado original
+                    tabela = self.tabela_relatorio()
                     metrica_keys = { # Mapeamento de opções para chaves de métrica
                         "2": "total_interacoes_engajamento",
                         "3": "visualizacoes",
@@ -333,13 +1185,13 @@ class SistemaAnaliseEngajamento:
                         "8": "media_tempo_consumo"
                     }
                     metrica = metrica_keys[sub_opcao]
-                    top_conteudos = self.identificar_top_n(conteudos_ordenados, top_n, metricas_map[metrica]['func'])
+                    top_conteudos = self.top_n_por_metrica('conteudo', metrica, top_n)
 
                     print(f"TOP {top_n} CONTEÚDOS POR {metricas_map[metrica]['nome']}:\n")
                     print(f"{'Rank':<4} | {'ID':<4} | {'Conteúdo':<30} | {metricas_map[metrica]['nome']:<25}")
                     print("-" * 65)
                     for i, conteudo in enumerate(top_conteudos, 1):
-                        valor = metricas_map[metrica]['func'](conteudo)
+                        valor = metricas_map[metrica]['func'](tabela.linha('conteudo', conteudo.id_conteudo))
                         if metrica in ['media_tempo_consumo', 'tempo_total_consumo']:
                             valor = str(timedelta(seconds=int(valor)))
                         print(f"{i:<4} | {conteudo.id_conteudo:<4} | {conteudo.nome_conteudo:<30} | {valor:<25.2f}" if isinstance(valor, float) else f"{i:<4} | {conteudo.id_conteudo:<4} | {conteudo.nome_conteudo:<30} | {valor:<25}")
@@ -354,13 +1206,12 @@ class SistemaAnaliseEngajamento:
         """
         Gera relatórios de atividade dos usuários cadastrados.
         Permite ao usuário escolher entre diferentes métricas de atividade.
+        As métricas exibidas vêm da tabela do motor de relatórios (tabela_relatorio).
         """
-        usuarios = self._arvore_usuarios.percurso_em_ordem()
-
         metricas_map = {
-            'quantidade_interacoes': {'func': lambda u: len(u.interacoes), 'nome': 'INTERAÇÕES'},
-            'quantidade_conteudos': {'func': lambda u: len(u.obter_conteudos_unicos()), 'nome': 'CONTEÚDOS'},
-            'tempo_total_assistido': {'func': lambda u: u.calcular_tempo_total_assistido(), 'nome': 'TEMPO TOTAL ASSISTIDO'}
+            'quantidade_interacoes': {'nome': 'INTERAÇÕES'},
+            'quantidade_conteudos': {'nome': 'CONTEÚDOS'},
+            'tempo_total_assistido': {'nome': 'TEMPO TOTAL ASSISTIDO'}
         }
 
         while True:  # Loop para usuário selecionar a métrica
@@ -381,7 +1232,7 @@ class SistemaAnaliseEngajamento:
                     print("--- LISTA DE TODAS AS INTERAÇÕES POR USUÁRIO ---\n")
                     print(f"{'Usuário':<8} | {'Interação':<12} | {'Conteúdo':<28} | {'Plataforma':<14} | {'Data/Hora':<16} | {'Duração(s)':<10} | {'Comentário'}")
                     print("-" * 150)
-                    for usuario in usuarios:
+                    for usuario in self._arvore_usuarios.percurso_em_ordem():
                         interacoes_ordenadas = sorted(
                             usuario.interacoes,
                             key=lambda i: getattr(i, 'timestamp_interacao', '')
@@ -402,33 +1253,35 @@ class SistemaAnaliseEngajamento:
                     input("\nPressione Enter para voltar...")
                 elif sub_opcao in ('3', '4', '5'):
                     os.system('cls')
-                    usuarios_ordenados = usuarios.copy()  # Cria ou reseta a lista para o estado original
+                    tabela = self.tabela_relatorio()
                     metrica_keys = {
                     "3": "quantidade_interacoes",
                     "4": "quantidade_conteudos",
                     "5": "tempo_total_assistido",
                     }
                     metrica = metrica_keys[sub_opcao]
-                    top_usuarios = self.identificar_top_n(usuarios_ordenados, top_n, metricas_map[metrica]['func'])
+                    top_usuarios = self.top_n_por_metrica('usuario', metrica, top_n)
 
                     print(f"TOP {top_n} USUÁRIOS POR {metricas_map[metrica]['nome']}:\n")
                     print(f"{'Rank':<4} | {'Usuário':<7} | {'Interações':<10} | {'Comentários':<11} | {'Conteúdos':<9} | {'Tempo Total Assistido':<21} | {'Plataformas Mais Frequentes':<38} | {'Views':<7} | {'Likes':<7} | {'Shares':<7}")
                     print("-" * 148)
                     for i, usuario in enumerate(top_usuarios, 1):
+                        linha = tabela.linha('usuario', usuario.id_usuario)
+                        contagem = linha['contagem_por_tipo_interacao']
                         plataformas_str = ', '.join(
                             f"{p[0].nome_plataforma}({p[1]})" if hasattr(p[0], 'nome_plataforma') else str(p[0])
-                            for p in usuario.plataformas_mais_frequentes(top_n=3)
+                            for p in linha['plataformas_mais_frequentes'][:3]
                         )
                         print(f"{i:<4} | "
-                            f"{usuario.id_usuario:<7} | "
-                            f"{len(usuario.interacoes):<10} | "
-                            f"{len(usuario.filtrar_interacoes_por_tipo('comment')):<11} | "
-                            f"{len(usuario.obter_conteudos_unicos()):<9} | "
-                            f"{str(timedelta(seconds=int(usuario.calcular_tempo_total_assistido()))):<21} | "
+                            f"{linha['id_usuario']:<7} | "
+                            f"{linha['quantidade_interacoes']:<10} | "
+                            f"{contagem.get('comment', 0):<11} | "
+                            f"{linha['quantidade_conteudos']:<9} | "
+                            f"{str(timedelta(seconds=int(linha['tempo_total_assistido']))):<21} | "
                             f"{plataformas_str:<38} | "
-                            f"{len(usuario.filtrar_interacoes_por_tipo('view_start')):<7} | "
-                            f"{len(usuario.filtrar_interacoes_por_tipo('like')):<7} | "
-                            f"{len(usuario.filtrar_interacoes_por_tipo('share')):<7}")
+                            f"{contagem.get('view_start', 0):<7} | "
+                            f"{contagem.get('like', 0):<7} | "
+                            f"{contagem.get('share', 0):<7}")
                     print("-" * 148)
                     input("\nPressione Enter para voltar...")
 
@@ -474,13 +1327,12 @@ class SistemaAnaliseEngajamento:
         """
         Gera relatórios de engajamento das plataformas cadastradas.
         Permite ao usuário escolher entre diferentes métricas de engajamento.
+        As métricas exibidas vêm da tabela do motor de relatórios (tabela_relatorio).
         """
-        plataformas = self.listar_plataformas()  # Obtém lista de todas plataformas cadastradas
-
         metricas_map = {
-            'quantidade_interacoes': {'func': lambda p: p.calcular_total_interacoes_engajamento(), 'nome': 'INTERAÇÕES DE ENGAJAMENTO'},
-            'tempo_medio_consumo': {'func': lambda p: p.calcular_media_tempo_consumo(), 'nome': 'TEMPO MÉDIO DE CONSUMO'},
-            'tempo_total_assistido': {'func': lambda p: p.calcular_tempo_total_consumo(), 'nome': 'TEMPO TOTAL DE CONSUMO'}
+            'quantidade_interacoes': {'nome': 'INTERAÇÕES DE ENGAJAMENTO'},
+            'tempo_medio_consumo': {'nome': 'TEMPO MÉDIO DE CONSUMO'},
+            'tempo_total_assistido': {'nome': 'TEMPO TOTAL DE CONSUMO'}
         }
 
         while True:
@@ -497,31 +1349,32 @@ class SistemaAnaliseEngajamento:
                 os.system('cls')
 
                 print("--- LISTA DE TODAS PLATAFORMAS REGISTRADAS ---\n")
-                for plataforma in plataformas:
-                    print(f"- {plataforma.nome_plataforma}")
+                for linha in self.tabela_relatorio().linhas('plataforma'):
+                    print(f"- {linha['nome_plataforma']}")
                 print("-" * 60)
                 input("\nPressione Enter para voltar...")
 
             elif sub_opcao in ('2', '3', '4'):
                     os.system('cls')
-                    plataformas_ordenadas = plataformas.copy()  # Cria ou reseta a lista para o estado original
+                    tabela = self.tabela_relatorio()
                     metrica_keys = {
                     "2": "quantidade_interacoes",
                     "3": "tempo_medio_consumo",
                     "4": "tempo_total_assistido",
                     }
                     metrica = metrica_keys[sub_opcao]
-                    top_plataformas = self.identificar_top_n(plataformas_ordenadas, top_n, metricas_map[metrica]['func'])
+                    top_plataformas = self.top_n_por_metrica('plataforma', metrica, top_n)
 
                     print(f"TOP {top_n} PLATAFORMAS POR {metricas_map[metrica]['nome']}:\n")
                     print(f"{'Rank':<4} | {'Plataforma':<15} | {'Interações de Engajamento':<25} | {'Tempo Médio de Consumo':<22} | {'Tempo Total Assistido':<25}")
                     print("-" * 140)
                     for i, plataforma in enumerate(top_plataformas, 1):
+                        linha = tabela.linha('plataforma', plataforma.nome_plataforma.strip().lower())
                         print(f"{i:<4} | "
-                            f"{plataforma.nome_plataforma:<15} | "
-                            f"{plataforma.calcular_total_interacoes_engajamento():<25} | "
-                            f"{str(timedelta(seconds=int(plataforma.calcular_media_tempo_consumo()))):<22} | "
-                            f"{str(timedelta(seconds=int(plataforma.calcular_tempo_total_consumo()))):<25}")
+                            f"{linha['nome_plataforma']:<15} | "
+                            f"{linha['total_interacoes_engajamento']:<25} | "
+                            f"{str(timedelta(seconds=int(linha['media_tempo_consumo']))):<22} | "
+                            f"{str(timedelta(seconds=int(linha['tempo_total_consumo']))):<25}")
                     print("-" * 140)
                     input("\nPressione Enter para voltar...")
 
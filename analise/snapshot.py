@@ -0,0 +1,182 @@
+"""
+Módulo snapshot.py
+Snapshot binário e versionado do estado carregado do sistema, para reinícios rápidos.
+
+O snapshot não serializa o grafo de objetos (que é profundo e cheio de referências cruzadas):
+guarda tabelas planas de conteúdos, usuários e plataformas e as interações em colunas (`array`),
+na ordem em que foram vinculadas. Ao carregar, as entidades são recriadas e as interações
+revinculadas diretamente, sem ler, validar ou converter o CSV novamente.
+
+O arquivo começa com um cabeçalho (versão do formato e impressão digital do CSV de origem:
+tamanho, mtime e hash SHA-256). Se o CSV mudar, o snapshot é considerado inválido.
+O checkpoint da carga incremental do CSV também é gravado, para que as linhas acrescentadas depois
+da restauração sejam lidas a partir do mesmo ponto.
+Observação: o snapshot usa pickle e só deve ser carregado a partir de arquivos confiáveis.
+"""
+
+import hashlib
+import os
+import pickle
+from array import array
+
+from entidades.conteudo import Video, Podcast, Artigo
+from entidades.interacao import Interacao
+from entidades.plataforma import Plataforma
+from entidades.usuario import Usuario
+
+VERSAO_SNAPSHOT = 2
+_CLASSES_CONTEUDO = {'Video': Video, 'Podcast': Podcast, 'Artigo': Artigo}
+_CODIGO_TIPO = {tipo: codigo for codigo, tipo in enumerate(Interacao.TIPOS_INTERACAO)}
+
+
+def calcular_hash_arquivo(caminho_arquivo: str, tamanho_bloco: int = 1 << 20):
+    """Calcula o SHA-256 do arquivo lendo-o sequencialmente em blocos. Complexidade: O(tamanho do arquivo)."""
+    resumo = hashlib.sha256()
+    with open(caminho_arquivo, 'rb') as f:
+        for bloco in iter(lambda: f.read(tamanho_bloco), b''):
+            resumo.update(bloco)
+    return resumo.hexdigest()
+
+
+def impressao_digital(caminho_arquivo: str, com_hash: bool = True):
+    """Retorna tamanho, mtime (ns) e, opcionalmente, o hash do arquivo de origem."""
+    estado = os.stat(caminho_arquivo)
+    digital = {'tamanho': estado.st_size, 'mtime_ns': estado.st_mtime_ns}
+    if com_hash:
+        digital['sha256'] = calcular_hash_arquivo(caminho_arquivo)
+    return digital
+
+
+def salvar_snapshot(sistema, caminho_snapshot: str, caminho_csv: str):
+    """
+    Grava o estado do sistema em `caminho_snapshot`, associado ao CSV `caminho_csv`.
+    A escrita é feita em um arquivo temporário e renomeada ao final, para nunca deixar um snapshot parcial.
+    Complexidade: O(n log n), dominada pela ordenação das interações por ID.
+    """
+    conteudos = sistema._arvore_conteudos.percurso_em_ordem()
+    usuarios = sistema._arvore_usuarios.percurso_em_ordem()
+    chaves_plataformas = list(sistema._plataformas_registradas.keys())
+    indice_plataforma = {id(sistema._plataformas_registradas[chave]): i for i, chave in enumerate(chaves_plataformas)}
+
+    # Toda interação pertence a exatamente uma plataforma; o ID reflete a ordem em que foi vinculada
+    interacoes = [i for chave in chaves_plataformas for i in sistema._plataformas_registradas[chave].interacoes]
+    interacoes.sort(key=lambda i: i.interacao_id)
+
+    colunas = {
+        'conteudo': array('q'), 'usuario': array('q'), 'plataforma': array('l'),
+        'tipo': array('B'), 'timestamp': array('q'), 'duracao': array('q'),
+    }
+    timestamps_especiais = {}  # posição -> datetime com fuso ou frações de segundo
+    comentarios = {}           # posição -> texto
+    for posicao, interacao in enumerate(interacoes):
+        momento = interacao.timestamp_interacao
+        if momento.tzinfo is None and not momento.microsecond:
+            colunas['timestamp'].append(interacao.timestamp_epoch)
+        else:
+            colunas['timestamp'].append(0)
+            timestamps_especiais[posicao] = momento
+        colunas['conteudo'].append(interacao.conteudo_associado.id_conteudo)
+        colunas['usuario'].append(interacao.id_usuario)
+        colunas['plataforma'].append(indice_plataforma[id(interacao.plataforma_interacao)])
+        colunas['tipo'].append(_CODIGO_TIPO[interacao.tipo_interacao])
+        colunas['duracao'].append(interacao.watch_duration_seconds)
+        if interacao.comment_text:
+            comentarios[posicao] = interacao.comment_text
+
+    cabecalho = {'versao': VERSAO_SNAPSHOT, 'origem': impressao_digital(caminho_csv)}
+    dados = {
+        'conteudos': [(type(c).__name__, c.id_conteudo, c.nome_conteudo, c.duracao_total) for c in conteudos],
+        'usuarios': array('q', (u.id_usuario for u in usuarios)),
+        'plataformas': [(chave, sistema._plataformas_registradas[chave].nome_plataforma) for chave in chaves_plataformas],
+        'colunas': colunas,
+        'timestamps_especiais': timestamps_especiais,
+        'comentarios': comentarios,
+        'checkpoint': sistema.checkpoint_incremental(caminho_csv),
+    }
+
+    caminho_temporario = caminho_snapshot + '.tmp'
+    with open(caminho_temporario, 'wb') as f:
+        pickle.dump(cabecalho, f, protocol=pickle.HIGHEST_PROTOCOL)
+        pickle.dump(dados, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(caminho_temporario, caminho_snapshot)
+
+
+def snapshot_valido(caminho_snapshot: str, caminho_csv: str, verificar_hash: bool = True):
+    """
+    Verifica se o snapshot existe, tem a versão atual e corresponde ao CSV de origem.
+    Tamanho e mtime são comparados primeiro; o hash só é calculado se ambos coincidirem.
+    """
+    if not os.path.exists(caminho_snapshot) or not os.path.exists(caminho_csv):
+        return False
+    try:
+        with open(caminho_snapshot, 'rb') as f:
+            cabecalho = pickle.load(f)
+    except (pickle.UnpicklingError, EOFError, OSError):
+        return False
+    if not isinstance(cabecalho, dict) or cabecalho.get('versao') != VERSAO_SNAPSHOT:
+        return False
+    origem = cabecalho.get('origem', {})
+    atual = impressao_digital(caminho_csv, com_hash=False)
+    if origem.get('tamanho') != atual['tamanho'] or origem.get('mtime_ns') != atual['mtime_ns']:
+        return False
+    if verificar_hash and origem.get('sha256') != calcular_hash_arquivo(caminho_csv):
+        return False
+    return True
+
+
+def carregar_snapshot(sistema, caminho_snapshot: str, caminho_csv: str = None):
+    """
+    Recria no sistema (que deve estar vazio) as entidades e interações gravadas no snapshot.
+    Com `caminho_csv`, restaura também o checkpoint da carga incremental desse arquivo.
+    Retorna a quantidade de interações restauradas. Levanta ValueError se o sistema já tiver dados,
+    pois o snapshot seria somado a eles e duplicaria as interações.
+    Complexidade: O(n) para ler o arquivo e revincular as interações, mais O((c + u) log(c + u)) para árvores e rankings.
+    """
+    if any(sistema.versao_dados()):
+        raise ValueError("O snapshot só pode ser carregado em um sistema vazio.")
+    with open(caminho_snapshot, 'rb') as f:
+        pickle.load(f)  # Cabeçalho, já verificado por snapshot_valido
+        dados = pickle.load(f)
+
+    conteudos = {}
+    for nome_classe, id_conteudo, nome_conteudo, duracao in dados['conteudos']:
+        conteudo = _CLASSES_CONTEUDO[nome_classe](id_conteudo, nome_conteudo, duracao)
+        sistema._inserir_conteudo(conteudo)
+        conteudos[id_conteudo] = conteudo
+
+    usuarios = {}
+    for id_usuario in dados['usuarios']:
+        usuario = Usuario(id_usuario)
+        sistema._inserir_usuario(usuario)
+        usuarios[id_usuario] = usuario
+
+    plataformas = []
+    for chave, nome in dados['plataformas']:
+        plataforma = Plataforma(nome)
+        sistema._inserir_plataforma(chave, plataforma)
+        plataformas.append(plataforma)
+
+    colunas = dados['colunas']
+    timestamps_especiais = dados['timestamps_especiais']
+    comentarios = dados['comentarios']
+    tipos = Interacao.TIPOS_INTERACAO
+    for posicao, (id_conteudo, id_usuario, indice_plataforma, codigo_tipo, timestamp, duracao) in enumerate(zip(
+            colunas['conteudo'], colunas['usuario'], colunas['plataforma'],
+            colunas['tipo'], colunas['timestamp'], colunas['duracao'])):
+        conteudo = conteudos[id_conteudo]
+        usuario = usuarios[id_usuario]
+        plataforma = plataformas[indice_plataforma]
+        interacao = Interacao.a_partir_de_campos(
+            conteudo, plataforma, id_usuario, timestamps_especiais.get(posicao, timestamp),
+            tipos[codigo_tipo], duracao, comentarios.get(posicao, "")
+        )
+        sistema._registrar_interacao(interacao, conteudo, usuario, plataforma, atualizar_rankings=False)
+
+    if sistema._rankings is not None: # Os rankings são reconstruídos uma única vez, com os valores finais
+        entidades = {'conteudo': conteudos.values(), 'usuario': usuarios.values(), 'plataforma': plataformas}
+        for (entidade, _), ranking in sistema._rankings.items():
+            for objeto in entidades[entidade]:
+                ranking.atualizar(objeto)
+    if caminho_csv is not None and dados['checkpoint']:
+        sistema._registrar_checkpoint(caminho_csv, dados['checkpoint'])
+    return len(colunas['tipo'])
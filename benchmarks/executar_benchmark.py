@@ -0,0 +1,296 @@
+"""
+Módulo executar_benchmark.py
+Mede o desempenho das etapas do sistema sobre um CSV (real ou gerado por gerador_dados.py)
+e grava o resultado em JSON, para comparar versões e detectar regressões.
+
+Etapas medidas:
+- carga do CSV (leitura, validação e enfileiramento) e processamento da fila (conversão e vinculação);
+- top N de cada métrica de cada relatório (METRICAS_RANKING);
+- tabela completa do motor de relatórios e cálculo de todas as métricas de conteúdo (calcular_*);
+- métodos memoizados das entidades, com e sem o cache de memoização (chamadas repetidas, como em telas reabertas);
+- microbenchmarks da ArvoreBinariaBusca (inserção ordenada e buscas) e da Fila, e o _quicksort;
+- pico de memória do processo (ru_maxrss) e, opcionalmente, pico do tracemalloc;
+- bytes por interação do ArmazenamentoColunar e, com --tracemalloc, do sistema carregado.
+
+Com --armazenamento colunar, o sistema medido usa o backend colunar (a tabela de relatórios vem das colunas).
+
+Uso: python -m benchmarks.executar_benchmark --csv interacoes_1M.csv --saida resultado.json
+Sem --csv, um arquivo temporário com --linhas linhas é gerado antes da medição.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from analise.sistema import SistemaAnaliseEngajamento, METRICAS_RANKING
+from analise.armazenamento_colunar import ArmazenamentoColunar
+from benchmarks.gerador_dados import gerar_csv
+from entidades.memoizacao import CACHE_METRICAS
+from estruturas_dados.arvore_binaria_busca import ArvoreBinariaBusca
+from estruturas_dados.fila import Fila
+
+
+def _cronometrar(funcao, *args, **kwargs):
+    """Executa a função descartando o que ela imprime; retorna (segundos, resultado)."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        inicio = time.perf_counter()
+        resultado = funcao(*args, **kwargs)
+        return time.perf_counter() - inicio, resultado
+
+
+def _etapa(segundos, itens=None):
+    """Monta o registro de uma etapa, com vazão (itens/s) quando a quantidade de itens é conhecida."""
+    registro = {'segundos': round(segundos, 6)}
+    if itens is not None:
+        registro['itens'] = itens
+        registro['itens_por_segundo'] = round(itens / segundos, 1) if segundos > 0 else None
+    return registro
+
+
+def _pico_memoria_mb():
+    """Pico de memória residente do processo em MB, ou None se a plataforma não informar."""
+    if resource is None:
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    divisor = 1024 * 1024 if sys.platform == 'darwin' else 1024  # bytes no macOS, KB no Linux
+    return round(pico / divisor, 1)
+
+
+def _versao_codigo():
+    """Hash do commit atual, se o diretório for um repositório git."""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def medir_carga(caminho_csv: str, rankings_ao_vivo: bool, instrumentar: bool = False, tamanho_lote: int = 1000,
+                armazenamento: str = 'objetos'):
+    """Mede separadamente a leitura/validação/enfileiramento e o processamento da fila."""
+    sistema = SistemaAnaliseEngajamento(rankings_ao_vivo=rankings_ao_vivo, instrumentar=instrumentar,
+                                        armazenamento=armazenamento)
+    estatisticas = {'total_linhas': 0, 'linhas_carregadas': 0, 'linhas_ignoradas': 0}
+
+    def ler_e_enfileirar():
+        for lote in sistema._ler_lotes_validados(caminho_csv, tamanho_lote, estatisticas):
+            sistema._fila_interacoes_brutas.enfileirar_lote(lote)
+
+    segundos_leitura, _ = _cronometrar(ler_e_enfileirar)
+    segundos_fila, processadas = _cronometrar(sistema._processar_fila)
+    etapas = {
+        'carga_csv': _etapa(segundos_leitura, estatisticas['total_linhas']),
+        'processamento_fila': _etapa(segundos_fila, estatisticas['linhas_carregadas']),
+    }
+    contagens = dict(estatisticas, interacoes_processadas=processadas,
+                     conteudos=len(sistema._arvore_conteudos), usuarios=len(sistema._arvore_usuarios),
+                     plataformas=len(sistema._plataformas_registradas),
+                     altura_arvore_conteudos=sistema._arvore_conteudos.altura(),
+                     altura_arvore_usuarios=sistema._arvore_usuarios.altura())
+    return sistema, etapas, contagens
+
+
+def medir_relatorios(sistema, top_n: int = 10):
+    """Mede o top N de cada métrica de cada entidade e o cálculo de todas as métricas de conteúdo."""
+    etapas = {}
+    for entidade, metricas in METRICAS_RANKING.items():
+        for metrica in metricas:
+            segundos, _ = _cronometrar(sistema.top_n_por_metrica, entidade, metrica, top_n)
+            etapas[f'top_n.{entidade}.{metrica}'] = _etapa(segundos)
+
+    segundos, _ = _cronometrar(sistema.tabela_relatorio)
+    etapas['tabela_relatorio'] = _etapa(segundos, len(sistema._indice_temporal))
+    conteudos = sistema.listar_conteudos()
+
+    def calcular_metricas_conteudos():
+        for conteudo in conteudos:
+            conteudo.calcular_metricas()
+            conteudo.listar_comentarios()
+
+    segundos, _ = _cronometrar(calcular_metricas_conteudos)
+    etapas['calcular_metricas_conteudos'] = _etapa(segundos, len(conteudos))
+    return etapas
+
+
+def medir_memoizacao(sistema, repeticoes: int = 5, limite_entidades: int = 1000):
+    """
+    Mede os métodos memoizados (@memoizar_por_versao) chamados repetidamente sobre as mesmas entidades
+    (até `limite_entidades` de cada tipo, dentro da capacidade do cache), com o cache e chamando o método
+    original (`__wrapped__`). O primeiro ciclo com cache preenche as entradas e não é contado.
+    Retorna, por método, os segundos e chamadas de cada variante e a razão entre eles.
+    """
+    limite = min(limite_entidades, max(1, CACHE_METRICAS.capacidade // 4))
+    casos = [
+        ('conteudo.calcular_quantis_tempo_consumo', sistema.listar_conteudos()[:limite],
+         lambda entidade: entidade.calcular_quantis_tempo_consumo(),
+         lambda entidade: type(entidade).calcular_quantis_tempo_consumo.__wrapped__(entidade)),
+        ('usuario.calcular_quantis_tempo_consumo', sistema.listar_usuarios()[:limite],
+         lambda entidade: entidade.calcular_quantis_tempo_consumo(),
+         lambda entidade: type(entidade).calcular_quantis_tempo_consumo.__wrapped__(entidade)),
+        ('usuario.plataformas_mais_frequentes', sistema.listar_usuarios()[:limite],
+         lambda entidade: entidade.plataformas_mais_frequentes(3),
+         lambda entidade: type(entidade).plataformas_mais_frequentes.__wrapped__(entidade, 3)),
+        ('plataforma.calcular_quantis_tempo_consumo', sistema.listar_plataformas(),
+         lambda entidade: entidade.calcular_quantis_tempo_consumo(),
+         lambda entidade: type(entidade).calcular_quantis_tempo_consumo.__wrapped__(entidade)),
+    ]
+    resultado = {}
+    for nome, entidades, memoizado, original in casos:
+        if not entidades:
+            continue
+        for entidade in entidades:
+            memoizado(entidade)
+        chamadas = len(entidades) * repeticoes
+        segundos_cache, _ = _cronometrar(lambda: [memoizado(e) for _ in range(repeticoes) for e in entidades])
+        segundos_sem_cache, _ = _cronometrar(lambda: [original(e) for _ in range(repeticoes) for e in entidades])
+        resultado[nome] = {
+            'com_cache': _etapa(segundos_cache, chamadas),
+            'sem_cache': _etapa(segundos_sem_cache, chamadas),
+            'aceleracao': round(segundos_sem_cache / segundos_cache, 2) if segundos_cache > 0 else None,
+        }
+    return resultado
+
+
+def medir_bytes_colunar(caminho_csv: str):
+    """
+    Bytes retidos (tracemalloc) pelo ArmazenamentoColunar construído a partir do CSV, por interação.
+    Retorna (bytes por interação, interações armazenadas).
+    """
+    ativo = tracemalloc.is_tracing()
+    if not ativo:
+        tracemalloc.start()
+    antes = tracemalloc.get_traced_memory()[0]
+    armazenamento = ArmazenamentoColunar.a_partir_do_csv(caminho_csv)
+    retidos = tracemalloc.get_traced_memory()[0] - antes
+    if not ativo:
+        tracemalloc.stop()
+    quantidade = len(armazenamento)
+    return (round(retidos / quantidade, 1) if quantidade else None), quantidade
+
+
+def medir_estruturas(quantidade: int, semente: int = 42):
+    """Microbenchmarks da árvore (inserção ordenada, o pior caso de uma BST sem balanceamento), da fila e do quicksort."""
+    etapas = {}
+    arvore = ArvoreBinariaBusca()
+    segundos, _ = _cronometrar(lambda: [arvore.inserir(chave, chave) for chave in range(quantidade)])
+    etapas['arvore.insercao_ordenada'] = _etapa(segundos, quantidade)
+    segundos, _ = _cronometrar(lambda: [arvore.buscar(chave) for chave in range(quantidade)])
+    etapas['arvore.busca'] = _etapa(segundos, quantidade)
+    etapas['arvore.altura'] = arvore.altura()
+
+    fila = Fila()
+    segundos, _ = _cronometrar(lambda: [fila.enfileirar(item) for item in range(quantidade)])
+    etapas['fila.enfileirar'] = _etapa(segundos, quantidade)
+    segundos, _ = _cronometrar(lambda: [fila.desenfileirar() for _ in range(quantidade)])
+    etapas['fila.desenfileirar'] = _etapa(segundos, quantidade)
+
+    aleatorio = random.Random(semente)
+    valores = [aleatorio.random() for _ in range(quantidade)]
+    sistema = SistemaAnaliseEngajamento()
+    segundos, _ = _cronometrar(sistema._ordenar_lista, valores, 'quick', key=lambda valor: valor, reverse=True)
+    etapas['quicksort'] = _etapa(segundos, quantidade)
+    return etapas
+
+
+def executar(caminho_csv: str, rankings_ao_vivo: bool = False, top_n: int = 10,
+             tamanho_estruturas: int = 100_000, medir_tracemalloc: bool = False, instrumentar: bool = False,
+             armazenamento: str = 'objetos'):
+    """
+    Executa todas as medições e retorna o resultado como dicionário serializável em JSON.
+    Com instrumentar=True, inclui o resumo por etapa da instrumentação do sistema (que torna a carga mais lenta).
+    Com medir_tracemalloc=True, inclui também os bytes retidos pelo sistema carregado por interação.
+    """
+    bytes_sistema = None
+    if medir_tracemalloc:
+        tracemalloc.start()
+    sistema, etapas, contagens = medir_carga(caminho_csv, rankings_ao_vivo, instrumentar, armazenamento=armazenamento)
+    if medir_tracemalloc and len(sistema._indice_temporal):
+        bytes_sistema = round(tracemalloc.get_traced_memory()[0] / len(sistema._indice_temporal), 1)
+    etapas.update(medir_relatorios(sistema, top_n))
+    memoizacao = medir_memoizacao(sistema)
+    instrumentacao = sistema.resumo_instrumentacao()
+    pico_tracemalloc = None
+    if medir_tracemalloc:
+        pico_tracemalloc = round(tracemalloc.get_traced_memory()[1] / (1024 * 1024), 1)
+        tracemalloc.stop()
+    del sistema
+    bytes_colunar, _ = medir_bytes_colunar(caminho_csv)
+    etapas.update(medir_estruturas(tamanho_estruturas))
+
+    return {
+        'versao_codigo': _versao_codigo(),
+        'data': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+        'csv': os.path.abspath(caminho_csv),
+        'tamanho_csv_bytes': os.path.getsize(caminho_csv),
+        'rankings_ao_vivo': rankings_ao_vivo,
+        'armazenamento': armazenamento,
+        'contagens': contagens,
+        'etapas': etapas,
+        'memoizacao': memoizacao,
+        'memoria': {'pico_processo_mb': _pico_memoria_mb(), 'pico_tracemalloc_mb': pico_tracemalloc,
+                    'bytes_por_interacao_sistema': bytes_sistema, 'bytes_por_interacao_colunar': bytes_colunar},
+        'instrumentacao': instrumentacao,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mede o desempenho do sistema e grava o resultado em JSON.")
+    parser.add_argument('--csv', default=None, help="CSV a medir; sem ele, um CSV sintético é gerado.")
+    parser.add_argument('--linhas', type=int, default=10_000, help="Linhas do CSV sintético gerado sem --csv.")
+    parser.add_argument('--saida', default='benchmark.json')
+    parser.add_argument('--rankings-ao-vivo', action='store_true')
+    parser.add_argument('--top-n', type=int, default=10)
+    parser.add_argument('--tamanho-estruturas', type=int, default=100_000,
+                        help="Elementos usados nos microbenchmarks de árvore, fila e quicksort.")
+    parser.add_argument('--tracemalloc', action='store_true',
+                        help="Mede também o pico do tracemalloc (torna a carga bem mais lenta).")
+    parser.add_argument('--instrumentar', action='store_true',
+                        help="Inclui no resultado o tempo de cada etapa interna da carga e dos relatórios.")
+    parser.add_argument('--armazenamento', choices=('objetos', 'colunar'), default='objetos',
+                        help="Armazenamento do sistema medido (com 'colunar', a tabela de relatórios vem das colunas).")
+    argumentos = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminho_csv = argumentos.csv
+        if caminho_csv is None:
+            caminho_csv = os.path.join(diretorio, 'interacoes_sinteticas.csv')
+            gerar_csv(caminho_csv, argumentos.linhas)
+        resultado = executar(caminho_csv, argumentos.rankings_ao_vivo, argumentos.top_n,
+                             argumentos.tamanho_estruturas, argumentos.tracemalloc, argumentos.instrumentar,
+                             argumentos.armazenamento)
+
+    with open(argumentos.saida, 'w', encoding='utf-8') as f:
+        json.dump(resultado, f, ensure_ascii=False, indent=2)
+    for nome, etapa in resultado['etapas'].items():
+        if isinstance(etapa, dict):
+            print(f"{nome}: {etapa['segundos']:.4f}s")
+    for nome, medida in resultado['memoizacao'].items():
+        print(f"memoizacao.{nome}: {medida['com_cache']['segundos']:.4f}s com cache, "
+              f"{medida['sem_cache']['segundos']:.4f}s sem cache ({medida['aceleracao']}x)")
+    print(f"Pico de memória: {resultado['memoria']['pico_processo_mb']} MB")
+    memoria = resultado['memoria']
+    if memoria['bytes_por_interacao_sistema'] is not None:
+        print(f"Bytes por interação (sistema, {resultado['armazenamento']}): {memoria['bytes_por_interacao_sistema']}")
+    print(f"Bytes por interação (armazenamento colunar): {memoria['bytes_por_interacao_colunar']}")
+    print(f"Resultado gravado em {argumentos.saida}")
+
+
+if __name__ == '__main__':
+    main()
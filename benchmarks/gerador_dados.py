@@ -0,0 +1,123 @@
+"""
+Módulo gerador_dados.py
+Gera arquivos CSV sintéticos no mesmo formato de interacoes_globo.csv, em qualquer escala (10^4 a 10^8 linhas).
+
+As distribuições imitam o arquivo original:
+- popularidade de usuários e conteúdos assimétrica (lei de Zipf), poucos concentram muitas interações;
+- proporção de tipos de interação, plataformas e textos de comentário semelhantes aos do CSV real;
+- duração apenas nas interações 'view_start', com distribuição log-normal;
+- timestamps crescentes com intervalos aleatórios;
+- uma fração configurável de linhas inválidas (campos obrigatórios vazios, tipo ou timestamp inválidos).
+
+As linhas são escritas em fluxo, então a memória não depende da quantidade de linhas.
+Uso: python -m benchmarks.gerador_dados --linhas 1000000 --saida interacoes_1M.csv
+"""
+
+import argparse
+import csv
+import itertools
+import random
+from datetime import datetime, timedelta
+
+COLUNAS = ['id_conteudo', 'nome_conteudo', 'id_usuario', 'timestamp_interacao', 'plataforma',
+           'tipo_interacao', 'watch_duration_seconds', 'comment_text']
+
+NOMES_BASE = ['Jornal Nacional', 'Novela Renascer', 'Podcast Papo de Segunda', 'Domingão com Huck',
+              'Jogo do Brasileirão Série A', 'Mais Você', 'Globo Repórter Especial', 'The Voice Brasil',
+              'Podcast GE Tabelando', 'Desenrola Brasil Podcast', 'Receitas da Ana Maria',
+              'Sessão da Tarde Clássicos', 'Show da Virada', 'Documentário Amazônia Viva', 'Futebol de Sabado']
+PLATAFORMAS = {'Globoplay': 112, 'TV Globo': 80, 'GE Globo': 38, 'G1': 33, 'Premiere': 19, 'Sportv Play': 19,
+               'Spotify': 16, 'Receitas Gshow': 2, 'Canal Brasil': 1, 'Viva': 1, 'Multishow': 1, 'GNT Play': 1,
+               'App Cartola': 1}
+TIPOS = {'view_start': 146, 'comment': 95, 'like': 49, 'share': 33}
+COMENTARIOS = ['Parabéns!', 'Que capítulo emocionante!', 'Muito bom o tema de hoje!', 'Que golaço!!!',
+               'Ótima análise!', 'Não gostei.', 'Informação de qualidade.', 'Juiz ladrão!', 'Top demais!',
+               'Esse podcast é essencial.', 'Acompanho toda semana.', 'Dicas valiosas pro Cartola!']
+CAMPOS_INVALIDAVEIS = ['id_conteudo', 'nome_conteudo', 'id_usuario', 'timestamp_interacao', 'plataforma', 'tipo_interacao']
+
+
+def pesos_zipf(quantidade: int, expoente: float):
+    """Pesos acumulados de uma distribuição de Zipf com `quantidade` posições. Complexidade: O(quantidade)."""
+    return list(itertools.accumulate(1 / (posicao ** expoente) for posicao in range(1, quantidade + 1)))
+
+
+def gerar_linhas(linhas: int, usuarios: int, conteudos: int, fracao_invalidas: float = 0.02,
+                 expoente_zipf: float = 1.1, semente: int = 42, inicio: datetime = datetime(2024, 10, 20)):
+    """
+    Gerador das linhas sintéticas (listas na ordem de COLUNAS).
+    Complexidade: O(linhas · log(usuarios + conteudos)) tempo; O(usuarios + conteudos) memória.
+    """
+    aleatorio = random.Random(semente)
+    acumulado_usuarios = pesos_zipf(usuarios, expoente_zipf)
+    acumulado_conteudos = pesos_zipf(conteudos, expoente_zipf)
+    ids_usuarios = list(range(101, 101 + usuarios))
+    ids_conteudos = list(range(1, conteudos + 1))
+    nomes_conteudos = [f"{NOMES_BASE[i % len(NOMES_BASE)]}" + (f" #{i // len(NOMES_BASE)}" if i >= len(NOMES_BASE) else "")
+                       for i in range(conteudos)]
+    plataformas, pesos_plataformas = list(PLATAFORMAS), list(PLATAFORMAS.values())
+    tipos, pesos_tipos = list(TIPOS), list(TIPOS.values())
+
+    momento = inicio
+    tamanho_lote = 4096  # Sorteios em lote são bem mais rápidos que um random.choices por linha
+    geradas = 0
+    while geradas < linhas:
+        lote = min(tamanho_lote, linhas - geradas)
+        sorteio_usuarios = aleatorio.choices(ids_usuarios, cum_weights=acumulado_usuarios, k=lote)
+        sorteio_conteudos = aleatorio.choices(range(conteudos), cum_weights=acumulado_conteudos, k=lote)
+        sorteio_plataformas = aleatorio.choices(plataformas, weights=pesos_plataformas, k=lote)
+        sorteio_tipos = aleatorio.choices(tipos, weights=pesos_tipos, k=lote)
+        for i in range(lote):
+            momento += timedelta(seconds=int(aleatorio.expovariate(1 / 30)))
+            indice_conteudo = sorteio_conteudos[i]
+            tipo = sorteio_tipos[i]
+            duracao = str(min(4 * 3600, int(aleatorio.lognormvariate(7.5, 0.9)))) if tipo == 'view_start' else ''
+            comentario = aleatorio.choice(COMENTARIOS) if tipo == 'comment' else ''
+            linha = [str(ids_conteudos[indice_conteudo]), nomes_conteudos[indice_conteudo], str(sorteio_usuarios[i]),
+                     momento.strftime('%Y-%m-%d %H:%M:%S'), sorteio_plataformas[i], tipo, duracao, comentario]
+            if aleatorio.random() < fracao_invalidas:
+                _invalidar(linha, aleatorio)
+            yield linha
+        geradas += lote
+
+
+def _invalidar(linha, aleatorio):
+    """Torna a linha inválida: esvazia um campo obrigatório ou usa um tipo/timestamp inexistente."""
+    escolha = aleatorio.random()
+    if escolha < 0.7:
+        linha[COLUNAS.index(aleatorio.choice(CAMPOS_INVALIDAVEIS))] = ''
+    elif escolha < 0.85:
+        linha[COLUNAS.index('tipo_interacao')] = 'dislike'
+    else:
+        linha[COLUNAS.index('timestamp_interacao')] = '2024-13-45 99:99:99'
+
+
+def gerar_csv(caminho_saida: str, linhas: int, usuarios: int = None, conteudos: int = None, **opcoes):
+    """
+    Escreve o CSV sintético em `caminho_saida`. Por padrão há ~1 usuário para cada 20 linhas e
+    ~1 conteúdo para cada 200 linhas. Complexidade: O(linhas).
+    """
+    usuarios = usuarios or max(10, linhas // 20)
+    conteudos = conteudos or max(15, linhas // 200)
+    with open(caminho_saida, 'w', encoding='utf-8', newline='') as f:
+        escritor = csv.writer(f, lineterminator='\n')
+        escritor.writerow(COLUNAS)
+        escritor.writerows(gerar_linhas(linhas, usuarios, conteudos, **opcoes))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera um CSV sintético de interações.")
+    parser.add_argument('--linhas', type=int, default=10_000)
+    parser.add_argument('--saida', default='interacoes_sinteticas.csv')
+    parser.add_argument('--usuarios', type=int, default=None)
+    parser.add_argument('--conteudos', type=int, default=None)
+    parser.add_argument('--invalidas', type=float, default=0.02, help="Fração de linhas inválidas (0 a 1).")
+    parser.add_argument('--zipf', type=float, default=1.1, help="Expoente de Zipf da popularidade.")
+    parser.add_argument('--semente', type=int, default=42)
+    argumentos = parser.parse_args()
+    gerar_csv(argumentos.saida, argumentos.linhas, argumentos.usuarios, argumentos.conteudos,
+              fracao_invalidas=argumentos.invalidas, expoente_zipf=argumentos.zipf, semente=argumentos.semente)
+    print(f"Arquivo gerado: {argumentos.saida} ({argumentos.linhas} linhas)")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,9 @@
 from abc import ABC, abstractmethod # Importação do módulo abc para criar classes abstratas
 
+from entidades.interacao import Interacao, e_sessao_consumo
+from entidades.memoizacao import memoizar_por_versao
+from estruturas_dados.sketch_quantis import SketchQuantis, QUANTIS_PADRAO, quantis_vazios
+
 class Conteudo(ABC): # O ABC indica que a classe é abstrata e não pode ser instanciada diretamente
     """
     Classe base abstrata para conteúdos (vídeo, podcast, artigo).
@@ -25,6 +29,16 @@ class Conteudo(ABC): # O ABC indica que a classe é abstrata e não pode ser ins
 
         self._interacoes = []  # Inicializa a lista de interações como vazia e protegida (acessível por subclasses)
 
+        # Agregados mantidos incrementalmente em adicionar_interacao, para que as métricas sejam O(1)
+        self._total_engajamento = 0
+        self._contagem_por_tipo = {}  # None no modo aproximado (ver usar_contagens_aproximadas)
+        self._contagens_aproximadas = None
+        self._tempo_total_consumo = 0
+        self._quantidade_consumo = 0  # Interações com watch_duration_seconds preenchido
+        self._comentarios = []
+        self._quantis_consumo = None  # SketchQuantis dos tempos das sessões de consumo (p50/p90/p99), criado só na 1ª sessão
+        self._versao = 0  # Incrementada a cada interação; invalida as métricas memoizadas
+
     @property
     def id_conteudo(self):
         """property que retorna o id do conteúdo"""
@@ -45,48 +59,98 @@ class Conteudo(ABC): # O ABC indica que a classe é abstrata e não pode ser ins
         """Retorna a lista de interações"""
         return list(self._interacoes)
 
+    def usar_lista_interacoes(self, lista):
+        """
+        Armazenamento colunar: passa a guardar as interações em `lista` (uma ListaInteracoes, que mantém apenas
+        as posições nas colunas e recria cada interação ao ser lida) em vez de uma lista de objetos.
+        Deve ser chamado antes da primeira interação.
+        """
+        if self._interacoes:
+            raise ValueError("A lista de interações deve ser configurada antes da primeira interação.")
+        self._interacoes = lista
+
+    def usar_contagens_aproximadas(self, contagens):
+        """
+        Modo aproximado: passa a ler as contagens por tipo de interação de um CountMinSketch compartilhado
+        (chaves (id_conteudo, tipo)), alimentado por quem registra as interações, em vez de manter um
+        dicionário próprio. Deve ser chamado antes da primeira interação.
+        """
+        if self._interacoes:
+            raise ValueError("As contagens aproximadas devem ser configuradas antes da primeira interação.")
+        self._contagens_aproximadas = contagens
+        self._contagem_por_tipo = None
+
     def adicionar_interacao(self, interacao):
-        """Adiciona uma nova interação à lista de interações"""
+        """
+        Adiciona uma nova interação à lista de interações e atualiza os agregados.
+        Complexidade: O(1).
+        """
         self._interacoes.append(interacao)
+        self._versao += 1
+
+        tipo = getattr(interacao, 'tipo_interacao', None)
+        if tipo:
+            if self._contagem_por_tipo is not None:
+                self._contagem_por_tipo[tipo] = self._contagem_por_tipo.get(tipo, 0) + 1
+            if tipo in ('like', 'share', 'comment'):
+                self._total_engajamento += 1
+            if tipo == 'comment' and getattr(interacao, 'comment_text', None):
+                self._comentarios.append(interacao.comment_text)
+
+        duracao = getattr(interacao, 'watch_duration_seconds', None)
+        if duracao is not None:
+            self._tempo_total_consumo += duracao
+            self._quantidade_consumo += 1
+            if e_sessao_consumo(tipo, duracao):
+                if self._quantis_consumo is None:
+                    self._quantis_consumo = SketchQuantis()
+                self._quantis_consumo.adicionar(duracao)
 
     def calcular_total_interacoes_engajamento(self):
-        """Calcula o total de interações de engajamento ('like', 'share', 'comment')."""
-        # soma 1 para cada interação que seja de um dos tipos de 'engajamento'
-        return sum(
-            1 for i in self._interacoes
-            if hasattr(i, 'tipo_interacao') and i.tipo_interacao in ('like', 'share', 'comment')
-        )
+        """Retorna o total de interações de engajamento ('like', 'share', 'comment'). Complexidade: O(1)."""
+        return self._total_engajamento
 
     def calcular_contagem_por_tipo_interacao(self):
-        """Retorna um dicionário com a contagem de cada tipo de interação."""
-        contagem = {}
-        # Conta as interações por tipo
-        for i in self._interacoes:
-            tipo = getattr(i, 'tipo_interacao', None) #busca o tipo da interação em cada objeto de 'interações', definir como None caso não exista evita AttributeError
-            if tipo:
-                contagem[tipo] = contagem.get(tipo, 0) + 1
-        return contagem
+        """
+        Retorna um dicionário com a contagem de cada tipo de interação (estimada, no modo aproximado).
+        Complexidade: O(t), t = tipos distintos; O(t d) no modo aproximado.
+        """
+        if self._contagem_por_tipo is None:
+            contagens = {tipo: self.contar_interacoes_por_tipo(tipo) for tipo in Interacao.TIPOS_INTERACAO}
+            return {tipo: quantidade for tipo, quantidade in contagens.items() if quantidade}
+        return dict(self._contagem_por_tipo)
+
+    def contar_interacoes_por_tipo(self, tipo):
+        """
+        Retorna a quantidade de interações de um tipo específico; no modo aproximado, a estimativa do
+        Count-Min Sketch (limite superior da real). Complexidade: O(1); O(d) no modo aproximado.
+        """
+        if self._contagem_por_tipo is None:
+            return self._contagens_aproximadas.estimar((self.__id_conteudo, tipo))
+        return self._contagem_por_tipo.get(tipo, 0)
 
     def calcular_tempo_total_consumo(self):
-        """Soma o watch_duration_seconds das interações."""
-        return sum(i.watch_duration_seconds for i in self._interacoes if hasattr(i, 'watch_duration_seconds'))
+        """Retorna a soma do watch_duration_seconds das interações. Complexidade: O(1)."""
+        return self._tempo_total_consumo
 
     def calcular_media_tempo_consumo(self):
-        """Calcula a média de tempo de consumo por interação com que tenha havido consumo."""
-        tempos = [
-            i.watch_duration_seconds
-            for i in self._interacoes
-            if hasattr(i, 'watch_duration_seconds') and i.watch_duration_seconds is not None
-        ]
-        return sum(tempos) / len(tempos) if tempos else 0
+        """Calcula a média de tempo de consumo por interação com que tenha havido consumo. Complexidade: O(1)."""
+        return self._tempo_total_consumo / self._quantidade_consumo if self._quantidade_consumo else 0
+
+    @memoizar_por_versao
+    def calcular_quantis_tempo_consumo(self, quantis=QUANTIS_PADRAO):
+        """
+        Retorna os quantis do tempo por sessão de consumo ({'p50', 'p90', 'p99'} por padrão), estimados pelo
+        sketch mantido na ingestão (erro relativo de 1%). Só entram as interações 'view_start' ou com duração
+        positiva (ver e_sessao_consumo); valores None se não houver consumo. Complexidade: O(b), b = baldes do sketch.
+        """
+        if self._quantis_consumo is None:
+            return quantis_vazios(quantis)
+        return self._quantis_consumo.quantis(quantis)
 
     def listar_comentarios(self):
-        """Retorna uma lista de comentários presentes nas interações."""
-        return [
-            i.comment_text
-            for i in self._interacoes
-            if hasattr(i, 'tipo_interacao') and i.tipo_interacao == 'comment' and i.comment_text
-        ]
+        """Retorna uma lista de comentários presentes nas interações. Complexidade: O(c), c = comentários."""
+        return list(self._comentarios)
 
     @abstractmethod
     def calcular_metricas(self):
@@ -1,56 +1,158 @@
-from datetime import datetime
+from datetime import datetime, timedelta
+from functools import lru_cache
+from itertools import count
+
+_EPOCA = datetime(1970, 1, 1)
+
+
+def para_epoch(momento: datetime) -> int:
+    """
+    Converte um datetime em segundos inteiros desde a época.
+    Datas sem fuso são tratadas como UTC, para não depender do fuso da máquina. Complexidade: O(1).
+    """
+    if isinstance(momento, int):
+        return momento
+    if momento.tzinfo is not None:
+        return int(momento.timestamp())
+    return int((momento - _EPOCA).total_seconds())
+
+
+@lru_cache(maxsize=4096)
+def _epoch_da_data(data_iso: str) -> int:
+    """Epoch da meia-noite de uma data 'AAAA-MM-DD' (valida a data com fromisoformat). Complexidade: O(1)."""
+    return para_epoch(datetime.fromisoformat(data_iso))
+
+
+@lru_cache(maxsize=65536)
+def decodificar_timestamp(valor: str):
+    """
+    Etapa de decodificação de timestamps usada na carga.
+    Retorna a forma armazenada pela Interacao: segundos inteiros desde a época para datas sem fuso
+    e sem frações de segundo, ou o próprio datetime nos demais casos.
+    O layout fixo 'AAAA-MM-DD HH:MM:SS' (ou com 'T') é decodificado por fatias, reaproveitando o epoch
+    da data em cache; qualquer outro formato usa datetime.fromisoformat. Como os timestamps se repetem
+    muito, o resultado também fica em um cache LRU. Valores e erros são os mesmos de datetime.fromisoformat.
+    Complexidade: O(1).
+    """
+    if (len(valor) == 19 and valor[4] == '-' and valor[7] == '-' and valor[10] in ' T'
+            and valor[13] == ':' and valor[16] == ':'):
+        hora, minuto, segundo = valor[11:13], valor[14:16], valor[17:19]
+        if (hora + minuto + segundo).isascii() and (hora + minuto + segundo).isdigit():
+            hora, minuto, segundo = int(hora), int(minuto), int(segundo)
+            if hora < 24 and minuto < 60 and segundo < 60:
+                return _epoch_da_data(valor[:10]) + hora * 3600 + minuto * 60 + segundo
+    momento = datetime.fromisoformat(valor)
+    if momento.tzinfo is None and not momento.microsecond:
+        return para_epoch(momento)
+    return momento
+
+
+def e_sessao_consumo(tipo_interacao: str, watch_duration_seconds) -> bool:
+    """
+    Indica se a interação descreve uma sessão de consumo ('view_start' ou duração positiva).
+    Curtidas, compartilhamentos e comentários chegam com duração 0 e não entram nos quantis do tempo de consumo.
+    Complexidade: O(1).
+    """
+    return tipo_interacao == 'view_start' or (watch_duration_seconds or 0) > 0
+
 
 class Interacao:
     """
     Classe das Interações dos usuários com os conteúdo.
+    Usa __slots__ para não manter um __dict__ por instância: o timestamp é guardado como inteiro
+    (segundos desde a época) e o tipo de interação como um código pequeno, ambos convertidos sob demanda.
     """
     TIPOS_INTERACAO_VALIDOS = {'view_start', 'like', 'share', 'comment'} # conjunto com os tipos válidos de interação (atributos de classe)
-    
-    # Atributo de classe para controle de IDs únicos
-    __ids_usados = set()  # Armazena IDs de interações já criados para evitar duplicações
-    __proximo_id = 1      # ID a ser atribuído a próxima interação que for criada
+    TIPOS_INTERACAO = ('view_start', 'like', 'share', 'comment') # A posição na tupla é o código do tipo armazenado
+    __CODIGO_TIPO = {tipo: codigo for codigo, tipo in enumerate(TIPOS_INTERACAO)}
+
+    # Contador monotônico de IDs únicos (não guarda os IDs já emitidos)
+    __contador_ids = count(1)
+
+    __slots__ = ('__interacao_id', '__conteudo_associado', '__id_usuario', '__timestamp',
+                 '__plataforma_interacao', '__codigo_tipo', '__watch_duration_seconds', '__comment_text')
 
     def __init__(self, dados_brutos: dict, conteudo_associado, plataforma_interacao):
         """Construtor recebe:
         Inicializa uma interação a partir dos dados brutos do CSV, do conteúdo e da plataforma.
         """
+        campos = Interacao.converter_dados_brutos(dados_brutos)
+        self.__inicializar(conteudo_associado, plataforma_interacao, *campos)
 
-        while Interacao.__proximo_id in Interacao.__ids_usados:  # Verifica IDs usados
-            Interacao.__proximo_id += 1  # Incrementa para encontrar um ID 'livre'
-        self.__interacao_id = Interacao.__proximo_id  # Atribui o novo ID à instância
-        Interacao.__ids_usados.add(self.__interacao_id)  # Adiciona o ID ao conjunto de IDs usados
-
-        self.__conteudo_associado = conteudo_associado # inicializa o atributo do conteúdo associado
-
+    @classmethod
+    def a_partir_de_campos(cls, conteudo_associado, plataforma_interacao, id_usuario: int,
+                           timestamp_interacao, tipo_interacao: str, watch_duration_seconds: int, comment_text: str,
+                           *, interacao_id: int = None):
+        """
+        Cria uma interação a partir de campos já convertidos por `converter_dados_brutos`
+        (por exemplo, em um processo de carga paralela), sem repetir a conversão.
+        Com `interacao_id`, usa esse ID em vez do próximo do contador (ex.: ao recriar uma interação
+        guardada no armazenamento colunar, cujo ID é a posição nas colunas + 1).
+        """
+        interacao = cls.__new__(cls)
+        interacao.__inicializar(conteudo_associado, plataforma_interacao, id_usuario,
+                                timestamp_interacao, tipo_interacao, watch_duration_seconds, comment_text,
+                                interacao_id)
+        return interacao
+
+    @staticmethod
+    def converter_dados_brutos(dados_brutos: dict):
+        """
+        Valida e converte os dados brutos de uma linha do CSV.
+        Retorna a tupla (id_usuario, timestamp_interacao, tipo_interacao, watch_duration_seconds, comment_text)
+        ou levanta ValueError se algum campo obrigatório for inválido.
+        O timestamp vem na forma de decodificar_timestamp (epoch inteiro ou datetime).
+        """
         try:
-            self.__id_usuario = int(dados_brutos['id_usuario'])  # Converte o ID do usuário para int
+            id_usuario = int(dados_brutos['id_usuario'])  # Converte o ID do usuário para int
         except (KeyError, ValueError, TypeError):  # Captura exceções relevantes
             raise ValueError("id_usuario inválido ou ausente na interação.") 
 
         try:
             valor_timestamp = dados_brutos['timestamp_interacao']  # Obtém o timestamp
-            self.__timestamp_interacao = datetime.fromisoformat(valor_timestamp) # Converte para datetime
+            timestamp_interacao = decodificar_timestamp(valor_timestamp) # Converte para epoch (ou datetime)
         except Exception:  # Captura qualquer erro na conversão
             raise ValueError("timestamp_interacao inválido ou ausente na interação.")  # Erro se inválido
 
-        self.__plataforma_interacao = plataforma_interacao # inicializa o atributo plataforma da interação
-        
         tipo = dados_brutos.get('tipo_interacao', '').strip()  # Obtém o tipo de interação e limpa espaços
         if not tipo: # valida se o tipo foi preenchido
             raise ValueError(f"Tipo de interação não preenchido")  
         if tipo not in Interacao.TIPOS_INTERACAO_VALIDOS: # valida contra os tipos permitidos
             raise ValueError(f"Tipo de interação inválido: {tipo}")  # Erro se tipo inválido
-        self.__tipo_interacao = tipo
 
         valor_duracao = dados_brutos.get('watch_duration_seconds', 0)  # Obtém o tempo assistido ou define como 0
         try:
             duracao = int(valor_duracao)  # Converte para inteiro
-            self.__watch_duration_seconds = max(0, duracao)  # Garante que seja não negativo
+            watch_duration_seconds = max(0, duracao)  # Garante que seja não negativo
         except (ValueError, TypeError):  # exceções de conversão
-            self.__watch_duration_seconds = 0  # Define como 0 se houver erro
+            watch_duration_seconds = 0  # Define como 0 se houver erro
 
         comentario = dados_brutos.get('comment_text', '')  # Obtém o texto do comentário, define padrão vazio caso não exista
-        self.__comment_text = comentario.strip() if comentario else ""  # Limpa espaços ou define como vazio
+        comment_text = comentario.strip() if comentario else ""  # Limpa espaços ou define como vazio
+
+        return id_usuario, timestamp_interacao, tipo, watch_duration_seconds, comment_text
+
+    def __inicializar(self, conteudo_associado, plataforma_interacao, id_usuario,
+                      timestamp_interacao, tipo_interacao, watch_duration_seconds, comment_text, interacao_id=None):
+        """Atribui o ID único (o informado ou o próximo do contador) e os atributos já convertidos da interação."""
+        if interacao_id is None:
+            interacao_id = next(Interacao.__contador_ids)  # Próximo ID do contador, O(1)
+        self.__interacao_id = interacao_id
+
+        self.__conteudo_associado = conteudo_associado # inicializa o atributo do conteúdo associado
+        self.__id_usuario = id_usuario
+        # Datas sem fuso e sem frações de segundo (o caso do CSV) viram um inteiro; as demais são mantidas como datetime.
+        # Também aceita diretamente os segundos inteiros desde a época (ex.: ao restaurar um snapshot).
+        if isinstance(timestamp_interacao, int):
+            self.__timestamp = timestamp_interacao
+        elif timestamp_interacao.tzinfo is None and not timestamp_interacao.microsecond:
+            self.__timestamp = para_epoch(timestamp_interacao)
+        else:
+            self.__timestamp = timestamp_interacao
+        self.__plataforma_interacao = plataforma_interacao # inicializa o atributo plataforma da interação
+        self.__codigo_tipo = Interacao.__CODIGO_TIPO[tipo_interacao]
+        self.__watch_duration_seconds = watch_duration_seconds
+        self.__comment_text = comment_text or ""
 
     # Propriedades (getters) para acesso seguro aos atributos
     @property
@@ -70,8 +172,17 @@ class Interacao:
 
     @property
     def timestamp_interacao(self):
-        """retorna Data/hora da interação"""
-        return self.__timestamp_interacao
+        """retorna Data/hora da interação (convertida a partir do inteiro armazenado)"""
+        if isinstance(self.__timestamp, int):
+            return _EPOCA + timedelta(seconds=self.__timestamp)
+        return self.__timestamp
+
+    @property
+    def timestamp_epoch(self):
+        """retorna Data/hora da interação em segundos inteiros desde a época"""
+        if isinstance(self.__timestamp, int):
+            return self.__timestamp
+        return para_epoch(self.__timestamp)
 
     @property
     def plataforma_interacao(self):
@@ -81,7 +192,7 @@ class Interacao:
     @property
     def tipo_interacao(self):
         """retorna o tipo da interação"""
-        return self.__tipo_interacao
+        return Interacao.TIPOS_INTERACAO[self.__codigo_tipo]
 
     @property
     def watch_duration_seconds(self):
@@ -95,11 +206,11 @@ class Interacao:
 
     def __str__(self):
         #Representação amigável da interação
-        return (f"Interacao(id={self.__interacao_id}, tipo={self.__tipo_interacao}, "
+        return (f"Interacao(id={self.__interacao_id}, tipo={self.tipo_interacao}, "
                 f"usuario={self.__id_usuario}, conteudo={self.__conteudo_associado.nome_conteudo})")
 
     def __repr__(self):
         # Representação detalhada da interação
-        return (f"Interacao(id={self.__interacao_id}, tipo='{self.__tipo_interacao}', "
+        return (f"Interacao(id={self.__interacao_id}, tipo='{self.tipo_interacao}', "
                 f"usuario={self.__id_usuario}, conteudo={self.__conteudo_associado}, "
                 f"plataforma={self.__plataforma_interacao})")
\ No newline at end of file
@@ -0,0 +1,65 @@
+"""
+Memoização das métricas das entidades, associada à versão de modificação de cada entidade.
+
+Conteudo, Usuario e Plataforma guardam em `_versao` um contador incrementado a cada adicionar_interacao.
+Os métodos decorados com @memoizar_por_versao guardam o resultado em um CacheLRU compartilhado,
+junto com a versão da entidade no momento do cálculo: chamadas repetidas devolvem o valor guardado
+até que uma nova interação seja adicionada, quando o valor é recalculado na próxima chamada.
+
+Somente métodos cujo cálculo custa mais que a consulta ao cache e a cópia do resultado são memoizados:
+os quantis dos sketches (percorrem os baldes) e a ordenação de plataformas_mais_frequentes. Métodos que
+apenas leem ou copiam agregados incrementais (calcular_metricas, contagens por tipo, comentários,
+conteúdos únicos) não são: montar a chave, consultar o LRU e copiar o resultado custaria mais que o
+próprio cálculo (ver medir_memoizacao em benchmarks/executar_benchmark.py). Varreduras O(n) das interações,
+como filtrar_interacoes_por_tipo, também não são memoizadas, para não guardar cópias das listas.
+O resultado devolvido é sempre uma cópia rasa das listas, conjuntos e dicionários guardados,
+preservando o encapsulamento das entidades.
+
+O cache guarda apenas referências fracas às entidades: ele não impede que as entidades de um sistema
+descartado sejam liberadas, e suas entradas acabam descartadas pelo LRU.
+"""
+
+import weakref
+from functools import wraps
+
+from estruturas_dados.cache_lru import CacheLRU
+
+CACHE_METRICAS = CacheLRU(capacidade=4096)
+
+
+def configurar_cache_metricas(capacidade: int):
+    """Altera a quantidade máxima de resultados memoizados (descartando os menos usados, se preciso)."""
+    CACHE_METRICAS.redimensionar(capacidade)
+
+
+def _copiar(valor):
+    """Cópia das coleções do resultado (em um nível de aninhamento, como em calcular_metricas)."""
+    if isinstance(valor, dict):
+        return {chave: _copiar(item) for chave, item in valor.items()}
+    if isinstance(valor, list):
+        return list(valor)
+    if isinstance(valor, set):
+        return set(valor)
+    return valor
+
+
+def memoizar_por_versao(metodo):
+    """
+    Decorador de métodos de entidades com atributo `_versao`.
+    A chave do cache é (id da entidade, método, argumentos, versão): entradas de versões antigas nunca
+    mais são consultadas e acabam descartadas pelo LRU. Junto com o valor é guardada uma referência fraca
+    à entidade, conferida a cada acerto: se a entidade foi liberada e seu id reutilizado por outro objeto,
+    a entrada é tratada como ausente.
+    Complexidade: O(1) mais a cópia do resultado quando memoizado; o custo do método quando não.
+    """
+    nome = metodo.__qualname__
+
+    @wraps(metodo)
+    def metodo_memoizado(self, *args, **kwargs):
+        chave = (id(self), nome, args, tuple(sorted(kwargs.items())) if kwargs else (), self._versao)
+        entrada = CACHE_METRICAS.obter(chave)
+        if entrada is None or entrada[0]() is not self:
+            entrada = (weakref.ref(self), metodo(self, *args, **kwargs))
+            CACHE_METRICAS.guardar(chave, entrada)
+        return _copiar(entrada[1])
+    return metodo_memoizado
@@ -1,3 +1,7 @@
+from entidades.interacao import e_sessao_consumo
+from entidades.memoizacao import memoizar_por_versao
+from estruturas_dados.sketch_quantis import SketchQuantis, QUANTIS_PADRAO, quantis_vazios
+
 class Plataforma:
     """
     Classe que recebe uma plataforma onde o conteúdo é consumido ou a interação ocorre
@@ -11,6 +15,12 @@ class Plataforma:
             raise ValueError("O nome da plataforma não pode estar vazio.")
         
         self.__interacoes = []  # Lista privada de interações na plataforma
+        # Agregados mantidos incrementalmente em adicionar_interacao
+        self.__tempo_total_consumo = 0
+        self.__quantidade_consumo = 0
+        self.__total_engajamento = 0
+        self.__quantis_consumo = None  # SketchQuantis dos tempos das sessões de consumo (p50/p90/p99), criado só na 1ª sessão
+        self._versao = 0  # Incrementada a cada interação, como em Conteudo e Usuario
         # Usando os setters para definir os atributos
         self.nome_plataforma = nome_plataforma
 
@@ -31,36 +41,61 @@ class Plataforma:
         """Retorna uma cópia da lista de interações para garantir encapsulamento."""
         return list(self.__interacoes)
 
+    def usar_lista_interacoes(self, lista):
+        """
+        Armazenamento colunar: passa a guardar as interações em `lista` (uma ListaInteracoes, que mantém apenas
+        as posições nas colunas e recria cada interação ao ser lida) em vez de uma lista de objetos.
+        Deve ser chamado antes da primeira interação.
+        """
+        if self.__interacoes:
+            raise ValueError("A lista de interações deve ser configurada antes da primeira interação.")
+        self.__interacoes = lista
+
     def adicionar_interacao(self, interacao):
-        """Adiciona uma interação à lista da plataforma."""
+        """Adiciona uma interação à lista da plataforma e atualiza os agregados. Complexidade: O(1)."""
         self.__interacoes.append(interacao)
+        self._versao += 1
+        tipo = getattr(interacao, 'tipo_interacao', None)
+        duracao = getattr(interacao, 'watch_duration_seconds', None)
+        if duracao is not None:
+            self.__tempo_total_consumo += duracao
+            self.__quantidade_consumo += 1
+            if e_sessao_consumo(tipo, duracao):
+                if self.__quantis_consumo is None:
+                    self.__quantis_consumo = SketchQuantis()
+                self.__quantis_consumo.adicionar(duracao)
+        if tipo in ('like', 'share', 'comment'):
+            self.__total_engajamento += 1
     
     def calcular_tempo_total_consumo(self):
         """
-        Retorna o tempo total assistido na plataforma (em segundos).
+        Retorna o tempo total assistido na plataforma (em segundos). Complexidade: O(1).
         """
-        return sum(interacao.watch_duration_seconds for interacao in self.__interacoes if hasattr(interacao, 'watch_duration_seconds')) 
+        return self.__tempo_total_consumo
 
     def calcular_total_interacoes_engajamento(self):
         """
-        Retorna o total de interações de engajamento ('like', 'share', 'comment') na plataforma.
+        Retorna o total de interações de engajamento ('like', 'share', 'comment') na plataforma. Complexidade: O(1).
         """
-        return sum(
-            1 for interacao in self.__interacoes
-            if hasattr(interacao, 'tipo_interacao') and interacao.tipo_interacao in ('like', 'share', 'comment')
-        )
+        return self.__total_engajamento
     
     def calcular_media_tempo_consumo(self):
         """
         Calcula a média de tempo de consumo por interação com que tenha havido consumo.
-        Retorna 0 se não houver interações com tempo de consumo.
+        Retorna 0 se não houver interações com tempo de consumo. Complexidade: O(1).
+        """
+        return self.__tempo_total_consumo / self.__quantidade_consumo if self.__quantidade_consumo else 0
+
+    @memoizar_por_versao
+    def calcular_quantis_tempo_consumo(self, quantis=QUANTIS_PADRAO):
+        """
+        Retorna os quantis do tempo por sessão de consumo ({'p50', 'p90', 'p99'} por padrão), estimados pelo
+        sketch mantido na ingestão (erro relativo de 1%). Só entram as interações 'view_start' ou com duração
+        positiva (ver e_sessao_consumo); valores None se não houver consumo. Complexidade: O(b), b = baldes do sketch.
         """
-        tempos = [
-            interacao.watch_duration_seconds
-            for interacao in self.__interacoes
-            if hasattr(interacao, 'watch_duration_seconds') and interacao.watch_duration_seconds is not None
-        ]
-        return sum(tempos) / len(tempos) if tempos else 0
+        if self.__quantis_consumo is None:
+            return quantis_vazios(quantis)
+        return self.__quantis_consumo.quantis(quantis)
     
     def __str__(self):
         # Retorna o nome da plataforma como string
@@ -1,3 +1,9 @@
+from collections import Counter # Importa a classe Counter, que serve para contar elementos em uma coleção
+
+from entidades.interacao import e_sessao_consumo
+from entidades.memoizacao import memoizar_por_versao
+from estruturas_dados.sketch_quantis import SketchQuantis, QUANTIS_PADRAO, quantis_vazios
+
 class Usuario:
     """
     Representa um usuário da plataforma, armazenando suas interações.
@@ -12,6 +18,17 @@ class Usuario:
         self.__id_usuario = id_usuario
         self.__interacoes = []  # Lista privada de interações do usuário
 
+        # Estatísticas mantidas incrementalmente em adicionar_interacao
+        self.__tempo_total = 0
+        self.__tempo_por_plataforma = {}            # Plataforma -> tempo de consumo (s)
+        self.__contagem_por_tipo = {}               # tipo_interacao -> quantidade (None no modo aproximado)
+        self.__conteudos_unicos = set()             # Conteúdos distintos com que interagiu (None no modo aproximado)
+        self.__conteudos_distintos = None           # HyperLogLog compartilhado, no modo aproximado
+        self.__contagens_aproximadas = None         # CountMinSketch compartilhado, no modo aproximado
+        self.__frequencia_plataformas = Counter()   # Plataforma -> quantidade de interações
+        self.__quantis_consumo = None    # SketchQuantis dos tempos das sessões de consumo (p50/p90/p99), criado só na 1ª sessão
+        self._versao = 0  # Incrementada a cada interação; invalida as métricas memoizadas
+
     @property
     def id_usuario(self):
         """Retorna o ID do usuário."""
@@ -22,42 +39,120 @@ class Usuario:
         """Retorna uma cópia da lista de interações para garantir encapsulamento."""
         return list(self.__interacoes)
 
+    def usar_lista_interacoes(self, lista):
+        """
+        Armazenamento colunar: passa a guardar as interações em `lista` (uma ListaInteracoes, que mantém apenas
+        as posições nas colunas e recria cada interação ao ser lida) em vez de uma lista de objetos.
+        Deve ser chamado antes da primeira interação.
+        """
+        if self.__interacoes:
+            raise ValueError("A lista de interações deve ser configurada antes da primeira interação.")
+        self.__interacoes = lista
+
+    def usar_distintos_aproximados(self, conteudos_distintos, contagens):
+        """
+        Modo aproximado: deixa de manter o conjunto de conteúdos distintos e as contagens por tipo.
+        A quantidade de conteúdos distintos passa a ser a estimativa de um HyperLogLog compartilhado, e as
+        contagens por tipo as estimativas de um CountMinSketch compartilhado (chaves (id_usuario, tipo)),
+        ambos alimentados por quem registra as interações. Deve ser chamado antes da primeira interação.
+        """
+        if self.__interacoes:
+            raise ValueError("Os distintos aproximados devem ser configurados antes da primeira interação.")
+        self.__conteudos_distintos = conteudos_distintos
+        self.__contagens_aproximadas = contagens
+        self.__conteudos_unicos = None
+        self.__contagem_por_tipo = None
+
     def adicionar_interacao(self, interacao):
-        """Adiciona uma interação à lista do usuário."""
+        """
+        Adiciona uma interação à lista do usuário e atualiza as estatísticas.
+        Complexidade: O(1).
+        """
         self.__interacoes.append(interacao)
+        self._versao += 1
+
+        tipo = getattr(interacao, 'tipo_interacao', None)
+        if tipo is not None and self.__contagem_por_tipo is not None:
+            self.__contagem_por_tipo[tipo] = self.__contagem_por_tipo.get(tipo, 0) + 1
+        if hasattr(interacao, 'conteudo_associado') and self.__conteudos_unicos is not None:
+            self.__conteudos_unicos.add(interacao.conteudo_associado)
+        if hasattr(interacao, 'plataforma_interacao'):
+            plataforma = interacao.plataforma_interacao
+            self.__frequencia_plataformas[plataforma] += 1
+            duracao = getattr(interacao, 'watch_duration_seconds', 0)
+            self.__tempo_por_plataforma[plataforma] = self.__tempo_por_plataforma.get(plataforma, 0) + duracao
+            self.__tempo_total += duracao
+            if e_sessao_consumo(tipo, duracao):
+                if self.__quantis_consumo is None:
+                    self.__quantis_consumo = SketchQuantis()
+                self.__quantis_consumo.adicionar(duracao)
+
+    def quantidade_interacoes(self):
+        """Retorna a quantidade de interações do usuário. Complexidade: O(1)."""
+        return len(self.__interacoes)
 
     def filtrar_interacoes_por_tipo(self, tipo):
-        """Retorna uma lista de interações do usuário de um tipo específico."""
+        """Retorna uma lista de interações do usuário de um tipo específico. Complexidade: O(n)."""
         return [i for i in self.__interacoes if hasattr(i, 'tipo_interacao') and i.tipo_interacao == tipo]
 
+    def contar_interacoes_por_tipo(self, tipo):
+        """
+        Retorna a quantidade de interações do usuário de um tipo específico; no modo aproximado, a estimativa
+        do Count-Min Sketch (limite superior da real). Complexidade: O(1); O(d) no modo aproximado.
+        """
+        if self.__contagem_por_tipo is None:
+            return self.__contagens_aproximadas.estimar((self.__id_usuario, tipo))
+        return self.__contagem_por_tipo.get(tipo, 0)
+
     def obter_conteudos_unicos(self):
-        """Retorna um conjunto de conteúdos únicos com os quais o usuário interagiu."""
-        return set(i.conteudo_associado for i in self.__interacoes if hasattr(i, 'conteudo_associado'))
+        """
+        Retorna um conjunto de conteúdos únicos com os quais o usuário interagiu.
+        Complexidade: O(c). No modo aproximado, que não mantém o conjunto, o resultado exato é reconstruído
+        percorrendo as interações (O(n)); relatórios e rankings não o usam, e sim quantidade_conteudos_unicos.
+        """
+        if self.__conteudos_unicos is None:
+            return {i.conteudo_associado for i in self.__interacoes if hasattr(i, 'conteudo_associado')}
+        return set(self.__conteudos_unicos)
+
+    def quantidade_conteudos_unicos(self):
+        """
+        Retorna a quantidade de conteúdos distintos com que o usuário interagiu; no modo aproximado,
+        a estimativa do HyperLogLog. Complexidade: O(1); no modo aproximado, O(m) após cada alteração do sketch
+        (a estimativa fica guardada enquanto ele não muda).
+        """
+        if self.__conteudos_distintos is not None:
+            return self.__conteudos_distintos.estimativa()
+        return len(self.__conteudos_unicos)
 
     def calcular_tempo_total_em_plataforma(self, plataforma):
-        """Soma o tempo de consumo do usuário em uma plataforma específica."""
-        return sum(
-            i.watch_duration_seconds for i in self.__interacoes
-            if hasattr(i, 'plataforma_interacao') and i.plataforma_interacao == plataforma
-        )
+        """Retorna o tempo de consumo do usuário em uma plataforma específica. Complexidade: O(1)."""
+        return self.__tempo_por_plataforma.get(plataforma, 0)
 
+    @memoizar_por_versao
     def plataformas_mais_frequentes(self, top_n=3):
-        """Retorna as plataformas onde o usuário mais interagiu, em ordem decrescente de frequência."""
-        from collections import Counter # Importa a classe Counter, que serve para contar elementos em uma coleção
-        plataformas = [i.plataforma_interacao for i in self.__interacoes if hasattr(i, 'plataforma_interacao')]
-
-        # usa o counter para contar quantas vezes cada plataforma aparece na lista e .most_common para retornar a lista de mais frequentes
-        return Counter(plataformas).most_common(top_n)
+        """
+        Retorna as plataformas onde o usuário mais interagiu, em ordem decrescente de frequência.
+        Complexidade: O(p log p), p = plataformas distintas do usuário.
+        """
+        return self.__frequencia_plataformas.most_common(top_n)
 
     def calcular_tempo_total_assistido(self):
         """
         Retorna o tempo total assistido pelo usuário em todas as plataformas (em segundos).
+        Complexidade: O(1).
+        """
+        return self.__tempo_total
+
+    @memoizar_por_versao
+    def calcular_quantis_tempo_consumo(self, quantis=QUANTIS_PADRAO):
+        """
+        Retorna os quantis do tempo por sessão de consumo ({'p50', 'p90', 'p99'} por padrão), estimados pelo
+        sketch mantido na ingestão (erro relativo de 1%). Só entram as interações 'view_start' ou com duração
+        positiva (ver e_sessao_consumo); valores None se não houver consumo. Complexidade: O(b), b = baldes do sketch.
         """
-        plataformas = set(interacao.plataforma_interacao for interacao in self.interacoes)
-        total = 0
-        for plataforma in plataformas:
-            total += self.calcular_tempo_total_em_plataforma(plataforma)
-        return total 
+        if self.__quantis_consumo is None:
+            return quantis_vazios(quantis)
+        return self.__quantis_consumo.quantis(quantis)
 
     def __str__(self):
         return f"Usuário {self.__id_usuario}"
@@ -1,7 +1,11 @@
 """
 Árvore binária de busca genérica, onde cada nó pode armazenar uma chave e um valor.
 Permite inserção, busca, remoção e percurso em ordem dos elementos.
-A árvore não é balanceada, em casos extremos (como inserção ordenada), a complexidade pode se aproximar de O(n).
+A árvore é balanceada (AVL): após cada inserção ou remoção as alturas das subárvores
+são corrigidas por rotações, garantindo altura O(log n) mesmo com inserção ordenada.
+Todas as operações são iterativas, evitando o limite de recursão do Python.
+Cada nó guarda também o tamanho da sua subárvore, o que permite consultas de estatística
+de ordem (k-ésimo elemento e posição de uma chave) em O(log n).
 """
 
 class No:
@@ -10,113 +14,251 @@ class No:
         self.valor = valor      # Pode ser um objeto Conteudo, Usuario, etc.
         self.esquerda = None
         self.direita = None
+        self.altura = 1         # Altura do nó (folha = 1), usada no balanceamento
+        self.tamanho = 1        # Quantidade de nós da subárvore, usada nas estatísticas de ordem
 
 class ArvoreBinariaBusca:
     def __init__(self):
         self.raiz = None
+        self._tamanho = 0
+
+    def __len__(self):
+        """Retorna a quantidade de elementos da árvore.
+        Complexidade: O(1)."""
+        return self._tamanho
+
+    def altura(self):
+        """Retorna a altura da árvore (0 se vazia).
+        Complexidade: O(1)."""
+        return self._altura(self.raiz)
 
     def inserir(self, chave, valor):
         """
         Insere um novo elemento na árvore.
-        Complexidade: O(h), h = altura da árvore.
+        Complexidade: O(log n).
         Se a árvore estiver vazia, cria a raiz.
+        Se a chave já existir, apenas atualiza o valor.
         """
         if self.raiz is None:
             self.raiz = No(chave, valor)
-        else:
-            self._inserir(self.raiz, chave, valor)
+            self._tamanho = 1
+            return
 
-    def _inserir(self, no_atual, chave, valor):
-        """
-        Auxiliar para inserir um novo nó na árvore.
-        Complexidade: O(h), h = altura da árvore.
-        Se a chave for menor, insere na subárvore esquerda.
-        Se a chave for maior, insere na subárvore direita.
-        """
-        if chave < no_atual.chave:
-            if no_atual.esquerda is None:
-                no_atual.esquerda = No(chave, valor)
-            else:
-                self._inserir(no_atual.esquerda, chave, valor)
-        elif chave > no_atual.chave:
-            if no_atual.direita is None:
-                no_atual.direita = No(chave, valor)
-            else:
-                self._inserir(no_atual.direita, chave, valor)
+        caminho = []  # Pilha com os nós visitados, usada para rebalancear de baixo para cima
+        no_atual = self.raiz
+        while no_atual is not None:
+            if chave == no_atual.chave:
+                no_atual.valor = valor  # Atualiza se já existir
+                return
+            caminho.append(no_atual)
+            no_atual = no_atual.esquerda if chave < no_atual.chave else no_atual.direita
+
+        pai = caminho[-1]
+        if chave < pai.chave:
+            pai.esquerda = No(chave, valor)
         else:
-            no_atual.valor = valor  # Atualiza se já existir
+            pai.direita = No(chave, valor)
+        self._tamanho += 1
+        self._rebalancear_caminho(caminho)
 
     def buscar(self, chave):
         """
         Busca um elemento pela chave.
-        Complexidade: O(h).
-        """
-        return self._buscar(self.raiz, chave)
-
-    def _buscar(self, no_atual, chave):
+        Complexidade: O(log n).
         """
-        Auxiliar para buscar um nó na árvore.
-        """
-        if no_atual is None:
-            return None
-        if chave == no_atual.chave:
-            return no_atual.valor
-        elif chave < no_atual.chave:
-            return self._buscar(no_atual.esquerda, chave)
-        else:
-            return self._buscar(no_atual.direita, chave)
+        no_atual = self.raiz
+        while no_atual is not None:
+            if chave == no_atual.chave:
+                return no_atual.valor
+            no_atual = no_atual.esquerda if chave < no_atual.chave else no_atual.direita
+        return None
 
     def percurso_em_ordem(self):
         """
         Retorna uma lista dos valores em ordem de chave.
-        Complexidade: O(n).
+        Complexidade: O(n) tempo, O(log n) de pilha auxiliar.
         """
         resultado = []
-        self._percurso_em_ordem(self.raiz, resultado)
+        pilha = []
+        no_atual = self.raiz
+        while pilha or no_atual is not None:
+            while no_atual is not None:  # Desce pela esquerda empilhando os nós
+                pilha.append(no_atual)
+                no_atual = no_atual.esquerda
+            no_atual = pilha.pop()
+            resultado.append(no_atual.valor)
+            no_atual = no_atual.direita
         return resultado
 
-    def _percurso_em_ordem(self, no_atual, resultado):
+    def remover(self, chave):
         """
-        Auxiliar para realizar o percurso em ordem.
+        Remove um elemento pela chave.
+        Complexidade: O(log n).
         """
-        if no_atual:
-            self._percurso_em_ordem(no_atual.esquerda, resultado)
-            resultado.append(no_atual.valor)
-            self._percurso_em_ordem(no_atual.direita, resultado)
+        caminho = []
+        no_atual = self.raiz
+        while no_atual is not None and chave != no_atual.chave:
+            caminho.append(no_atual)
+            no_atual = no_atual.esquerda if chave < no_atual.chave else no_atual.direita
+        if no_atual is None:
+            return  # Chave inexistente
 
-    def remover(self, chave):
+        if no_atual.esquerda is not None and no_atual.direita is not None:
+            # Dois filhos: copia o sucessor (mínimo da direita) e passa a remover o sucessor
+            caminho.append(no_atual)
+            sucessor = no_atual.direita
+            while sucessor.esquerda is not None:
+                caminho.append(sucessor)
+                sucessor = sucessor.esquerda
+            no_atual.chave = sucessor.chave
+            no_atual.valor = sucessor.valor
+            no_atual = sucessor
+
+        filho = no_atual.esquerda if no_atual.esquerda is not None else no_atual.direita
+        if not caminho:
+            self.raiz = filho
+        else:
+            pai = caminho[-1]
+            if pai.esquerda is no_atual:
+                pai.esquerda = filho
+            else:
+                pai.direita = filho
+        self._tamanho -= 1
+        self._rebalancear_caminho(caminho)
+
+    def k_esimo(self, k):
         """
-        Remove um elemento pela chave.
-        Complexidade: O(h).
+        Retorna o valor do k-ésimo menor elemento (k começa em 1), ou None se k estiver fora do intervalo.
+        Complexidade: O(log n).
+        """
+        if k < 1 or k > self._tamanho:
+            return None
+        no_atual = self.raiz
+        while no_atual is not None:
+            tamanho_esquerda = self._tamanho_subarvore(no_atual.esquerda)
+            if k == tamanho_esquerda + 1:
+                return no_atual.valor
+            if k <= tamanho_esquerda:
+                no_atual = no_atual.esquerda
+            else:
+                k -= tamanho_esquerda + 1
+                no_atual = no_atual.direita
+        return None
+
+    def posicao(self, chave):
+        """
+        Retorna a posição (começando em 1) da chave na ordem crescente, ou None se não existir.
+        Complexidade: O(log n).
         """
-        self.raiz = self._remover(self.raiz, chave)
+        posicao = 0
+        no_atual = self.raiz
+        while no_atual is not None:
+            if chave == no_atual.chave:
+                return posicao + self._tamanho_subarvore(no_atual.esquerda) + 1
+            if chave < no_atual.chave:
+                no_atual = no_atual.esquerda
+            else:
+                posicao += self._tamanho_subarvore(no_atual.esquerda) + 1
+                no_atual = no_atual.direita
+        return None
 
-    def _remover(self, no_atual, chave):
+    def primeiros(self, k):
         """
-        Auxiliar para remover um nó da árvore.
+        Retorna os valores das k menores chaves, em ordem crescente.
+        Complexidade: O(k + log n).
         """
-        if no_atual is None:
-            return no_atual
-        if chave < no_atual.chave:
-            no_atual.esquerda = self._remover(no_atual.esquerda, chave)
-        elif chave > no_atual.chave:
-            no_atual.direita = self._remover(no_atual.direita, chave)
-        else:
-            if no_atual.esquerda is None:
-                return no_atual.direita
-            elif no_atual.direita is None:
-                return no_atual.esquerda
-            temp = self._minimo(no_atual.direita)
-            no_atual.chave = temp.chave
-            no_atual.valor = temp.valor
-            no_atual.direita = self._remover(no_atual.direita, temp.chave)
-        return no_atual
+        resultado = []
+        pilha = []
+        no_atual = self.raiz
+        while (pilha or no_atual is not None) and len(resultado) < k:
+            while no_atual is not None:
+                pilha.append(no_atual)
+                no_atual = no_atual.esquerda
+            no_atual = pilha.pop()
+            resultado.append(no_atual.valor)
+            no_atual = no_atual.direita
+        return resultado
 
     def _minimo(self, no_atual):
         """
         Encontra o nó com a menor chave na subárvore.
-        Complexidade: O(h).
+        Complexidade: O(log n).
         """
         while no_atual.esquerda is not None:
             no_atual = no_atual.esquerda
-        return no_atual
\ No newline at end of file
+        return no_atual
+
+    # Auxiliares de balanceamento (AVL)
+
+    @staticmethod
+    def _altura(no):
+        """Altura de um nó, considerando None como 0. Complexidade: O(1)."""
+        return no.altura if no is not None else 0
+
+    @staticmethod
+    def _tamanho_subarvore(no):
+        """Tamanho da subárvore de um nó, considerando None como 0. Complexidade: O(1)."""
+        return no.tamanho if no is not None else 0
+
+    def _atualizar_altura(self, no):
+        """Recalcula a altura e o tamanho da subárvore do nó a partir dos filhos. Complexidade: O(1)."""
+        no.altura = 1 + max(self._altura(no.esquerda), self._altura(no.direita))
+        no.tamanho = 1 + self._tamanho_subarvore(no.esquerda) + self._tamanho_subarvore(no.direita)
+
+    def _fator_balanceamento(self, no):
+        """Diferença de altura entre as subárvores esquerda e direita. Complexidade: O(1)."""
+        return self._altura(no.esquerda) - self._altura(no.direita)
+
+    def _rotacionar_direita(self, y):
+        """Rotação simples à direita; retorna a nova raiz da subárvore. Complexidade: O(1)."""
+        x = y.esquerda
+        y.esquerda = x.direita
+        x.direita = y
+        self._atualizar_altura(y)
+        self._atualizar_altura(x)
+        return x
+
+    def _rotacionar_esquerda(self, x):
+        """Rotação simples à esquerda; retorna a nova raiz da subárvore. Complexidade: O(1)."""
+        y = x.direita
+        x.direita = y.esquerda
+        y.esquerda = x
+        self._atualizar_altura(x)
+        self._atualizar_altura(y)
+        return y
+
+    def _balancear(self, no):
+        """
+        Corrige o desbalanceamento de um nó com as rotações simples ou duplas.
+        Retorna a nova raiz da subárvore. Complexidade: O(1).
+        """
+        self._atualizar_altura(no)
+        fator = self._fator_balanceamento(no)
+        if fator > 1:
+            if self._fator_balanceamento(no.esquerda) < 0:
+                no.esquerda = self._rotacionar_esquerda(no.esquerda)
+            return self._rotacionar_direita(no)
+        if fator < -1:
+            if self._fator_balanceamento(no.direita) > 0:
+                no.direita = self._rotacionar_direita(no.direita)
+            return self._rotacionar_esquerda(no)
+        return no
+
+    def _rebalancear_caminho(self, caminho):
+        """
+        Percorre o caminho de baixo para cima rebalanceando cada nó e religando-o ao pai.
+        Complexidade: O(log n).
+        """
+        for indice in range(len(caminho) - 1, -1, -1):
+            no = caminho[indice]
+            nova_raiz = self._balancear(no)
+            if nova_raiz is no:
+                continue
+            if indice == 0:
+                self.raiz = nova_raiz
+            else:
+                pai = caminho[indice - 1]
+                if pai.esquerda is no:
+                    pai.esquerda = nova_raiz
+                else:
+                    pai.direita = nova_raiz
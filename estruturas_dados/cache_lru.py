@@ -0,0 +1,70 @@
+"""
+Cache de tamanho limitado com descarte do item usado há mais tempo (LRU - Least Recently Used).
+Os itens ficam em um OrderedDict na ordem de uso: cada acesso move o item para o final,
+e ao exceder a capacidade o primeiro item (o menos recente) é descartado.
+Consulta, inserção e descarte são O(1).
+"""
+
+from collections import OrderedDict
+
+
+class CacheLRU:
+    def __init__(self, capacidade: int = 1024):
+        """Inicializa o cache vazio com a capacidade máxima de itens informada."""
+        self._validar_capacidade(capacidade)
+        self._capacidade = capacidade
+        self._itens = OrderedDict()
+        self.acertos = 0
+        self.falhas = 0
+        self.descartes = 0
+
+    @staticmethod
+    def _validar_capacidade(capacidade):
+        if not isinstance(capacidade, int) or capacidade <= 0:
+            raise ValueError("A capacidade do cache deve ser um inteiro positivo.")
+
+    @property
+    def capacidade(self):
+        """Quantidade máxima de itens guardados."""
+        return self._capacidade
+
+    def __len__(self):
+        """Quantidade de itens no cache. Complexidade: O(1)."""
+        return len(self._itens)
+
+    def obter(self, chave, padrao=None):
+        """Retorna o valor da chave (marcando-o como usado recentemente) ou `padrao`. Complexidade: O(1)."""
+        try:
+            valor = self._itens[chave]
+        except KeyError:
+            self.falhas += 1
+            return padrao
+        self._itens.move_to_end(chave)
+        self.acertos += 1
+        return valor
+
+    def guardar(self, chave, valor):
+        """Guarda o valor, descartando o item menos recente se a capacidade for excedida. Complexidade: O(1)."""
+        self._itens[chave] = valor
+        self._itens.move_to_end(chave)
+        if len(self._itens) > self._capacidade:
+            self._itens.popitem(last=False)
+            self.descartes += 1
+
+    def redimensionar(self, capacidade: int):
+        """Altera a capacidade, descartando os itens menos recentes que excederem o novo limite. Complexidade: O(d)."""
+        self._validar_capacidade(capacidade)
+        self._capacidade = capacidade
+        while len(self._itens) > capacidade:
+            self._itens.popitem(last=False)
+            self.descartes += 1
+
+    def limpar(self):
+        """Remove todos os itens e zera as estatísticas. Complexidade: O(n)."""
+        self._itens.clear()
+        self.acertos = self.falhas = self.descartes = 0
+
+    def estatisticas(self):
+        """Retorna tamanho, capacidade, acertos, falhas e descartes. Complexidade: O(1)."""
+        return {'tamanho': len(self._itens), 'capacidade': self._capacidade, 'acertos': self.acertos,
+                'falhas': self.falhas, 'descartes': self.descartes}
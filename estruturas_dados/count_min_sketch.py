@@ -0,0 +1,106 @@
+"""
+Count-Min Sketch: contagens aproximadas de muitas chaves em uma tabela de tamanho fixo.
+A tabela tem d linhas de w contadores; cada chave incrementa um contador por linha (escolhido por hash)
+e a estimativa é o menor deles. A estimativa nunca é menor que a contagem real e, com probabilidade
+1 - probabilidade_falha, excede-a em no máximo erro * N (N = soma de todas as contagens), para
+w = ceil(e / erro) e d = ceil(ln(1 / probabilidade_falha)).
+Dois sketches com as mesmas dimensões são mesclados somando as tabelas.
+"""
+
+import math
+import sys
+from array import array
+
+from estruturas_dados.hash_estavel import hash64
+
+
+class CountMinSketch:
+    __slots__ = ('_largura', '_profundidade', '_tabela', '_total')
+
+    def __init__(self, erro: float = 0.001, probabilidade_falha: float = 0.01):
+        """Cria a tabela para o erro (fração de N) e a probabilidade de falha informados."""
+        if not 0 < erro < 1 or not 0 < probabilidade_falha < 1:
+            raise ValueError("O erro e a probabilidade de falha devem estar entre 0 e 1.")
+        self._largura = math.ceil(math.e / erro)
+        self._profundidade = math.ceil(math.log(1 / probabilidade_falha))
+        self._tabela = [array('q', bytes(8 * self._largura)) for _ in range(self._profundidade)]
+        self._total = 0
+
+    @property
+    def largura(self):
+        return self._largura
+
+    @property
+    def profundidade(self):
+        return self._profundidade
+
+    @property
+    def total(self):
+        """Soma de todas as contagens registradas (N)."""
+        return self._total
+
+    @property
+    def erro_absoluto(self):
+        """Excesso máximo da estimativa, com alta probabilidade: e / w * N."""
+        return math.e / self._largura * self._total
+
+    def _posicoes(self, chave):
+        # Hashing duplo (h1 + i * h2) a partir de um único hash de 64 bits
+        valor = hash64(chave)
+        h1, h2 = valor & 0xFFFFFFFF, (valor >> 32) | 1
+        largura = self._largura
+        return [(h1 + i * h2) % largura for i in range(self._profundidade)]
+
+    def adicionar(self, chave, quantidade: int = 1):
+        """Soma `quantidade` (não negativa) à contagem da chave. Complexidade: O(d)."""
+        if quantidade < 0:
+            raise ValueError("O Count-Min Sketch só aceita incrementos não negativos.")
+        for linha, posicao in zip(self._tabela, self._posicoes(chave)):
+            linha[posicao] += quantidade
+        self._total += quantidade
+
+    def estimar(self, chave) -> int:
+        """Contagem estimada da chave (limite superior da contagem real). Complexidade: O(d)."""
+        return min(linha[posicao] for linha, posicao in zip(self._tabela, self._posicoes(chave)))
+
+    def mesclar(self, outro):
+        """Soma as contagens de `outro` (mesmas dimensões) a este sketch e retorna self. Complexidade: O(d w)."""
+        if (outro._largura, outro._profundidade) != (self._largura, self._profundidade):
+            raise ValueError("Só é possível mesclar sketches Count-Min com as mesmas dimensões.")
+        for linha, outra_linha in zip(self._tabela, outro._tabela):
+            for posicao, quantidade in enumerate(outra_linha):
+                if quantidade:
+                    linha[posicao] += quantidade
+        self._total += outro._total
+        return self
+
+    def memoria_bytes(self) -> int:
+        """Bytes ocupados pelos contadores."""
+        return self._largura * self._profundidade * 8
+
+    def para_dict(self):
+        """Representação serializável (contadores em hexadecimal, little-endian)."""
+        linhas = []
+        for linha in self._tabela:
+            copia = array('q', linha)
+            if sys.byteorder == 'big':
+                copia.byteswap()
+            linhas.append(copia.tobytes().hex())
+        return {'largura': self._largura, 'profundidade': self._profundidade, 'total': self._total, 'tabela': linhas}
+
+    @classmethod
+    def de_dict(cls, dados):
+        """Recria o sketch a partir de para_dict()."""
+        sketch = cls.__new__(cls)
+        sketch._largura, sketch._profundidade, sketch._total = dados['largura'], dados['profundidade'], dados['total']
+        sketch._tabela = []
+        for texto in dados['tabela']:
+            linha = array('q', bytes.fromhex(texto))
+            if sys.byteorder == 'big':
+                linha.byteswap()
+            if len(linha) != sketch._largura:
+                raise ValueError("Largura da tabela incompatível com o Count-Min Sketch.")
+            sketch._tabela.append(linha)
+        if len(sketch._tabela) != sketch._profundidade:
+            raise ValueError("Profundidade da tabela incompatível com o Count-Min Sketch.")
+        return sketch
@@ -1,30 +1,168 @@
 """
-Implementação de uma fila utilizando uma lista.
+Implementação de uma fila utilizando um buffer circular (ring buffer).
 Segue o princípio FIFO.
+Enfileirar e desenfileirar são O(1): o início da fila é apenas um índice que avança,
+sem realocar os demais elementos. Opcionalmente a fila pode ter capacidade máxima,
+com política configurável para quando estiver cheia:
+- 'bloquear': o produtor espera até que um consumidor libere espaço (uso com threads);
+- 'descartar_antigo': o item mais antigo é descartado para dar lugar ao novo;
+- 'erro': levanta OverflowError.
+O buffer começa pequeno e dobra de tamanho quando cheio, também nas filas limitadas (até a capacidade
+máxima): uma fila de capacidade alta que nunca enche não paga pela capacidade inteira.
 """
 
+import threading
+from contextlib import nullcontext
+
+POLITICAS_TRANSBORDO = ('bloquear', 'descartar_antigo', 'erro')
+CAPACIDADE_INICIAL = 16
+
+
 class Fila:
-    def __init__(self):
-        self.itens = []
+    def __init__(self, capacidade_maxima: int = None, politica_transbordo: str = 'erro'):
+        """
+        Inicializa a fila vazia.
+        capacidade_maxima=None indica fila ilimitada. Em ambos os casos o buffer começa com até
+        CAPACIDADE_INICIAL posições e cresce dobrando de tamanho, sem passar da capacidade máxima.
+        """
+        if capacidade_maxima is not None and (not isinstance(capacidade_maxima, int) or capacidade_maxima <= 0):
+            raise ValueError("A capacidade máxima deve ser um inteiro positivo.")
+        if politica_transbordo not in POLITICAS_TRANSBORDO:
+            raise ValueError(f"Política de transbordo inválida: {politica_transbordo}. Deve ser uma de {POLITICAS_TRANSBORDO}.")
+
+        self.capacidade_maxima = capacidade_maxima
+        self.politica_transbordo = politica_transbordo
+        self._buffer = [None] * min(capacidade_maxima or CAPACIDADE_INICIAL, CAPACIDADE_INICIAL)
+        self._inicio = 0   # Índice do primeiro item
+        self._tamanho = 0  # Quantidade de itens na fila
+        self.itens_descartados = 0  # Contador de itens perdidos pela política 'descartar_antigo'
 
-    def enfileirar(self, linha_csv):
-        """Adiciona um item ao final da fila. 
-        Complexidade: O(1) no caso médio."""
-        self.itens.append(linha_csv)
+        # Sincronização só é necessária quando o produtor pode ficar bloqueado esperando o consumidor
+        self._bloqueante = capacidade_maxima is not None and politica_transbordo == 'bloquear'
+        if self._bloqueante:
+            self._condicao = threading.Condition()
+        else:
+            self._condicao = nullcontext()
+
+    def enfileirar(self, linha_csv, timeout: float = None):
+        """Adiciona um item ao final da fila.
+        Complexidade: O(1) amortizado (o buffer dobra de tamanho quando precisa crescer).
+        Na política 'bloquear', espera até `timeout` segundos por espaço livre."""
+        with self._condicao:
+            if self.capacidade_maxima is not None and self._tamanho == self.capacidade_maxima:
+                self._tratar_transbordo(timeout)
+            self._inserir(linha_csv)
+
+    def enfileirar_lote(self, linhas, timeout: float = None):
+        """Adiciona cada item de um iterável ao final da fila, na ordem recebida.
+        Na política 'erro', o lote é atômico: se não couber inteiro no espaço livre, OverflowError é levantado
+        antes de qualquer inserção (um iterável sem tamanho é materializado em lista para a verificação).
+        Nas políticas 'descartar_antigo' e 'bloquear', a política é aplicada item a item; em 'bloquear',
+        um tempo esgotado levanta OverflowError com a parte inicial do lote já enfileirada.
+        Complexidade: O(k), k = quantidade de itens."""
+        if self.capacidade_maxima is None or self.politica_transbordo != 'erro':
+            for linha in linhas:
+                self.enfileirar(linha, timeout)
+            return
+        if not hasattr(linhas, '__len__'):
+            linhas = list(linhas)
+        with self._condicao:
+            if self._tamanho + len(linhas) > self.capacidade_maxima:
+                raise OverflowError(f"O lote de {len(linhas)} itens não cabe na fila "
+                                    f"({self._tamanho} de {self.capacidade_maxima} posições ocupadas).")
+            for linha in linhas:
+                self._inserir(linha)
 
     def desenfileirar(self):
-        """Remove e retorna o item do início da fila. 
-        Complexidade: O(n) devido ao realocamento da lista."""
-        if not self.is_empty():
-            return self.itens.pop(0)
-        return None
+        """Remove e retorna o item do início da fila, ou None se estiver vazia.
+        Complexidade: O(1)."""
+        with self._condicao:
+            if self._tamanho == 0:
+                return None
+            item = self._buffer[self._inicio]
+            self._buffer[self._inicio] = None  # Libera a referência para o coletor de lixo
+            self._inicio = (self._inicio + 1) % len(self._buffer)
+            self._tamanho -= 1
+            if self._bloqueante:
+                self._condicao.notify_all()
+            return item
+
+    def desenfileirar_lote(self, n: int, aguardar: bool = False, timeout: float = None):
+        """Remove e retorna até n itens do início da fila, em ordem FIFO.
+        Com aguardar=True (apenas na política 'bloquear', em que produtor e consumidor usam threads
+        diferentes), espera até `timeout` segundos por pelo menos um item; esgotado o tempo, retorna
+        uma lista vazia.
+        Complexidade: O(k), k = quantidade de itens retornados."""
+        if n < 0:
+            raise ValueError("A quantidade do lote deve ser um inteiro não negativo.")
+        if aguardar and not self._bloqueante:
+            raise ValueError("Só é possível aguardar itens em filas limitadas com a política 'bloquear'.")
+        with self._condicao:
+            if aguardar and n:
+                self._condicao.wait_for(lambda: self._tamanho > 0, timeout)
+            quantidade = min(n, self._tamanho)
+            capacidade = len(self._buffer)
+            lote = []
+            for _ in range(quantidade):
+                lote.append(self._buffer[self._inicio])
+                self._buffer[self._inicio] = None
+                self._inicio = (self._inicio + 1) % capacidade
+            self._tamanho -= quantidade
+            if quantidade and self._bloqueante:
+                self._condicao.notify_all()
+            return lote
 
     def is_empty(self):
-        """Verifica se a fila está vazia. 
+        """Verifica se a fila está vazia.
+        Complexidade: O(1)."""
+        return self._tamanho == 0
+
+    def is_full(self):
+        """Verifica se a fila atingiu a capacidade máxima (sempre False se ilimitada).
         Complexidade: O(1)."""
-        return len(self.itens) == 0
+        return self.capacidade_maxima is not None and self._tamanho == self.capacidade_maxima
 
     def tamanho(self):
-        """Retorna o tamanho da fila. 
+        """Retorna o tamanho da fila.
         Complexidade: O(1)."""
-        return len(self.itens)
\ No newline at end of file
+        return self._tamanho
+
+    def __len__(self):
+        return self._tamanho
+
+    def _tratar_transbordo(self, timeout):
+        """Aplica a política de transbordo quando a fila está cheia.
+        Complexidade: O(1) (a política 'bloquear' pode esperar o consumidor)."""
+        if self.politica_transbordo == 'erro':
+            raise OverflowError(f"A fila atingiu a capacidade máxima ({self.capacidade_maxima}).")
+        if self.politica_transbordo == 'descartar_antigo':
+            self._buffer[self._inicio] = None
+            self._inicio = (self._inicio + 1) % len(self._buffer)
+            self._tamanho -= 1
+            self.itens_descartados += 1
+            return
+        # 'bloquear': espera até que um consumidor libere espaço
+        if not self._condicao.wait_for(lambda: self._tamanho < self.capacidade_maxima, timeout):
+            raise OverflowError("Tempo esgotado aguardando espaço na fila.")
+
+    def _inserir(self, item):
+        """Grava o item no fim do buffer, que já tem espaço dentro da capacidade máxima, crescendo-o se necessário.
+        Complexidade: O(1) amortizado."""
+        if self._tamanho == len(self._buffer):
+            nova_capacidade = 2 * len(self._buffer)
+            if self.capacidade_maxima is not None:
+                nova_capacidade = min(nova_capacidade, self.capacidade_maxima)
+            self._redimensionar(nova_capacidade)
+        self._buffer[(self._inicio + self._tamanho) % len(self._buffer)] = item
+        self._tamanho += 1
+        if self._bloqueante:
+            self._condicao.notify_all()  # Acorda um consumidor à espera (desenfileirar_lote com aguardar=True)
+
+    def _redimensionar(self, nova_capacidade):
+        """Copia os itens para um buffer maior, reiniciando o índice de início.
+        Complexidade: O(n), amortizada em O(1) por inserção."""
+        novo_buffer = [None] * nova_capacidade
+        for i in range(self._tamanho):
+            novo_buffer[i] = self._buffer[(self._inicio + i) % len(self._buffer)]
+        self._buffer = novo_buffer
+        self._inicio = 0
@@ -0,0 +1,33 @@
+"""
+Hash de 64 bits estável entre processos e execuções, usado pelos sketches probabilísticos.
+O hash() do Python é aleatorizado para textos (PYTHONHASHSEED) e é a identidade para inteiros,
+o que impediria mesclar sketches de processos diferentes e concentraria IDs sequenciais.
+Inteiros passam pelo misturador splitmix64; textos e bytes usam BLAKE2b de 8 bytes; tuplas combinam os
+hashes dos elementos. Complexidade: O(1) para inteiros, O(tamanho) para textos.
+"""
+
+from hashlib import blake2b
+
+_MASCARA_64 = (1 << 64) - 1
+
+
+def _misturar(valor: int) -> int:
+    """Finalizador do splitmix64: espalha os bits de um inteiro de 64 bits."""
+    valor = (valor + 0x9E3779B97F4A7C15) & _MASCARA_64
+    valor = ((valor ^ (valor >> 30)) * 0xBF58476D1CE4E5B9) & _MASCARA_64
+    valor = ((valor ^ (valor >> 27)) * 0x94D049BB133111EB) & _MASCARA_64
+    return valor ^ (valor >> 31)
+
+
+def hash64(item) -> int:
+    """Retorna um inteiro de 64 bits determinístico para inteiros, textos, bytes e tuplas deles."""
+    if isinstance(item, int):
+        return _misturar(item & _MASCARA_64)
+    if isinstance(item, tuple):
+        resultado = len(item)
+        for elemento in item:
+            resultado = _misturar(resultado ^ hash64(elemento))
+        return resultado
+    if isinstance(item, str):
+        item = item.encode('utf-8')
+    return int.from_bytes(blake2b(item, digest_size=8).digest(), 'little')
@@ -0,0 +1,169 @@
+"""
+HyperLogLog: estimativa da quantidade de itens distintos com memória fixa.
+Cada item tem um hash de 64 bits; os p primeiros bits escolhem um de m = 2^p registradores, que guarda
+a maior posição do primeiro bit 1 vista nos bits restantes. O erro relativo típico é 1,04 / sqrt(m),
+com um byte por registrador, qualquer que seja a quantidade de itens.
+Enquanto poucos registradores estão ocupados, o sketch usa uma representação esparsa (como no HLL++):
+um array ordenado de entradas (índice << 6 | valor), 4 bytes por registrador não nulo. Ao passar de m / 4
+entradas, ele é convertido para os m bytes densos. As duas representações guardam os mesmos valores,
+então a estimativa é idêntica; a esparsa apenas evita que entidades com poucos itens ocupem m bytes.
+Dois sketches com a mesma precisão são mesclados pelo máximo de cada registrador (união dos conjuntos).
+"""
+
+import math
+from array import array
+from bisect import bisect_left
+
+from estruturas_dados.hash_estavel import hash64
+
+PRECISAO_MINIMA = 4
+PRECISAO_MAXIMA = 16
+_BITS_VALOR = 6  # O valor de um registrador é no máximo 64 - p + 1 < 2^6
+
+
+def precisao_para_erro(erro_relativo: float) -> int:
+    """Menor precisão p cujo erro típico 1,04 / sqrt(2^p) não passa de `erro_relativo` (entre 4 e 16)."""
+    if not 0 < erro_relativo < 1:
+        raise ValueError("O erro relativo deve estar entre 0 e 1.")
+    precisao = math.ceil(2 * math.log2(1.04 / erro_relativo))
+    return min(PRECISAO_MAXIMA, max(PRECISAO_MINIMA, precisao))
+
+
+class HyperLogLog:
+    __slots__ = ('_precisao', '_registradores', '_esparso', '_estimativa')
+
+    def __init__(self, precisao: int = 10):
+        """Cria o sketch vazio (esparso) com 2^precisao registradores (ver precisao_para_erro)."""
+        if not isinstance(precisao, int) or not PRECISAO_MINIMA <= precisao <= PRECISAO_MAXIMA:
+            raise ValueError(f"A precisão deve ser um inteiro entre {PRECISAO_MINIMA} e {PRECISAO_MAXIMA}.")
+        self._precisao = precisao
+        self._registradores = None   # bytearray de m registradores, na representação densa
+        self._esparso = array('I')   # (índice << 6 | valor) em ordem crescente, na representação esparsa
+        self._estimativa = None      # Última estimativa calculada, descartada a cada alteração
+
+    @property
+    def precisao(self):
+        return self._precisao
+
+    @property
+    def erro_relativo(self):
+        """Erro relativo típico (desvio padrão) da estimativa."""
+        return 1.04 / math.sqrt(1 << self._precisao)
+
+    @property
+    def esparso(self):
+        """Indica se o sketch ainda está na representação esparsa."""
+        return self._registradores is None
+
+    def adicionar(self, item):
+        """Registra um item (inteiro, texto, bytes ou tupla). Complexidade: O(1) denso; O(k) esparso, k <= m / 4."""
+        valor = hash64(item)
+        bits_restantes = 64 - self._precisao
+        indice = valor >> bits_restantes
+        posicao = bits_restantes - (valor & ((1 << bits_restantes) - 1)).bit_length() + 1
+        self._atualizar(indice, posicao)
+
+    def _atualizar(self, indice, posicao):
+        registradores = self._registradores
+        if registradores is not None:
+            if posicao > registradores[indice]:
+                registradores[indice] = posicao
+                self._estimativa = None
+            return
+        esparso = self._esparso
+        i = bisect_left(esparso, indice << _BITS_VALOR)
+        if i < len(esparso) and esparso[i] >> _BITS_VALOR == indice:
+            if posicao > esparso[i] & ((1 << _BITS_VALOR) - 1):
+                esparso[i] = indice << _BITS_VALOR | posicao
+                self._estimativa = None
+            return
+        esparso.insert(i, indice << _BITS_VALOR | posicao)
+        self._estimativa = None
+        if len(esparso) * esparso.itemsize > (1 << self._precisao):
+            self._tornar_denso()
+
+    def _tornar_denso(self):
+        """Converte para os m registradores densos. Complexidade: O(m)."""
+        registradores = bytearray(1 << self._precisao)
+        mascara = (1 << _BITS_VALOR) - 1
+        for entrada in self._esparso:
+            registradores[entrada >> _BITS_VALOR] = entrada & mascara
+        self._registradores = registradores
+        self._esparso = None
+
+    def _valores(self):
+        """Pares (índice, valor) dos registradores não nulos."""
+        if self._registradores is not None:
+            return ((indice, valor) for indice, valor in enumerate(self._registradores) if valor)
+        mascara = (1 << _BITS_VALOR) - 1
+        return ((entrada >> _BITS_VALOR, entrada & mascara) for entrada in self._esparso)
+
+    def estimativa(self) -> int:
+        """
+        Estimativa da quantidade de itens distintos, com a correção para poucos itens (contagem linear).
+        O valor fica guardado até a próxima alteração. Complexidade: O(m) denso; O(k) esparso.
+        """
+        if self._estimativa is not None:
+            return self._estimativa
+        m = 1 << self._precisao
+        if m == 16:
+            alfa = 0.673
+        elif m == 32:
+            alfa = 0.697
+        elif m == 64:
+            alfa = 0.709
+        else:
+            alfa = 0.7213 / (1 + 1.079 / m)
+        if self._registradores is not None:
+            soma = math.fsum(2.0 ** -registrador for registrador in self._registradores)
+            vazios = self._registradores.count(0)
+        else:  # Registradores ausentes valem 0 e contribuem com 2^0 = 1 cada
+            vazios = m - len(self._esparso)
+            soma = math.fsum([vazios] + [2.0 ** -valor for _, valor in self._valores()])
+        estimativa = alfa * m * m / soma
+        if estimativa <= 2.5 * m and vazios:
+            estimativa = m * math.log(m / vazios)
+        self._estimativa = round(estimativa)
+        return self._estimativa
+
+    def mesclar(self, outro):
+        """Une `outro` a este sketch (mesma precisão) e retorna self. Complexidade: O(m) ou O(k) se ambos esparsos."""
+        if outro._precisao != self._precisao:
+            raise ValueError("Só é possível mesclar sketches HyperLogLog com a mesma precisão.")
+        if self._registradores is not None and outro._registradores is not None:
+            self._registradores = bytearray(map(max, self._registradores, outro._registradores))
+            self._estimativa = None
+            return self
+        if outro._registradores is not None:
+            self._tornar_denso()
+        for indice, valor in outro._valores():
+            self._atualizar(indice, valor)
+        return self
+
+    def memoria_bytes(self) -> int:
+        """Bytes ocupados pelos registradores (ou pelas entradas esparsas)."""
+        if self._registradores is not None:
+            return len(self._registradores)
+        return len(self._esparso) * self._esparso.itemsize
+
+    def para_dict(self):
+        """Representação serializável (os m registradores em hexadecimal, qualquer que seja a representação)."""
+        if self._registradores is not None:
+            registradores = self._registradores
+        else:
+            registradores = bytearray(1 << self._precisao)
+            for indice, valor in self._valores():
+                registradores[indice] = valor
+        return {'precisao': self._precisao, 'registradores': registradores.hex()}
+
+    @classmethod
+    def de_dict(cls, dados):
+        """Recria o sketch a partir de para_dict(), na representação esparsa se couber nela."""
+        sketch = cls(dados['precisao'])
+        registradores = bytearray.fromhex(dados['registradores'])
+        if len(registradores) != 1 << sketch._precisao:
+            raise ValueError("Quantidade de registradores incompatível com a precisão do HyperLogLog.")
+        for indice, valor in enumerate(registradores):
+            if valor:
+                sketch._atualizar(indice, valor)
+        return sketch
@@ -0,0 +1,90 @@
+"""
+Índice temporal de itens por hora, para consultas por intervalo de tempo.
+Cada item é guardado no balde (bucket) da hora a que pertence; a lista das horas com itens é mantida
+ordenada, e a busca do início de um intervalo usa busca binária (bisect).
+Uma consulta custa O(log H + h + k), com H horas distintas no índice, h horas no intervalo e k itens retornados,
+independentemente do tamanho total do histórico.
+Quando os itens são inteiros (por exemplo, posições em um armazenamento colunar), o índice pode guardá-los,
+com os epochs, em arrays compactos em vez de listas de objetos (ver tipo_itens).
+"""
+
+from array import array
+from bisect import bisect_left, insort
+
+SEGUNDOS_POR_HORA = 3600
+SEGUNDOS_POR_DIA = 86400
+
+
+class IndiceTemporal:
+    def __init__(self, tipo_itens: str = None):
+        """
+        Cria o índice vazio. Com `tipo_itens` (typecode de array, ex.: 'I'), os itens devem ser inteiros e
+        cada balde guarda epochs e itens em arrays (8 bytes por epoch mais o tamanho do typecode por item).
+        """
+        self._tipo_itens = tipo_itens
+        self._baldes = {}       # hora (epoch // 3600) -> (epochs, itens), na ordem de chegada
+        self._horas = []        # horas com itens, em ordem crescente
+        self._tamanho = 0
+
+    def __len__(self):
+        """Quantidade de itens indexados. Complexidade: O(1)."""
+        return self._tamanho
+
+    def adicionar(self, epoch: int, item):
+        """
+        Indexa um item pelo seu instante em segundos desde a época.
+        Complexidade: O(1) se a hora já existe; O(H) no pior caso ao criar uma hora nova fora de ordem
+        (O(1) amortizado quando os dados chegam em ordem cronológica).
+        """
+        hora = epoch // SEGUNDOS_POR_HORA
+        balde = self._baldes.get(hora)
+        if balde is None:
+            if self._tipo_itens is None:
+                balde = self._baldes[hora] = ([], [])
+            else:
+                balde = self._baldes[hora] = (array('q'), array(self._tipo_itens))
+            if not self._horas or hora > self._horas[-1]:
+                self._horas.append(hora)
+            else:
+                insort(self._horas, hora)
+        balde[0].append(epoch)
+        balde[1].append(item)
+        self._tamanho += 1
+
+    def intervalo(self, inicio: int = None, fim: int = None):
+        """
+        Gera os itens com inicio <= epoch < fim (limites None são abertos), hora a hora em ordem crescente.
+        Dentro de uma mesma hora, os itens saem na ordem de chegada.
+        Complexidade: O(log H + h + k).
+        """
+        for _, item in self._pares_intervalo(inicio, fim):
+            yield item
+
+    def horas(self, inicio: int = None, fim: int = None):
+        """
+        Gera pares (hora, itens da hora) para as horas que intersectam o intervalo, em ordem crescente.
+        A hora é o início do período em segundos desde a época. Complexidade: O(log H + h + k).
+        """
+        hora_atual = None
+        itens = []
+        for item_epoch, item in self._pares_intervalo(inicio, fim):
+            hora = item_epoch // SEGUNDOS_POR_HORA * SEGUNDOS_POR_HORA
+            if hora != hora_atual:
+                if hora_atual is not None:
+                    yield hora_atual, itens
+                hora_atual, itens = hora, []
+            itens.append(item)
+        if hora_atual is not None:
+            yield hora_atual, itens
+
+    def _pares_intervalo(self, inicio, fim):
+        """Como intervalo(), mas gerando pares (epoch, item)."""
+        hora_inicial = 0 if inicio is None else bisect_left(self._horas, inicio // SEGUNDOS_POR_HORA)
+        for posicao in range(hora_inicial, len(self._horas)):
+            hora = self._horas[posicao]
+            if fim is not None and hora * SEGUNDOS_POR_HORA >= fim:
+                break
+            epochs, itens = self._baldes[hora]
+            for epoch, item in zip(epochs, itens):
+                if (inicio is None or epoch >= inicio) and (fim is None or epoch < fim):
+                    yield epoch, item
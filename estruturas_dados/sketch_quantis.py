@@ -0,0 +1,242 @@
+"""
+Sketch de quantis com erro relativo garantido (no estilo do DDSketch), para valores não negativos.
+Cada valor positivo x cai no balde k = ceil(log_gama(x)), com gama = (1 + erro) / (1 - erro), e o balde
+é representado por 2 gama^k / (gama + 1): qualquer quantil estimado fica a no máximo `erro` (relativo)
+do valor real do mesmo posto. Zeros têm um contador próprio.
+Enquanto há poucos baldes usados, eles ficam em forma esparsa: dois arrays paralelos e ordenados (índice do
+balde e contador, 8 bytes por balde usado, inserção por busca binária). Quando os baldes usados passam a ocupar
+ao menos metade da faixa entre o menor e o maior (e são pelo menos MIN_BALDES_DENSO), os contadores passam a um
+array denso a partir do menor balde (4 bytes por balde da faixa, incremento O(1)). Assim a memória depende da
+faixa de valores, não da quantidade: para durações de 1 s a 1 dia com erro de 1%, são no máximo ~570 baldes
+de 4 bytes. Se a faixa exceder `max_baldes`, os baldes menores são agrupados (perdendo precisão apenas nos
+quantis mais baixos).
+Custo de memória: um sketch vazio ocupa ~300 bytes (objeto com __slots__ e dois arrays vazios), e cada balde
+usado acrescenta 8 bytes (esparso) ou cada balde da faixa 4 bytes (denso). Quem mantém um sketch por entidade deve
+criá-lo apenas na primeira sessão de consumo e usar quantis_vazios() enquanto não houver nenhum.
+Dois sketches com o mesmo erro são mesclados somando os contadores, com o mesmo resultado de um único
+sketch que tivesse recebido todos os valores.
+"""
+
+import math
+from array import array
+from bisect import bisect_left, bisect_right
+
+QUANTIS_PADRAO = (0.5, 0.9, 0.99)
+MIN_BALDES_DENSO = 16  # Abaixo disso os baldes ficam sempre na forma esparsa
+
+
+def quantis_vazios(quantis=QUANTIS_PADRAO):
+    """Resultado de quantis() para um sketch sem valores, sem precisar criá-lo."""
+    return {f'p{q * 100:g}': None for q in quantis}
+
+
+class SketchQuantis:
+    __slots__ = ('_erro', '_log_gama', '_max_baldes', '_baldes', '_contagens', '_deslocamento', '_zeros', '_total',
+                 '_minimo', '_maximo')
+
+    def __init__(self, erro_relativo: float = 0.01, max_baldes: int = 2048):
+        """Cria o sketch vazio para o erro relativo informado."""
+        if not 0 < erro_relativo < 1:
+            raise ValueError("O erro relativo deve estar entre 0 e 1.")
+        if not isinstance(max_baldes, int) or max_baldes <= 0:
+            raise ValueError("A quantidade máxima de baldes deve ser um inteiro positivo.")
+        self._erro = erro_relativo
+        self._log_gama = math.log((1 + erro_relativo) / (1 - erro_relativo))
+        self._max_baldes = max_baldes
+        self._baldes = array('i')     # Índices dos baldes usados, em ordem (forma esparsa); None na forma densa
+        self._contagens = array('I')  # Contadores de 4 bytes, paralelos a _baldes ou a partir de _deslocamento
+        self._deslocamento = 0      # Balde do primeiro contador (forma densa)
+        self._zeros = 0
+        self._total = 0
+        self._minimo = None
+        self._maximo = None
+
+    @property
+    def total(self):
+        """Quantidade de valores registrados."""
+        return self._total
+
+    @property
+    def erro_relativo(self):
+        return self._erro
+
+    def adicionar(self, valor, quantidade: int = 1):
+        """
+        Registra `quantidade` ocorrências de um valor não negativo. Complexidade: O(1) amortizado na forma densa;
+        na esparsa, O(log b) em um balde já usado e O(b) ao inserir um balde novo (b < MIN_BALDES_DENSO na maioria dos casos).
+        """
+        if valor < 0:
+            raise ValueError("O sketch de quantis aceita apenas valores não negativos.")
+        if quantidade <= 0:
+            return
+        self._total += quantidade
+        if self._minimo is None or valor < self._minimo:
+            self._minimo = valor
+        if self._maximo is None or valor > self._maximo:
+            self._maximo = valor
+        if valor == 0:
+            self._zeros += quantidade
+        else:
+            self._incrementar(math.ceil(math.log(valor) / self._log_gama), quantidade)
+
+    def _incrementar(self, balde, quantidade):
+        baldes = self._baldes
+        if baldes is not None:
+            self._incrementar_esparso(baldes, balde, quantidade)
+            return
+        contagens = self._contagens
+        if not contagens:
+            self._deslocamento = balde
+            contagens.append(0)
+        elif balde < self._deslocamento:
+            contagens[0:0] = array('I', [0]) * (self._deslocamento - balde)
+            self._deslocamento = balde
+        elif balde >= self._deslocamento + len(contagens):
+            contagens.extend(array('I', [0]) * (balde - self._deslocamento - len(contagens) + 1))
+        contagens[balde - self._deslocamento] += quantidade
+        if len(contagens) > self._max_baldes:
+            self._agrupar_menores()
+
+    def _incrementar_esparso(self, baldes, balde, quantidade):
+        """Incremento na forma esparsa. Complexidade: O(log b) se o balde já existe, O(b) ao inserir um novo."""
+        indice = bisect_left(baldes, balde)
+        if indice < len(baldes) and baldes[indice] == balde:
+            self._contagens[indice] += quantidade
+            return
+        baldes.insert(indice, balde)
+        self._contagens.insert(indice, quantidade)
+        faixa = baldes[-1] - baldes[0] + 1
+        if faixa > self._max_baldes:
+            self._agrupar_menores_esparso()
+        elif len(baldes) >= MIN_BALDES_DENSO and 2 * len(baldes) >= faixa:
+            self._densificar()
+
+    def _agrupar_menores(self):
+        """Soma os baldes excedentes de menor valor ao primeiro balde mantido."""
+        excesso = len(self._contagens) - self._max_baldes
+        soma = sum(self._contagens[:excesso + 1])
+        del self._contagens[:excesso]
+        self._contagens[0] = soma
+        self._deslocamento += excesso
+
+    def _agrupar_menores_esparso(self):
+        """Mesmo agrupamento de _agrupar_menores na forma esparsa: a faixa volta a ter `max_baldes` baldes."""
+        limite = self._baldes[-1] - self._max_baldes + 1
+        agrupados = bisect_right(self._baldes, limite)
+        soma = sum(self._contagens[:agrupados])
+        del self._baldes[:agrupados]
+        del self._contagens[:agrupados]
+        self._baldes.insert(0, limite)
+        self._contagens.insert(0, soma)
+
+    def _densificar(self):
+        """Passa os contadores para o array denso a partir do menor balde usado. Complexidade: O(faixa)."""
+        baldes, contagens = self._baldes, self._contagens
+        self._deslocamento = baldes[0]
+        self._contagens = array('I', [0]) * (baldes[-1] - baldes[0] + 1)
+        for balde, quantidade in zip(baldes, contagens):
+            self._contagens[balde - self._deslocamento] = quantidade
+        self._baldes = None
+
+    def _pares(self):
+        """Pares (balde, contador) dos baldes com contador positivo, em ordem crescente de balde."""
+        if self._baldes is not None:
+            return zip(self._baldes, self._contagens)
+        deslocamento = self._deslocamento
+        return ((deslocamento + indice, quantidade) for indice, quantidade in enumerate(self._contagens) if quantidade)
+
+    def _valor_do_balde(self, balde):
+        gama = math.exp(self._log_gama)
+        return 2 * gama ** balde / (gama + 1)
+
+    def quantil(self, q: float):
+        """
+        Valor estimado do quantil q (0 <= q <= 1), limitado ao mínimo e ao máximo registrados,
+        ou None se o sketch estiver vazio. Complexidade: O(b), b = baldes.
+        """
+        if not 0 <= q <= 1:
+            raise ValueError("O quantil deve estar entre 0 e 1.")
+        if not self._total:
+            return None
+        posto = q * (self._total - 1)
+        acumulado = self._zeros
+        if posto < acumulado:
+            return 0
+        for balde, quantidade in self._pares():
+            acumulado += quantidade
+            if acumulado > posto:
+                valor = self._valor_do_balde(balde)
+                return min(max(valor, self._minimo), self._maximo)
+        return self._maximo
+
+    def quantis(self, quantis=QUANTIS_PADRAO):
+        """Retorna {'p50': ..., 'p90': ..., 'p99': ...} (ou os quantis informados), arredondados a 2 casas."""
+        resultado = {}
+        for q in quantis:
+            valor = self.quantil(q)
+            resultado[f'p{q * 100:g}'] = None if valor is None else round(valor, 2)
+        return resultado
+
+    def mesclar(self, outro):
+        """Soma os valores de `outro` (mesmo erro relativo) a este sketch e retorna self. Complexidade: O(b)."""
+        if outro._log_gama != self._log_gama:
+            raise ValueError("Só é possível mesclar sketches de quantis com o mesmo erro relativo.")
+        for balde, quantidade in list(outro._pares()):  # Lista: `outro` pode ser o próprio sketch
+            self._incrementar(balde, quantidade)
+        self._zeros += outro._zeros
+        self._total += outro._total
+        for valor in (outro._minimo, outro._maximo):
+            if valor is not None:
+                self._minimo = valor if self._minimo is None else min(self._minimo, valor)
+                self._maximo = valor if self._maximo is None else max(self._maximo, valor)
+        return self
+
+    def copiar(self):
+        """Retorna um sketch independente com os mesmos valores. Complexidade: O(b)."""
+        return SketchQuantis.de_dict(self.para_dict())
+
+    def memoria_bytes(self) -> int:
+        """Bytes ocupados pelos contadores (e, na forma esparsa, pelos índices) dos baldes."""
+        memoria = len(self._contagens) * self._contagens.itemsize
+        if self._baldes is not None:
+            memoria += len(self._baldes) * self._baldes.itemsize
+        return memoria
+
+    def para_dict(self):
+        """
+        Representação serializável: contadores densos a partir do balde `deslocamento`, igual nas duas formas
+        (o menor e o maior balde da faixa sempre têm contador positivo).
+        """
+        if self._baldes is None:
+            deslocamento, contagens = self._deslocamento, self._contagens.tolist()
+        elif self._baldes:
+            deslocamento, contagens = self._baldes[0], [0] * (self._baldes[-1] - self._baldes[0] + 1)
+            for balde, quantidade in zip(self._baldes, self._contagens):
+                contagens[balde - deslocamento] = quantidade
+        else:
+            deslocamento, contagens = 0, []
+        return {'erro_relativo': self._erro, 'max_baldes': self._max_baldes, 'deslocamento': deslocamento,
+                'contagens': contagens, 'zeros': self._zeros, 'total': self._total,
+                'minimo': self._minimo, 'maximo': self._maximo}
+
+    @classmethod
+    def de_dict(cls, dados):
+        """Recria o sketch a partir de para_dict(), na forma (esparsa ou densa) que ocupar menos memória."""
+        sketch = cls(dados['erro_relativo'], dados['max_baldes'])
+        usados = [(dados['deslocamento'] + indice, quantidade)
+                  for indice, quantidade in enumerate(dados['contagens']) if quantidade]
+        if len(usados) >= MIN_BALDES_DENSO and 2 * len(usados) >= len(dados['contagens']):
+            sketch._baldes = None
+            sketch._deslocamento = dados['deslocamento']
+            sketch._contagens = array('I', dados['contagens'])
+        else:
+            sketch._baldes = array('i', [balde for balde, _ in usados])
+            sketch._contagens = array('I', [quantidade for _, quantidade in usados])
+        sketch._zeros, sketch._total = dados['zeros'], dados['total']
+        sketch._minimo, sketch._maximo = dados['minimo'], dados['maximo']
+        return sketch
+
+    def __eq__(self, outro):
+        if not isinstance(outro, SketchQuantis):
+            return NotImplemented
+        return self.para_dict() == outro.para_dict()
@@ -0,0 +1,123 @@
+"""
+Space-Saving: os itens mais frequentes de um fluxo, com memória fixa.
+No máximo `capacidade` itens são monitorados, cada um com uma contagem e o erro máximo dessa contagem.
+Um item novo com a estrutura cheia substitui o item de menor contagem e herda essa contagem como erro,
+de modo que a contagem real fica entre contagem - erro e contagem, e todo item com frequência acima
+de N / capacidade está garantidamente entre os monitorados.
+
+Opcionalmente, as contagens decaem exponencialmente com a idade das ocorrências (meia-vida em segundos):
+uma ocorrência no instante t vale 2^((t - T) / meia_vida) no instante de referência T (a ocorrência mais
+recente). Para não reescalar tudo a cada ocorrência, cada uma é somada com peso 2^((t - marco) / meia_vida)
+(decaimento progressivo, "forward decay"); a ordem entre os itens não muda com o tempo, e o fator comum
+só é aplicado na consulta. O marco é reposicionado quando os pesos ficam grandes demais.
+
+Os itens ficam em uma lista ordenada por contagem (bisect), então os k maiores são os k últimos:
+a consulta custa O(k) e uma atualização O(capacidade) no pior caso (deslocamento da lista).
+Os itens são IDs inteiros; empates são desfeitos pelo menor ID, como nos rankings do sistema.
+"""
+
+from bisect import bisect_left, insort
+
+_LIMITE_PESO = 2.0 ** 512  # Acima disso, o marco do decaimento é reposicionado
+
+
+class SpaceSaving:
+    def __init__(self, capacidade: int = 100, meia_vida_segundos: float = None):
+        """
+        Monitora até `capacidade` itens; com meia_vida_segundos, as ocorrências perdem metade do peso
+        a cada meia-vida (sem ela, as contagens são acumuladas sem decaimento).
+        """
+        if not isinstance(capacidade, int) or capacidade <= 0:
+            raise ValueError("A capacidade deve ser um inteiro positivo.")
+        if meia_vida_segundos is not None and meia_vida_segundos <= 0:
+            raise ValueError("A meia-vida deve ser positiva.")
+        self._capacidade = capacidade
+        self._meia_vida = meia_vida_segundos
+        self._marco = None          # Instante de peso 1 no decaimento
+        self._referencia = None     # Instante mais recente visto (consultas são relativas a ele)
+        self._contagens = {}        # item -> (contagem, erro), na escala do marco
+        self._ordem = []            # (contagem, -item) em ordem crescente
+        self._total = 0
+
+    @property
+    def capacidade(self):
+        return self._capacidade
+
+    @property
+    def total(self):
+        """Quantidade de ocorrências registradas (sem decaimento)."""
+        return self._total
+
+    def __len__(self):
+        """Quantidade de itens monitorados. Complexidade: O(1)."""
+        return len(self._contagens)
+
+    def _peso(self, instante):
+        if self._meia_vida is None:
+            return 1
+        if self._marco is None:
+            self._marco = instante
+        peso = 2.0 ** ((instante - self._marco) / self._meia_vida)
+        if peso > _LIMITE_PESO:
+            self._reposicionar_marco(instante)
+            peso = 1.0
+        return peso
+
+    def _reposicionar_marco(self, instante):
+        """Reescala todas as contagens para um novo marco (a ordem não muda). Complexidade: O(capacidade)."""
+        fator = 2.0 ** ((self._marco - instante) / self._meia_vida)
+        self._contagens = {item: (contagem * fator, erro * fator) for item, (contagem, erro) in self._contagens.items()}
+        self._ordem = [(contagem * fator, chave) for contagem, chave in self._ordem]
+        self._marco = instante
+
+    def adicionar(self, item: int, instante: int = None):
+        """
+        Registra uma ocorrência do item no instante informado (epoch em segundos; obrigatório com meia-vida).
+        Complexidade: O(log c + c) no pior caso, c = capacidade.
+        """
+        if self._meia_vida is not None:
+            if instante is None:
+                raise ValueError("Com meia-vida, cada ocorrência precisa do instante.")
+            if self._referencia is None or instante > self._referencia:
+                self._referencia = instante
+        peso = self._peso(instante)
+        self._total += 1
+
+        atual = self._contagens.get(item)
+        if atual is not None:
+            contagem, erro = atual
+            del self._ordem[bisect_left(self._ordem, (contagem, -item))]
+        elif len(self._contagens) < self._capacidade:
+            contagem, erro = 0, 0
+        else:  # Substitui o item de menor contagem, que passa a ser o erro do novo item
+            contagem, chave = self._ordem.pop(0)
+            del self._contagens[-chave]
+            erro = contagem
+        contagem += peso
+        self._contagens[item] = (contagem, erro)
+        insort(self._ordem, (contagem, -item))
+
+    def _fator_consulta(self):
+        if self._meia_vida is None or self._marco is None:
+            return 1
+        return 2.0 ** ((self._marco - self._referencia) / self._meia_vida)
+
+    def top(self, k: int = 10):
+        """
+        Retorna até k tuplas (item, contagem, erro), da maior para a menor contagem; com meia-vida,
+        as contagens são as decaídas até a ocorrência mais recente. Complexidade: O(k).
+        """
+        fator = self._fator_consulta()
+        resultado = []
+        for contagem, chave in reversed(self._ordem[-k:] if k > 0 else []):
+            erro = self._contagens[-chave][1]
+            resultado.append((-chave, contagem * fator, erro * fator))
+        return resultado
+
+    def estimar(self, item: int):
+        """Retorna (contagem, erro) do item, ou (0, 0) se não estiver monitorado. Complexidade: O(1)."""
+        atual = self._contagens.get(item)
+        if atual is None:
+            return 0, 0
+        fator = self._fator_consulta()
+        return atual[0] * fator, atual[1] * fator
@@ -1,5 +1,8 @@
 from analise.sistema import SistemaAnaliseEngajamento # Importa a classe de análise implementada no módulo sistema
 import os # Importa módulo para interações com o sistema operacional (utilizei para limpar o terminal)
+import argparse # Importa módulo para ler os argumentos da linha de comando (modos de exportação e servidor, sem menu)
+import asyncio # Importa módulo para executar o servidor de consultas
+from analise.servidor import ServidorConsultas # Importa o servidor HTTP/JSON de consultas
 
 # Cria o caminho para o arquivo CSV que contém as interações
 csv_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "interacoes_globo.csv")
@@ -35,10 +38,77 @@ def exibir_menu_relatorios(sistema):
             print("Opção inválida. Tente novamente.")
             input("\nPressione Enter para voltar ao menu...")
 
+def ler_argumentos():
+    """
+    Lê os argumentos da linha de comando. Sem --exportar, o programa abre o menu interativo.
+    """
+    parser = argparse.ArgumentParser(description="Análise de engajamento de mídias Globo.")
+    parser.add_argument('--csv', default=csv_path,
+                        help="Arquivo CSV de interações, ou diretório/padrão glob com vários arquivos (carregados em paralelo).")
+    parser.add_argument('--exportar', metavar='DIRETORIO', help="Grava todos os relatórios no diretório, sem menu interativo.")
+    parser.add_argument('--formato', choices=('csv', 'json'), default='csv', help="Formato dos relatórios exportados.")
+    parser.add_argument('--top-n', type=int, default=10, help="Tamanho dos rankings exportados (0 = ranking completo).")
+    parser.add_argument('--aproximado', action='store_true',
+                        help="Com --exportar, inclui as estimativas do modo aproximado (HyperLogLog e Count-Min Sketch).")
+    parser.add_argument('--armazenamento', choices=('objetos', 'colunar'), default='objetos',
+                        help="Com 'colunar', a tabela completa dos relatórios é calculada por agregações sobre colunas contíguas.")
+    parser.add_argument('--servidor', action='store_true', help="Atende consultas HTTP/JSON em localhost, sem menu interativo.")
+    parser.add_argument('--porta', type=int, default=8080, help="Porta do servidor de consultas.")
+    parser.add_argument('--meia-vida-tendencias', type=float, default=86400,
+                        help="Com --servidor, meia-vida (s) das interações na rota /tendencias (0 = sem decaimento).")
+    parser.add_argument('--intervalo-ingestao', type=float, default=None,
+                        help="Com --servidor, verifica linhas novas no CSV a cada N segundos (apenas para um único arquivo).")
+    argumentos = parser.parse_args()
+    if argumentos.servidor and argumentos.intervalo_ingestao and not os.path.isfile(argumentos.csv):
+        parser.error("--intervalo-ingestao exige que --csv seja um único arquivo (a ingestão incremental não lê diretórios nem padrões glob).")
+    if argumentos.aproximado and argumentos.armazenamento == 'colunar':
+        parser.error("--aproximado não pode ser combinado com --armazenamento colunar (a tabela colunar é exata).")
+    return argumentos
+
+def carregar_interacoes(sistema, caminho):
+    """
+    Função para carregar um único CSV (usando o snapshot, se estiver atualizado) ou,
+    se o caminho for um diretório ou padrão glob, todos os arquivos correspondentes em paralelo.
+    """
+    if os.path.isfile(caminho):
+        sistema.carregar_interacoes_com_snapshot(caminho)
+    else:
+        sistema.carregar_diretorio_csv(caminho)
+
+def exportar_relatorios(sistema, argumentos):
+    """
+    Função para exportar todos os relatórios para arquivos, sem interação com o usuário.
+    """
+    relatorios = sistema.exportar_relatorios(argumentos.exportar, argumentos.formato, argumentos.top_n or None)
+    for nome, (caminho, linhas) in relatorios.items():
+        print(f"{nome}: {linhas} linhas -> {caminho}")
+
 # Verifica se o script está sendo executado diretamente
 if __name__ == "__main__":
-    os.system('cls')  # Limpa o terminal ao iniciar o script
-    sistema = SistemaAnaliseEngajamento()  # Cria uma instância do sistema de análise de engajamento
-    sistema._carregar_interacoes_csv(csv_path)  # Processa as interações do arquivo CSV
-    input("\nCarga do arquivo concluída. Pressione Enter para acessar Menu de Relatórios")  # Mensagem de conclusão do processamento do CSV
-    exibir_menu_relatorios(sistema)  # chama a função que exibe o menu de relatórios
\ No newline at end of file
+    argumentos = ler_argumentos()
+    if argumentos.exportar:  # Modo não interativo: carrega, exporta e encerra
+        sistema = SistemaAnaliseEngajamento(modo_aproximado=argumentos.aproximado,
+                                            armazenamento=argumentos.armazenamento)  # Sem rankings ao vivo: cada ranking é calculado uma única vez na exportação
+        carregar_interacoes(sistema, argumentos.csv)
+        exportar_relatorios(sistema, argumentos)
+    elif argumentos.servidor:  # Modo servidor: carrega e atende consultas até ser interrompido (Ctrl+C)
+        sistema = SistemaAnaliseEngajamento(rankings_ao_vivo=True, armazenamento=argumentos.armazenamento)
+        sistema.monitorar_tendencias(meia_vida_segundos=argumentos.meia_vida_tendencias or None)  # Conteúdos em alta, atualizados a cada ingestão
+        if os.path.isfile(argumentos.csv):
+            sistema.carregar_interacoes_incremental(argumentos.csv)  # Carga incremental: guarda o ponto de parada para as próximas ingestões
+            caminho_ingestao = argumentos.csv
+        else:
+            sistema.carregar_diretorio_csv(argumentos.csv)  # Diretório ou padrão glob: carga única, sem ingestão incremental
+            caminho_ingestao = None
+        servidor = ServidorConsultas(sistema, porta=argumentos.porta, caminho_csv=caminho_ingestao,
+                                     intervalo_ingestao=argumentos.intervalo_ingestao)
+        try:
+            asyncio.run(servidor.servir_para_sempre())
+        except KeyboardInterrupt:
+            print("\nServidor encerrado.")
+    else:
+        os.system('cls')  # Limpa o terminal ao iniciar o script
+        sistema = SistemaAnaliseEngajamento(rankings_ao_vivo=True, armazenamento=argumentos.armazenamento)  # Cria uma instância do sistema de análise de engajamento (com rankings mantidos durante a carga)
+        carregar_interacoes(sistema, argumentos.csv)  # Processa as interações do arquivo CSV (ou restaura o snapshot, se estiver atualizado)
+        input("\nCarga do arquivo concluída. Pressione Enter para acessar Menu de Relatórios")  # Mensagem de conclusão do processamento do CSV
+        exibir_menu_relatorios(sistema)  # chama a função que exibe o menu de relatórios
\ No newline at end of file
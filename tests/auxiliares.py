@@ -0,0 +1,83 @@
+"""
+Funções compartilhadas pelos testes: caminho do CSV de exemplo, execução silenciosa das cargas
+(que imprimem avisos e totais), um resumo comparável do estado de um sistema carregado e um caso de
+teste base que trabalha sobre uma cópia do CSV em um diretório temporário.
+"""
+
+import contextlib
+import io
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+CAMINHO_CSV = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'interacoes_globo.csv')
+
+
+def silencioso(funcao, *args, **kwargs):
+    """Executa a função descartando o que ela imprime e retorna o seu resultado."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return funcao(*args, **kwargs)
+
+
+def carregar(caminho=CAMINHO_CSV, **opcoes):
+    """Sistema criado com as opções dadas e carregado com o CSV (por padrão, o de exemplo)."""
+    from analise.sistema import SistemaAnaliseEngajamento
+    sistema = SistemaAnaliseEngajamento(**opcoes)
+    silencioso(sistema._carregar_interacoes_csv, caminho)
+    return sistema
+
+
+def fluxo_zipf(quantidade, itens, semente):
+    """Fluxo de IDs com frequências de cauda longa (peso 1 / posição)."""
+    aleatorio = random.Random(semente)
+    return aleatorio.choices(range(1, itens + 1), weights=[1 / i for i in range(1, itens + 1)], k=quantidade)
+
+
+def resumir(sistema):
+    """
+    Resumo do estado carregado, independente da forma de carga: métricas e comentários de cada conteúdo,
+    estatísticas de cada usuário e de cada plataforma (por nome) e a quantidade de interações.
+    """
+    conteudos = [(c.id_conteudo, c.nome_conteudo, c.calcular_metricas(), c.listar_comentarios())
+                 for c in sistema.listar_conteudos()]
+    usuarios = [(u.id_usuario, u.quantidade_interacoes(), sorted(c.id_conteudo for c in u.obter_conteudos_unicos()),
+                 u.calcular_tempo_total_assistido(), [(str(p), n) for p, n in u.plataformas_mais_frequentes(3)],
+                 [u.contar_interacoes_por_tipo(tipo) for tipo in ('view_start', 'like', 'share', 'comment')])
+                for u in sistema.listar_usuarios()]
+    plataformas = sorted((p.nome_plataforma, p.calcular_total_interacoes_engajamento(), p.calcular_tempo_total_consumo(),
+                          p.calcular_media_tempo_consumo()) for p in sistema.listar_plataformas())
+    return {'conteudos': conteudos, 'usuarios': usuarios, 'plataformas': plataformas,
+            'interacoes': len(sistema.interacoes_no_intervalo())}
+
+
+class CasoComCsv(unittest.TestCase):
+    """
+    Caso de teste com uma cópia do CSV de exemplo em `self.csv` (em um diretório temporário, `self.diretorio`),
+    as linhas originais em `self.linhas` e o resumo de uma carga serial de referência em `self.resumo`.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.referencia = carregar()
+        cls.resumo = resumir(cls.referencia)
+        with open(CAMINHO_CSV, encoding='utf-8') as f:
+            cls.linhas = f.readlines()
+
+    def setUp(self):
+        self._diretorio = tempfile.TemporaryDirectory()
+        self.diretorio = self._diretorio.name
+        self.csv = os.path.join(self.diretorio, 'interacoes.csv')
+        shutil.copyfile(CAMINHO_CSV, self.csv)
+
+    def tearDown(self):
+        self._diretorio.cleanup()
+
+    def escrever(self, caminho, linhas, modo='w'):
+        with open(caminho, modo, encoding='utf-8') as f:
+            f.writelines(linhas)
+
+    def checkpoint_completo(self):
+        """Checkpoint esperado depois de consumir o CSV inteiro."""
+        return {'offset': os.path.getsize(self.csv), 'linha': len(self.linhas), 'cabecalho': self.linhas[0].strip().split(',')}
@@ -0,0 +1,99 @@
+"""
+Testes do armazenamento colunar: as colunas são a única cópia das interações (entidades e índice temporal
+guardam posições), e os relatórios, o resumo do estado e o snapshot devem ser os mesmos do armazenamento
+por objetos, com menos memória.
+"""
+
+import gc
+import os
+import tracemalloc
+import unittest
+
+from analise.armazenamento_colunar import ListaInteracoes
+from analise.sistema import SistemaAnaliseEngajamento
+from tests.auxiliares import CasoComCsv, carregar, resumir, silencioso
+
+
+def comparavel(linha):
+    """Linha da tabela com entidades trocadas pelo texto (objetos de sistemas diferentes não são iguais)."""
+    resultado = {}
+    for chave, valor in linha.items():
+        if chave in ('conteudo', 'plataforma'):
+            valor = str(valor)
+        elif chave == 'plataformas_mais_frequentes':
+            valor = [(str(plataforma), quantidade) for plataforma, quantidade in valor]
+        resultado[chave] = valor
+    return resultado
+
+
+def memoria_da_carga(caminho, **opcoes):
+    """Bytes alocados (e ainda vivos) por um sistema carregado com o CSV."""
+    tracemalloc.start()
+    try:
+        sistema = carregar(caminho, **opcoes)
+        gc.collect()
+        memoria = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del sistema
+    return memoria
+
+
+class TesteArmazenamentoColunar(CasoComCsv):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.colunar = carregar(armazenamento='colunar')
+
+    def test_mesma_tabela_e_mesmo_estado(self):
+        esperada, obtida = self.referencia.tabela_relatorio(), self.colunar.tabela_relatorio()
+        for entidade in ('conteudo', 'usuario', 'plataforma'):
+            self.assertEqual([comparavel(linha) for linha in obtida.linhas(entidade)],
+                             [comparavel(linha) for linha in esperada.linhas(entidade)], entidade)
+        self.assertEqual(resumir(self.colunar), self.resumo)
+        ao_vivo = carregar(armazenamento='colunar', rankings_ao_vivo=True)
+        self.assertEqual(resumir(ao_vivo), self.resumo)
+        with self.assertRaises(ValueError):
+            SistemaAnaliseEngajamento(armazenamento='linhas')
+
+    def test_colunas_sao_a_unica_copia(self):
+        armazenamento = self.colunar._armazenamento_colunar
+        for conteudo in self.colunar.listar_conteudos():
+            self.assertIsInstance(conteudo._interacoes, ListaInteracoes)
+        for usuario in self.colunar.listar_usuarios():
+            self.assertIsInstance(usuario._Usuario__interacoes, ListaInteracoes)
+        interacoes = self.colunar.interacoes_no_intervalo()
+        self.assertEqual(len(interacoes), len(armazenamento))
+        for interacao in interacoes:  # Recriadas a partir das colunas: o ID é a posição + 1
+            self.assertEqual(armazenamento.interacao(interacao.interacao_id - 1).timestamp_epoch,
+                             interacao.timestamp_epoch)
+        esperadas = {(str(i.conteudo_associado), i.id_usuario, i.tipo_interacao, i.timestamp_epoch)
+                     for i in self.referencia.interacoes_no_intervalo()}
+        self.assertEqual({(str(i.conteudo_associado), i.id_usuario, i.tipo_interacao, i.timestamp_epoch)
+                          for i in interacoes}, esperadas)
+        with self.assertRaises(ValueError):
+            self.colunar.listar_conteudos()[0].usar_lista_interacoes([])
+
+    def test_snapshot_e_carga_incremental(self):
+        original = SistemaAnaliseEngajamento(armazenamento='colunar')
+        silencioso(original.carregar_interacoes_com_snapshot, self.csv)
+        restaurado = SistemaAnaliseEngajamento(armazenamento='colunar')
+        self.assertTrue(silencioso(restaurado.carregar_snapshot, self.csv + '.snapshot', self.csv))
+        self.assertEqual(resumir(restaurado), self.resumo)
+        acrescimo = os.path.join(self.diretorio, 'acrescimo.csv')
+        self.escrever(acrescimo, self.linhas[:41])
+        validas = resumir(carregar(acrescimo))['interacoes']
+        self.escrever(self.csv, self.linhas[1:41], 'a')
+        self.assertEqual(silencioso(restaurado.carregar_interacoes_incremental, self.csv), validas)
+        self.assertEqual(resumir(restaurado)['interacoes'], self.resumo['interacoes'] + validas)
+
+    def test_usa_menos_memoria_que_objetos(self):
+        self.escrever(self.csv, self.linhas[:1] + self.linhas[1:] * 20)  # Interações suficientes para superar os custos fixos
+        carregar(self.csv, armazenamento='colunar')  # Aquece os caches compartilhados (decodificação de timestamps)
+        objetos = memoria_da_carga(self.csv)
+        self.assertLess(memoria_da_carga(self.csv, armazenamento='colunar'), 0.85 * objetos)
+
+
+if __name__ == '__main__':
+    unittest.main()
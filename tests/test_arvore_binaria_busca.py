@@ -0,0 +1,58 @@
+"""Testes da árvore AVL com estatísticas de ordem: altura logarítmica, k-ésimo, posição e remoções."""
+
+import math
+import random
+import unittest
+
+from estruturas_dados.arvore_binaria_busca import ArvoreBinariaBusca
+
+
+class TesteArvoreBinariaBusca(unittest.TestCase):
+
+    def test_insercao_ordenada_mantem_altura_logaritmica(self):
+        arvore = ArvoreBinariaBusca()
+        for chave in range(1, 4097):
+            arvore.inserir(chave, str(chave))
+        self.assertEqual(len(arvore), 4096)
+        self.assertLessEqual(arvore.altura(), 1.45 * math.log2(4096 + 2))  # Limite de altura de uma AVL
+        self.assertEqual([valor for valor in arvore.percurso_em_ordem()], [str(c) for c in range(1, 4097)])
+
+    def test_estatisticas_de_ordem(self):
+        aleatorio = random.Random(3)
+        chaves = aleatorio.sample(range(100_000), 2000)
+        arvore = ArvoreBinariaBusca()
+        for chave in chaves:
+            arvore.inserir(chave, chave)
+        ordenadas = sorted(chaves)
+        for k in (1, 2, 500, 1999, 2000):
+            self.assertEqual(arvore.k_esimo(k), ordenadas[k - 1])
+        for chave in ordenadas[::97]:
+            self.assertEqual(arvore.posicao(chave), ordenadas.index(chave) + 1)
+        self.assertEqual(arvore.primeiros(10), ordenadas[:10])
+        self.assertIsNone(arvore.k_esimo(0))
+        self.assertIsNone(arvore.k_esimo(2001))
+        self.assertIsNone(arvore.posicao(-1))
+
+    def test_estatisticas_de_ordem_apos_remocoes(self):
+        arvore = ArvoreBinariaBusca()
+        for chave in range(1000):
+            arvore.inserir(chave, chave)
+        for chave in range(0, 1000, 2):
+            arvore.remover(chave)
+        restantes = list(range(1, 1000, 2))
+        self.assertEqual(len(arvore), 500)
+        self.assertEqual([arvore.k_esimo(k) for k in range(1, 501)], restantes)
+        self.assertEqual(arvore.posicao(999), 500)
+        self.assertIsNone(arvore.buscar(998))
+        self.assertLessEqual(arvore.altura(), 1.45 * math.log2(500 + 2))
+
+    def test_chave_repetida_atualiza_valor(self):
+        arvore = ArvoreBinariaBusca()
+        arvore.inserir(7, 'a')
+        arvore.inserir(7, 'b')
+        self.assertEqual(len(arvore), 1)
+        self.assertEqual(arvore.buscar(7), 'b')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,30 @@
+"""Testes da carga de um diretório (ou padrão glob) de CSVs com estados parciais mesclados."""
+
+import os
+import unittest
+
+from analise.sistema import SistemaAnaliseEngajamento
+from tests.auxiliares import CasoComCsv, resumir, silencioso
+
+
+class TesteCargaDiretorio(CasoComCsv):
+
+    def test_carga_de_diretorio(self):
+        partes = os.path.join(self.diretorio, 'partes')
+        os.mkdir(partes)
+        corpo = self.linhas[1:]
+        tamanho = len(corpo) // 3 + 1
+        for indice in range(3):
+            self.escrever(os.path.join(partes, f'parte_{indice}.csv'),
+                          [self.linhas[0]] + corpo[indice * tamanho:(indice + 1) * tamanho])
+        sistema = SistemaAnaliseEngajamento()
+        registradas = silencioso(sistema.carregar_diretorio_csv, partes, processos=2)
+        self.assertEqual(registradas, self.resumo['interacoes'])
+        self.assertEqual(resumir(sistema), self.resumo)
+        por_padrao = SistemaAnaliseEngajamento()
+        silencioso(por_padrao.carregar_diretorio_csv, os.path.join(partes, 'parte_*.csv'), usar_threads=True)
+        self.assertEqual(resumir(por_padrao), self.resumo)
+
+
+if __name__ == '__main__':
+    unittest.main()
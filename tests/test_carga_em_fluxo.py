@@ -0,0 +1,18 @@
+"""Testes da carga em fluxo: lotes pequenos lidos e processados aos poucos produzem o estado da carga serial."""
+
+import unittest
+
+from analise.sistema import SistemaAnaliseEngajamento
+from tests.auxiliares import CasoComCsv, resumir, silencioso
+
+
+class TesteCargaEmFluxo(CasoComCsv):
+
+    def test_carga_em_fluxo(self):
+        sistema = SistemaAnaliseEngajamento()
+        silencioso(sistema._carregar_interacoes_csv, self.csv, streaming=True, tamanho_lote=7)
+        self.assertEqual(resumir(sistema), self.resumo)
+
+
+if __name__ == '__main__':
+    unittest.main()
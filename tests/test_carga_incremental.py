@@ -0,0 +1,52 @@
+"""
+Testes da carga incremental com checkpoints: partes acrescentadas ao CSV (inclusive uma última linha ainda
+sendo escrita) devem produzir o mesmo estado de uma carga única, e a carga completa registra o checkpoint.
+"""
+
+import os
+import unittest
+
+from analise.sistema import SistemaAnaliseEngajamento
+from tests.auxiliares import CasoComCsv, resumir, silencioso
+
+
+class TesteCargaIncremental(CasoComCsv):
+
+    def test_csv_de_exemplo_tem_interacoes_e_linhas_invalidas(self):
+        self.assertEqual(self.resumo['interacoes'], 319)
+        self.assertLess(self.resumo['interacoes'], len(self.linhas) - 1)
+
+    def test_carga_incremental_em_partes(self):
+        metade = len(self.linhas) // 2
+        self.escrever(self.csv, self.linhas[:metade])
+        self.escrever(self.csv, [self.linhas[metade][:10]], 'a')  # Linha ainda sendo escrita
+        sistema = SistemaAnaliseEngajamento()
+        primeira = silencioso(sistema.carregar_interacoes_incremental, self.csv)
+        self.escrever(self.csv, [self.linhas[metade][10:]] + self.linhas[metade + 1:], 'a')
+        segunda = 0
+        for _ in range(len(self.linhas)):  # Lotes limitados, como na ingestão do servidor
+            antes = sistema.checkpoint_incremental(self.csv)
+            segunda += silencioso(sistema.carregar_interacoes_incremental, self.csv, max_linhas=25)
+            if sistema.checkpoint_incremental(self.csv) == antes:
+                break
+        self.assertEqual(sistema.checkpoint_incremental(self.csv), self.checkpoint_completo())
+        self.assertEqual(primeira + segunda, self.resumo['interacoes'])
+        self.assertEqual(resumir(sistema), self.resumo)
+
+    def test_carga_completa_registra_checkpoint(self):
+        sistema = SistemaAnaliseEngajamento()
+        silencioso(sistema._carregar_interacoes_csv, self.csv)
+        self.assertEqual(sistema.checkpoint_incremental(self.csv), self.checkpoint_completo())
+        self.assertEqual(silencioso(sistema.carregar_interacoes_incremental, self.csv), 0)
+        acrescimo = os.path.join(self.diretorio, 'acrescimo.csv')
+        self.escrever(acrescimo, self.linhas[:41])
+        apenas_acrescimo = SistemaAnaliseEngajamento()
+        silencioso(apenas_acrescimo._carregar_interacoes_csv, acrescimo)
+        validas = resumir(apenas_acrescimo)['interacoes']
+        self.escrever(self.csv, self.linhas[1:41], 'a')
+        self.assertEqual(silencioso(sistema.carregar_interacoes_incremental, self.csv), validas)
+        self.assertEqual(resumir(sistema)['interacoes'], self.resumo['interacoes'] + validas)
+
+
+if __name__ == '__main__':
+    unittest.main()
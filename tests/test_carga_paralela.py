@@ -0,0 +1,19 @@
+"""Testes da carga paralela: a validação em vários processos produz o estado e o checkpoint da carga serial."""
+
+import unittest
+
+from analise.sistema import SistemaAnaliseEngajamento
+from tests.auxiliares import CasoComCsv, resumir, silencioso
+
+
+class TesteCargaParalela(CasoComCsv):
+
+    def test_carga_paralela(self):
+        sistema = SistemaAnaliseEngajamento()
+        silencioso(sistema.carregar_interacoes_csv_paralelo, self.csv, processos=3)
+        self.assertEqual(resumir(sistema), self.resumo)
+        self.assertEqual(sistema.checkpoint_incremental(self.csv), self.checkpoint_completo())
+
+
+if __name__ == '__main__':
+    unittest.main()
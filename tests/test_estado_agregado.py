@@ -0,0 +1,26 @@
+"""Testes do estado agregado serializável: shards por usuário mesclados equivalem a uma carga única."""
+
+import os
+import unittest
+
+from analise.estado_agregado import EstadoAgregado, dividir_csv_por_usuario, mesclar_estados
+from tests.auxiliares import CasoComCsv, carregar, silencioso
+
+
+class TesteEstadoAgregado(CasoComCsv):
+
+    def test_shards_mesclados_equivalem_a_carga_unica(self):
+        shards = silencioso(dividir_csv_por_usuario, self.csv, 3, os.path.join(self.diretorio, 'shards'))
+        estados = []
+        for caminho in shards:
+            estado = carregar(caminho).estado_agregado()
+            arquivo_estado = caminho + '.json'
+            estado.salvar(arquivo_estado)
+            estados.append(EstadoAgregado.carregar(arquivo_estado))
+        esperado = self.referencia.estado_agregado()
+        self.assertEqual(mesclar_estados(estados), esperado)
+        self.assertEqual(mesclar_estados(reversed(estados)).relatorio(), esperado.relatorio())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+"""Testes da fila em buffer circular: FIFO, crescimento sob demanda, políticas de transbordo e produtor/consumidor."""
+
+import threading
+import unittest
+
+from analise.sistema import SistemaAnaliseEngajamento
+from estruturas_dados.fila import Fila, CAPACIDADE_INICIAL
+from tests.auxiliares import CasoComCsv, resumir, silencioso
+
+
+class TesteFila(unittest.TestCase):
+
+    def test_fifo_com_crescimento_e_volta_do_buffer(self):
+        fila = Fila()
+        esperados = []
+        proximo = 0
+        for rodada in range(50):  # Intercala entradas e saídas para o início dar a volta no buffer
+            for _ in range(rodada % 7 + 3):
+                fila.enfileirar(proximo)
+                esperados.append(proximo)
+                proximo += 1
+            for _ in range(rodada % 5 + 1):
+                self.assertEqual(fila.desenfileirar(), esperados.pop(0))
+        self.assertEqual(len(fila), len(esperados))
+        self.assertEqual(fila.desenfileirar_lote(len(esperados) + 10), esperados)
+        self.assertTrue(fila.is_empty())
+        self.assertIsNone(fila.desenfileirar())
+
+    def test_politica_descartar_antigo(self):
+        fila = Fila(capacidade_maxima=4, politica_transbordo='descartar_antigo')
+        fila.enfileirar_lote(range(10))
+        self.assertTrue(fila.is_full())
+        self.assertEqual(fila.itens_descartados, 6)
+        self.assertEqual(fila.desenfileirar_lote(4), [6, 7, 8, 9])
+
+    def test_politica_erro(self):
+        fila = Fila(capacidade_maxima=2)
+        fila.enfileirar_lote(['a', 'b'])
+        with self.assertRaises(OverflowError):
+            fila.enfileirar('c')
+        self.assertEqual(fila.desenfileirar(), 'a')
+        fila.enfileirar('c')
+        self.assertEqual(fila.desenfileirar_lote(2), ['b', 'c'])
+
+    def test_fila_limitada_cresce_sob_demanda(self):
+        fila = Fila(capacidade_maxima=1_000_000)
+        self.assertEqual(len(fila._buffer), CAPACIDADE_INICIAL)
+        fila.enfileirar_lote(range(100))
+        self.assertLessEqual(len(fila._buffer), 2 * 100)
+        pequena = Fila(capacidade_maxima=5, politica_transbordo='descartar_antigo')
+        pequena.enfileirar_lote(range(20))
+        self.assertEqual(len(pequena._buffer), 5)
+        self.assertEqual(pequena.desenfileirar_lote(10), [15, 16, 17, 18, 19])
+
+    def test_lote_atomico_na_politica_erro(self):
+        fila = Fila(capacidade_maxima=5)
+        fila.enfileirar_lote(['a', 'b', 'c'])
+        with self.assertRaises(OverflowError):
+            fila.enfileirar_lote(iter(['d', 'e', 'f']))
+        self.assertEqual(len(fila), 3)  # Nada do lote recusado foi enfileirado
+        fila.enfileirar_lote(['d', 'e'])
+        self.assertEqual(fila.desenfileirar_lote(5), ['a', 'b', 'c', 'd', 'e'])
+
+    def test_produtor_e_consumidor_com_bloqueio(self):
+        fila = Fila(capacidade_maxima=8, politica_transbordo='bloquear')
+        produtor = threading.Thread(target=fila.enfileirar_lote, args=(range(1000),))
+        produtor.start()
+        consumidos = []
+        while len(consumidos) < 1000:
+            lote = fila.desenfileirar_lote(5, aguardar=True, timeout=5)
+            self.assertLessEqual(len(fila), 8)
+            self.assertTrue(lote)
+            consumidos.extend(lote)
+        produtor.join()
+        self.assertEqual(consumidos, list(range(1000)))
+        self.assertEqual(fila.desenfileirar_lote(1, aguardar=True, timeout=0.01), [])
+        with self.assertRaises(ValueError):
+            Fila().desenfileirar_lote(1, aguardar=True)
+
+    def test_parametros_invalidos(self):
+        with self.assertRaises(ValueError):
+            Fila(capacidade_maxima=0)
+        with self.assertRaises(ValueError):
+            Fila(politica_transbordo='ignorar')
+        with self.assertRaises(ValueError):
+            Fila().desenfileirar_lote(-1)
+
+
+class TesteCargaComFilaLimitada(CasoComCsv):
+
+    def test_carga_em_fluxo_limita_a_ocupacao_da_fila(self):
+        sistema = SistemaAnaliseEngajamento(instrumentar=True)
+        silencioso(sistema._carregar_interacoes_csv, self.csv, streaming=True, tamanho_lote=10)
+        self.assertEqual(resumir(sistema), self.resumo)
+        pico = sistema.resumo_instrumentacao()['estruturas']['fila']['pico_ocupacao']
+        self.assertGreater(pico, 0)
+        self.assertLessEqual(pico, 2 * 10)
+
+    def test_erro_de_leitura_no_produtor_chega_ao_chamador(self):
+        with self.assertRaises(FileNotFoundError):
+            silencioso(SistemaAnaliseEngajamento()._carregar_interacoes_csv, self.csv + '.inexistente', streaming=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+"""Testes das consultas por intervalo de tempo: limites em datetime, epoch inteiro ou fracionário, e consolidações."""
+
+import unittest
+from datetime import datetime, timedelta
+
+from tests.auxiliares import carregar
+
+
+class TesteConsultasPorIntervalo(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.sistema = carregar()
+        cls.epochs = sorted(i.timestamp_epoch for i in cls.sistema.interacoes_no_intervalo())
+
+    def test_intervalo_equivale_ao_filtro_completo(self):
+        inicio, fim = self.epochs[len(self.epochs) // 4], self.epochs[3 * len(self.epochs) // 4]
+        esperadas = [e for e in self.epochs if inicio <= e < fim]
+        obtidas = sorted(i.timestamp_epoch for i in self.sistema.interacoes_no_intervalo(inicio, fim))
+        self.assertEqual(obtidas, esperadas)
+        epoca = datetime(1970, 1, 1)
+        como_datetime = self.sistema.interacoes_no_intervalo(epoca + timedelta(seconds=inicio),
+                                                             epoca + timedelta(seconds=fim))
+        self.assertEqual(sorted(i.timestamp_epoch for i in como_datetime), esperadas)
+
+    def test_limites_fracionarios(self):
+        inicio, fim = self.epochs[10], self.epochs[-10]
+        exatas = len(self.sistema.interacoes_no_intervalo(inicio, fim))
+        self.assertEqual(len(self.sistema.interacoes_no_intervalo(float(inicio), float(fim))), exatas)
+        esperadas = len([e for e in self.epochs if inicio - 0.5 <= e < fim + 0.5])
+        self.assertEqual(len(self.sistema.interacoes_no_intervalo(inicio - 0.5, fim + 0.5)), esperadas)
+        self.assertEqual(len(self.sistema.interacoes_no_intervalo(1.7e9)), len(self.epochs))
+
+    def test_limites_invalidos(self):
+        for limite in ('2024-01-01', float('nan'), float('inf'), True):
+            with self.assertRaises(ValueError, msg=repr(limite)):
+                self.sistema.interacoes_no_intervalo(limite)
+
+    def test_consolidacao_por_periodo_cobre_o_intervalo(self):
+        for granularidade in ('hora', 'dia'):
+            periodos = self.sistema.agregar_por_periodo(granularidade=granularidade)
+            self.assertEqual(sum(p['total_interacoes'] for p in periodos), len(self.epochs))
+            inicios = [p['inicio_periodo'] for p in periodos]
+            self.assertEqual(inicios, sorted(inicios))
+        with self.assertRaises(ValueError):
+            self.sistema.agregar_por_periodo(granularidade='semana')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,38 @@
+"""Testes da instrumentação opcional: etapas medidas, tempo de carga sem dupla contagem e custo nulo quando desligada."""
+
+import csv
+import os
+import unittest
+
+from analise.sistema import SistemaAnaliseEngajamento
+from tests.auxiliares import CasoComCsv, silencioso
+
+
+class TesteInstrumentacao(CasoComCsv):
+
+    def test_carga_csv_medida_por_etapa(self):
+        sistema = SistemaAnaliseEngajamento(instrumentar=True)
+        silencioso(sistema._carregar_interacoes_csv, self.csv)
+        resumo = sistema.resumo_instrumentacao()
+        with open(self.csv, encoding='utf-8') as f:
+            registros = sum(1 for _ in csv.DictReader(f))
+        self.assertEqual(resumo['etapas']['validacao']['chamadas'], registros)
+        self.assertEqual(resumo['carga']['interacoes_registradas'], self.resumo['interacoes'])
+        self.assertEqual(resumo['carga']['segundos'], resumo['etapas']['carga.csv']['segundos'])
+        self.assertGreater(resumo['estruturas']['fila']['pico_ocupacao'], 0)
+        self.assertIsNone(SistemaAnaliseEngajamento().resumo_instrumentacao())
+
+    def test_mesclagem_nao_conta_duas_vezes_na_carga_de_diretorio(self):
+        partes = os.path.join(self.diretorio, 'partes')
+        os.mkdir(partes)
+        for indice in range(2):
+            self.escrever(os.path.join(partes, f'parte_{indice}.csv'), [self.linhas[0]] + self.linhas[1 + indice::2])
+        sistema = SistemaAnaliseEngajamento(instrumentar=True)
+        silencioso(sistema.carregar_diretorio_csv, partes, usar_threads=True)
+        resumo = sistema.resumo_instrumentacao()
+        self.assertEqual(resumo['etapas']['mesclagem_estado_parcial']['chamadas'], 2)
+        self.assertEqual(resumo['carga']['segundos'], resumo['etapas']['carga.diretorio']['segundos'])
+
+
+if __name__ == '__main__':
+    unittest.main()
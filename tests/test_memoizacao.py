@@ -0,0 +1,76 @@
+"""Testes do cache LRU e da memoização das métricas das entidades por versão de modificação."""
+
+import gc
+import unittest
+import weakref
+
+from entidades.conteudo import Video
+from entidades.interacao import Interacao
+from entidades.memoizacao import CACHE_METRICAS
+from entidades.plataforma import Plataforma
+from entidades.usuario import Usuario
+from estruturas_dados.cache_lru import CacheLRU
+
+
+class TesteCacheLRU(unittest.TestCase):
+
+    def test_descarta_o_menos_recente(self):
+        cache = CacheLRU(2)
+        cache.guardar('a', 1)
+        cache.guardar('b', 2)
+        self.assertEqual(cache.obter('a'), 1)  # 'b' passa a ser o menos recente
+        cache.guardar('c', 3)
+        self.assertIsNone(cache.obter('b'))
+        self.assertEqual((cache.obter('a'), cache.obter('c')), (1, 3))
+        self.assertEqual(cache.estatisticas(), {'tamanho': 2, 'capacidade': 2, 'acertos': 3, 'falhas': 1,
+                                                'descartes': 1})
+
+    def test_redimensionar(self):
+        cache = CacheLRU(4)
+        for chave in 'abcd':
+            cache.guardar(chave, chave)
+        cache.redimensionar(2)
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.obter('a'))
+        self.assertEqual(cache.obter('d'), 'd')
+        with self.assertRaises(ValueError):
+            cache.redimensionar(0)
+
+
+class TesteMemoizacaoPorVersao(unittest.TestCase):
+
+    def setUp(self):
+        self.conteudo = Video(1, 'Vídeo', 600)
+        self.plataformas = [Plataforma('Globoplay'), Plataforma('G1')]
+
+    def interagir(self, usuario, plataforma, duracao):
+        interacao = Interacao.a_partir_de_campos(self.conteudo, plataforma, usuario.id_usuario, 1_700_000_000,
+                                                 'view_start', duracao, '')
+        usuario.adicionar_interacao(interacao)
+
+    def test_resultado_recalculado_apos_nova_interacao(self):
+        usuario = Usuario(7)
+        self.interagir(usuario, self.plataformas[0], 100)
+        self.assertEqual(usuario.plataformas_mais_frequentes(), [(self.plataformas[0], 1)])
+        copia = usuario.plataformas_mais_frequentes()
+        copia.clear()  # O chamador recebe uma cópia: alterá-la não afeta o valor guardado
+        self.assertEqual(usuario.plataformas_mais_frequentes(), [(self.plataformas[0], 1)])
+        for _ in range(2):
+            self.interagir(usuario, self.plataformas[1], 200)
+        self.assertEqual(usuario.plataformas_mais_frequentes(), [(self.plataformas[1], 2), (self.plataformas[0], 1)])
+        self.assertEqual(usuario.calcular_quantis_tempo_consumo()['p99'],
+                         Usuario.calcular_quantis_tempo_consumo.__wrapped__(usuario)['p99'])
+
+    def test_cache_nao_mantem_entidades_vivas(self):
+        usuario = Usuario(8)
+        self.interagir(usuario, self.plataformas[0], 100)
+        usuario.plataformas_mais_frequentes()
+        referencia = weakref.ref(usuario)
+        del usuario
+        gc.collect()
+        self.assertIsNone(referencia())
+        self.assertLessEqual(len(CACHE_METRICAS), CACHE_METRICAS.capacidade)
+
+
+if __name__ == '__main__':
+    unittest.main()
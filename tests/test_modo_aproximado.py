@@ -0,0 +1,177 @@
+"""
+Testes dos sketches do modo aproximado (HyperLogLog e Count-Min Sketch) contra contagens exatas, dentro dos
+limites de erro que cada um declara, e do modo aproximado do sistema: estimativas, métricas exatas preservadas,
+tabela de relatórios com os mesmos valores dos rankings e combinações de opções recusadas.
+Os hashes são estáveis (hash_estavel) e os fluxos usam sementes fixas, então os resultados são determinísticos.
+"""
+
+import unittest
+from collections import Counter
+
+from analise.analise_aproximada import AnaliseAproximada
+from analise.sistema import SistemaAnaliseEngajamento
+from estruturas_dados.count_min_sketch import CountMinSketch
+from estruturas_dados.hyperloglog import HyperLogLog, precisao_para_erro
+from tests.auxiliares import carregar, fluxo_zipf
+
+
+class TesteHyperLogLog(unittest.TestCase):
+
+    def test_erro_relativo_dentro_do_limite(self):
+        for quantidade in (10, 100, 1000, 50_000):
+            sketch = HyperLogLog(12)
+            for item in range(quantidade):
+                sketch.adicionar(item)
+            erro = abs(sketch.estimativa() - quantidade) / quantidade
+            self.assertLessEqual(erro, 4 * sketch.erro_relativo, quantidade)
+
+    def test_repeticoes_nao_alteram_a_estimativa(self):
+        sketch = HyperLogLog(10)
+        for item in range(300):
+            sketch.adicionar(item)
+        estimativa = sketch.estimativa()
+        for item in range(300):
+            sketch.adicionar(item)
+        self.assertEqual(sketch.estimativa(), estimativa)
+
+    def test_representacao_esparsa_equivale_a_densa(self):
+        for quantidade in (5, 60, 200, 5000):
+            esparso, denso = HyperLogLog(10), HyperLogLog(10)
+            denso._tornar_denso()
+            for item in range(quantidade):
+                esparso.adicionar(('conteudo', item))
+                denso.adicionar(('conteudo', item))
+            self.assertEqual(esparso.estimativa(), denso.estimativa())
+            self.assertEqual(esparso.para_dict(), denso.para_dict())
+        self.assertTrue(HyperLogLog(10).esparso)
+        self.assertFalse(esparso.esparso)  # 5000 itens ocupam mais de m / 4 registradores
+
+    def test_mesclagem_equivale_ao_sketch_da_uniao(self):
+        primeiro, segundo, uniao = HyperLogLog(11), HyperLogLog(11), HyperLogLog(11)
+        for item in range(0, 3000):
+            primeiro.adicionar(item)
+            uniao.adicionar(item)
+        for item in range(2000, 2100):  # Segundo sketch ainda esparso
+            segundo.adicionar(item)
+            uniao.adicionar(item)
+        self.assertEqual(primeiro.mesclar(segundo).para_dict(), uniao.para_dict())
+        with self.assertRaises(ValueError):
+            primeiro.mesclar(HyperLogLog(10))
+
+    def test_serializacao(self):
+        sketch = HyperLogLog(9)
+        for item in range(40):
+            sketch.adicionar(item)
+        copia = HyperLogLog.de_dict(sketch.para_dict())
+        self.assertTrue(copia.esparso)
+        self.assertEqual(copia.estimativa(), sketch.estimativa())
+        self.assertEqual(copia.memoria_bytes(), sketch.memoria_bytes())
+
+    def test_precisao_para_erro(self):
+        self.assertEqual(precisao_para_erro(0.05), 9)
+        self.assertEqual(precisao_para_erro(0.5), 4)
+        self.assertEqual(precisao_para_erro(0.0001), 16)
+        with self.assertRaises(ValueError):
+            precisao_para_erro(1.5)
+
+
+class TesteCountMinSketch(unittest.TestCase):
+
+    def test_nunca_subestima_e_respeita_o_limite(self):
+        fluxo = fluxo_zipf(50_000, 5000, semente=11)
+        sketch = CountMinSketch(erro=0.002, probabilidade_falha=0.01)
+        for item in fluxo:
+            sketch.adicionar(item)
+        reais = Counter(fluxo)
+        self.assertEqual(sketch.total, len(fluxo))
+        excedentes = 0
+        for item, real in reais.items():
+            estimativa = sketch.estimar(item)
+            self.assertGreaterEqual(estimativa, real)
+            if estimativa - real > sketch.erro_absoluto:
+                excedentes += 1
+        self.assertLessEqual(excedentes / len(reais), 0.01)
+        self.assertLessEqual(sketch.estimar('ausente'), sketch.erro_absoluto)  # Só colisões contam para a chave ausente
+
+    def test_mesclagem_equivale_a_um_unico_sketch(self):
+        fluxo = fluxo_zipf(10_000, 1000, semente=5)
+        unico, primeiro, segundo = CountMinSketch(0.01), CountMinSketch(0.01), CountMinSketch(0.01)
+        for posicao, item in enumerate(fluxo):
+            unico.adicionar(item)
+            (primeiro if posicao % 2 else segundo).adicionar(item)
+        primeiro.mesclar(segundo)
+        self.assertEqual([primeiro.estimar(i) for i in range(1, 1001)], [unico.estimar(i) for i in range(1, 1001)])
+        self.assertEqual(CountMinSketch.de_dict(primeiro.para_dict()).estimar(1), unico.estimar(1))
+        with self.assertRaises(ValueError):
+            primeiro.mesclar(CountMinSketch(0.1))
+
+    def test_incremento_negativo(self):
+        with self.assertRaises(ValueError):
+            CountMinSketch().adicionar('x', -1)
+
+
+class TesteModoAproximado(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.exato = carregar()
+        cls.aproximado = carregar(modo_aproximado=True)
+
+    def test_distintos_por_usuario_dentro_do_erro(self):
+        erro = self.aproximado.relatorio_aproximado()['limites_erro']['erro_relativo_hll']
+        for usuario in self.exato.listar_usuarios():
+            real = usuario.quantidade_conteudos_unicos()
+            estimado = self.aproximado.buscar_usuario(usuario.id_usuario).quantidade_conteudos_unicos()
+            self.assertLessEqual(abs(estimado - real), max(1, 4 * erro * real), usuario.id_usuario)
+
+    def test_contagens_por_tipo_limitadas_pelo_count_min(self):
+        excesso = self.aproximado.relatorio_aproximado()['limites_erro']['excesso_maximo_contagens']
+        pares = [(c, self.aproximado.buscar_conteudo(c.id_conteudo)) for c in self.exato.listar_conteudos()]
+        pares += [(u, self.aproximado.buscar_usuario(u.id_usuario)) for u in self.exato.listar_usuarios()]
+        for exata, aproximada in pares:
+            for tipo in ('view_start', 'like', 'share', 'comment'):
+                real = exata.contar_interacoes_por_tipo(tipo)
+                estimada = aproximada.contar_interacoes_por_tipo(tipo)
+                self.assertGreaterEqual(estimada, real)
+                self.assertLessEqual(estimada - real, excesso)
+
+    def test_tabela_exibe_os_valores_dos_rankings(self):
+        tabela = self.aproximado.tabela_relatorio()
+        for conteudo in self.aproximado.listar_conteudos():
+            linha = tabela.linha('conteudo', conteudo.id_conteudo)
+            self.assertEqual(linha['contagem_por_tipo_interacao'], conteudo.calcular_contagem_por_tipo_interacao())
+        for usuario in self.aproximado.listar_usuarios():
+            linha = tabela.linha('usuario', usuario.id_usuario)
+            self.assertEqual(linha['quantidade_conteudos'], usuario.quantidade_conteudos_unicos())
+            for tipo in ('view_start', 'like', 'share', 'comment'):
+                self.assertEqual(linha['contagem_por_tipo_interacao'].get(tipo, 0), usuario.contar_interacoes_por_tipo(tipo))
+        ranking = self.aproximado.top_n_por_metrica('usuario', 'quantidade_conteudos', None)
+        estimativas = [tabela.linha('usuario', u.id_usuario)['quantidade_conteudos'] for u in ranking]
+        self.assertEqual(estimativas, sorted(estimativas, reverse=True))
+
+    def test_metricas_exatas_preservadas(self):
+        for usuario in self.exato.listar_usuarios():
+            aproximado = self.aproximado.buscar_usuario(usuario.id_usuario)
+            self.assertEqual(aproximado.quantidade_interacoes(), usuario.quantidade_interacoes())
+            self.assertEqual(aproximado.calcular_tempo_total_assistido(), usuario.calcular_tempo_total_assistido())
+            self.assertEqual({c.id_conteudo for c in aproximado.obter_conteudos_unicos()},
+                             {c.id_conteudo for c in usuario.obter_conteudos_unicos()})
+            self.assertEqual(len(aproximado.filtrar_interacoes_por_tipo('like')), usuario.contar_interacoes_por_tipo('like'))
+
+    def test_estado_serializado_e_mesclavel(self):
+        analise = self.aproximado.analise_aproximada()
+        copia = AnaliseAproximada.de_dict(analise.para_dict())
+        self.assertEqual(copia.relatorio(), analise.relatorio())
+        usuario = self.aproximado.listar_usuarios()[0].id_usuario
+        self.assertEqual(copia.mesclar(AnaliseAproximada(**analise.para_dict()['limites'])).contagem_tipo_usuario(usuario, 'like'),
+                         analise.contagem_tipo_usuario(usuario, 'like'))
+
+    def test_combinacoes_recusadas(self):
+        with self.assertRaises(ValueError):
+            SistemaAnaliseEngajamento(modo_aproximado=True, rankings_ao_vivo=True)
+        with self.assertRaises(ValueError):
+            SistemaAnaliseEngajamento(modo_aproximado=True, armazenamento='colunar')
+
+
+if __name__ == '__main__':
+    unittest.main()
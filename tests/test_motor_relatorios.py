@@ -0,0 +1,29 @@
+"""Testes do motor de relatórios: a tabela de passada única deve seguir as métricas calculadas pelas entidades."""
+
+import unittest
+
+from tests.auxiliares import carregar
+
+
+class TesteMotorRelatorios(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.sistema = carregar()
+
+    def test_tabela_segue_as_metricas_das_entidades(self):
+        tabela = self.sistema.tabela_relatorio()
+        self.assertIs(self.sistema.tabela_relatorio(), tabela)  # Reaproveitada enquanto os dados não mudam
+        for conteudo in self.sistema.listar_conteudos():
+            linha = tabela.linha('conteudo', conteudo.id_conteudo)
+            for metrica, valor in conteudo.calcular_metricas().items():
+                self.assertEqual(linha[metrica], valor, metrica)
+            self.assertEqual(linha['comentarios'], conteudo.listar_comentarios())
+        for usuario in self.sistema.listar_usuarios():
+            linha = tabela.linha('usuario', usuario.id_usuario)
+            self.assertEqual(linha['quantidade_conteudos'], usuario.quantidade_conteudos_unicos())
+            self.assertEqual(linha['plataformas_mais_frequentes'][:3], usuario.plataformas_mais_frequentes(3))
+
+
+if __name__ == '__main__':
+    unittest.main()
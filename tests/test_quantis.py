@@ -0,0 +1,124 @@
+"""
+Testes do sketch de quantis (erro relativo, mesclagem, forma esparsa e densa) e dos quantis do tempo de consumo
+nas entidades, na tabela de relatório e no estado agregado, que só criam o sketch na primeira sessão de consumo.
+"""
+
+import random
+import unittest
+
+from analise.estado_agregado import EstadoAgregado
+from entidades.interacao import e_sessao_consumo
+from estruturas_dados.sketch_quantis import MIN_BALDES_DENSO, SketchQuantis, quantis_vazios
+from tests.auxiliares import carregar
+
+
+def sketch_denso(valores, **opcoes):
+    """Sketch que usa o array denso desde o primeiro valor, como referência para a forma esparsa."""
+    sketch = SketchQuantis(**opcoes)
+    sketch._baldes = None
+    for valor in valores:
+        sketch.adicionar(valor)
+    return sketch
+
+
+class TesteSketchQuantis(unittest.TestCase):
+
+    def setUp(self):
+        aleatorio = random.Random(17)
+        self.valores = [round(aleatorio.lognormvariate(6, 1.2)) for _ in range(20_000)] + [0] * 500
+
+    def test_quantis_com_erro_relativo_garantido(self):
+        sketch = SketchQuantis(erro_relativo=0.01)
+        for valor in self.valores:
+            sketch.adicionar(valor)
+        ordenados = sorted(self.valores)
+        for q in (0.0, 0.01, 0.25, 0.5, 0.9, 0.99, 1.0):
+            real = ordenados[int(q * (len(ordenados) - 1))]
+            estimado = sketch.quantil(q)
+            self.assertLessEqual(abs(estimado - real), 0.01 * real + 1e-9, q)
+        self.assertEqual(set(sketch.quantis()), {'p50', 'p90', 'p99'})
+        self.assertIsNone(SketchQuantis().quantil(0.5))
+        self.assertEqual(SketchQuantis().quantis(), quantis_vazios())
+
+    def test_mesclagem_equivale_a_um_unico_sketch(self):
+        unico, primeiro, segundo = SketchQuantis(), SketchQuantis(), SketchQuantis()
+        for posicao, valor in enumerate(self.valores):
+            unico.adicionar(valor)
+            (primeiro if posicao % 3 else segundo).adicionar(valor)
+        self.assertEqual(primeiro.mesclar(segundo), unico)
+        self.assertEqual(SketchQuantis.de_dict(unico.para_dict()), unico)
+        with self.assertRaises(ValueError):
+            unico.mesclar(SketchQuantis(0.05))
+
+    def test_forma_esparsa_equivale_a_densa(self):
+        aleatorio = random.Random(5)
+        for max_baldes in (8, 64, 2048):
+            valores = [aleatorio.choice([0, aleatorio.uniform(0.5, 5), aleatorio.lognormvariate(5, 2)])
+                       for _ in range(300)]
+            esparso = SketchQuantis(max_baldes=max_baldes)
+            for quantidade, valor in enumerate(valores):
+                esparso.adicionar(valor)
+                if quantidade == 3:
+                    self.assertIsNotNone(esparso._baldes)  # Poucos baldes usados: forma esparsa
+            denso = sketch_denso(valores, max_baldes=max_baldes)
+            self.assertEqual(esparso, denso, max_baldes)
+            self.assertEqual(esparso.quantis((0, 0.1, 0.5, 0.9, 1)), denso.quantis((0, 0.1, 0.5, 0.9, 1)))
+            self.assertEqual(SketchQuantis.de_dict(denso.para_dict()), esparso)
+            self.assertEqual(esparso.copiar().mesclar(denso), denso.copiar().mesclar(esparso))
+
+    def test_memoria_da_forma_esparsa(self):
+        poucos = SketchQuantis()
+        for valor in (30, 600, 5400):  # Baldes distantes: a forma densa teria centenas de contadores
+            poucos.adicionar(valor)
+        self.assertEqual(poucos.memoria_bytes(), 3 * 8)
+        self.assertLess(poucos.memoria_bytes(), sketch_denso((30, 600, 5400)).memoria_bytes())
+        muitos = SketchQuantis()
+        for valor in self.valores:
+            muitos.adicionar(valor)
+        self.assertIsNone(muitos._baldes)  # Faixa preenchida: contadores densos de 4 bytes
+        self.assertGreaterEqual(len(muitos._contagens), MIN_BALDES_DENSO)
+        self.assertEqual(muitos.memoria_bytes(), len(muitos._contagens) * 4)
+
+    def test_valores_invalidos(self):
+        with self.assertRaises(ValueError):
+            SketchQuantis().adicionar(-1)
+        with self.assertRaises(ValueError):
+            SketchQuantis().quantil(1.5)
+
+
+class TesteQuantisDoConsumo(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.sistema = carregar()
+
+    def test_quantis_do_tempo_de_consumo(self):
+        tabela = self.sistema.tabela_relatorio()
+        for conteudo in self.sistema.listar_conteudos():
+            sessoes = sorted(i.watch_duration_seconds for i in conteudo.interacoes
+                             if e_sessao_consumo(i.tipo_interacao, i.watch_duration_seconds))
+            quantis = tabela.linha('conteudo', conteudo.id_conteudo)['quantis_tempo_consumo']
+            self.assertEqual(quantis, conteudo.calcular_quantis_tempo_consumo())
+            if not sessoes:
+                self.assertIsNone(quantis['p50'])
+                continue
+            for nome, q in (('p50', 0.5), ('p90', 0.9), ('p99', 0.99)):
+                real = sessoes[int(q * (len(sessoes) - 1))]
+                self.assertLessEqual(abs(quantis[nome] - real), 0.01 * real + 0.01, (conteudo.id_conteudo, nome))
+
+    def test_sketch_criado_apenas_com_consumo(self):
+        sem_consumo = [u for u in self.sistema.listar_usuarios()
+                       if not any(e_sessao_consumo(i.tipo_interacao, i.watch_duration_seconds) for i in u.interacoes)]
+        self.assertTrue(sem_consumo)
+        tabela = self.sistema.tabela_relatorio()
+        estado = EstadoAgregado.de_sistema(self.sistema)
+        for usuario in sem_consumo:
+            self.assertIsNone(usuario._Usuario__quantis_consumo)
+            self.assertEqual(usuario.calcular_quantis_tempo_consumo(), quantis_vazios())
+            self.assertEqual(tabela.linha('usuario', usuario.id_usuario)['quantis_tempo_consumo'], quantis_vazios())
+            self.assertIsNone(estado.usuarios[usuario.id_usuario]['quantis_consumo'])
+        self.assertEqual(EstadoAgregado.de_dict(estado.para_dict()), estado)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,21 @@
+"""Testes dos rankings mantidos na ingestão: devem coincidir com os rankings calculados sob demanda."""
+
+import unittest
+
+from analise.sistema import METRICAS_RANKING
+from tests.auxiliares import carregar
+
+
+class TesteRankingsAoVivo(unittest.TestCase):
+
+    def test_rankings_ao_vivo_equivalem_aos_calculados(self):
+        calculado, ao_vivo = carregar(), carregar(rankings_ao_vivo=True)
+        for entidade, metricas in METRICAS_RANKING.items():
+            for metrica in metricas:
+                self.assertEqual([str(o) for o in ao_vivo.top_n_por_metrica(entidade, metrica, None)],
+                                 [str(o) for o in calculado.top_n_por_metrica(entidade, metrica, None)],
+                                 (entidade, metrica))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+"""Testes do servidor de consultas: respostas, cache por versão dos dados, ingestão e corpo grande demais."""
+
+import asyncio
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from analise.servidor import ServidorConsultas, TAMANHO_MAXIMO_CORPO
+from analise.sistema import SistemaAnaliseEngajamento
+from tests.auxiliares import CAMINHO_CSV, silencioso
+
+
+async def requisitar(porta, requisicao):
+    """Envia uma requisição HTTP crua e retorna (código, corpo JSON)."""
+    leitor, escritor = await asyncio.open_connection('127.0.0.1', porta)
+    escritor.write(requisicao)
+    await escritor.drain()
+    resposta = await leitor.read()
+    escritor.close()
+    await escritor.wait_closed()
+    cabecalho, _, corpo = resposta.partition(b'\r\n\r\n')
+    return int(cabecalho.split()[1]), json.loads(corpo)
+
+
+class TesteServidorConsultas(unittest.TestCase):
+
+    def setUp(self):
+        self._diretorio = tempfile.TemporaryDirectory()
+        self.csv = os.path.join(self._diretorio.name, 'interacoes.csv')
+        with open(CAMINHO_CSV, encoding='utf-8') as f:
+            self.linhas = f.readlines()
+        shutil.copyfile(CAMINHO_CSV, self.csv)
+        self.sistema = SistemaAnaliseEngajamento(rankings_ao_vivo=True)
+        silencioso(self.sistema.carregar_interacoes_incremental, self.csv)
+        self.servidor = ServidorConsultas(self.sistema, caminho_csv=self.csv, tamanho_cache=2)
+
+    def tearDown(self):
+        self._diretorio.cleanup()
+
+    def responder(self, metodo, alvo):
+        codigo, corpo = asyncio.run(self.servidor.responder(metodo, alvo))
+        return codigo, json.loads(corpo)
+
+    def test_consultas_e_erros(self):
+        codigo, corpo = self.responder('GET', '/top/conteudo/likes?n=3')
+        self.assertEqual(codigo, 200)
+        self.assertEqual([linha['posicao'] for linha in corpo], [1, 2, 3])
+        self.assertEqual(self.responder('GET', '/usuarios/999999')[0], 404)
+        self.assertEqual(self.responder('GET', '/top/conteudo/inexistente')[0], 404)
+        self.assertEqual(self.responder('GET', '/top/conteudo/likes?n=abc')[0], 400)
+        self.assertEqual(self.responder('DELETE', '/saude')[0], 405)
+
+    def test_cache_e_descartado_apos_ingestao(self):
+        self.responder('GET', '/top/usuario/quantidade_interacoes?n=5')
+        self.responder('GET', '/top/usuario/quantidade_interacoes?n=5')
+        self.assertEqual((self.servidor.acertos_cache, self.servidor.falhas_cache), (1, 1))
+        with open(self.csv, 'a', encoding='utf-8') as f:
+            f.writelines(self.linhas[1:41])
+        codigo, corpo = self.responder('POST', '/ingerir')
+        self.assertEqual(codigo, 200)
+        self.assertGreater(corpo['interacoes_registradas'], 0)
+        self.assertEqual(corpo['versao_dados'], list(self.sistema.versao_dados()))
+        self.responder('GET', '/top/usuario/quantidade_interacoes?n=5')
+        self.assertEqual(self.servidor.falhas_cache, 2)  # Versão nova: a resposta é recalculada
+
+    def test_corpo_grande_demais_recebe_413(self):
+        async def cenario():
+            await self.servidor.iniciar()  # Com porta=0, iniciar() guarda a porta escolhida pelo sistema
+            try:
+                grande = await requisitar(self.servidor.porta, (
+                    f"POST /ingerir HTTP/1.1\r\nHost: x\r\nContent-Length: {TAMANHO_MAXIMO_CORPO + 1}\r\n\r\n"
+                ).encode('latin-1'))
+                saude = await requisitar(self.servidor.porta, b"GET /saude HTTP/1.1\r\nConnection: close\r\n\r\n")
+            finally:
+                await self.servidor.encerrar()
+            return grande, saude
+
+        self.servidor.porta = 0
+        (codigo, corpo), (codigo_saude, _) = asyncio.run(cenario())
+        self.assertEqual(codigo, 413)
+        self.assertIn('erro', corpo)
+        self.assertEqual(codigo_saude, 200)
+
+
+if __name__ == '__main__':
+    unittest.main()
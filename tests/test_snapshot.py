@@ -0,0 +1,38 @@
+"""Testes do snapshot binário: ida e volta, recusa em sistema com dados e snapshot desatualizado."""
+
+import os
+import unittest
+
+from analise.sistema import SistemaAnaliseEngajamento
+from tests.auxiliares import CasoComCsv, resumir, silencioso
+
+
+class TesteSnapshot(CasoComCsv):
+
+    def test_snapshot_ida_e_volta(self):
+        original = SistemaAnaliseEngajamento()
+        silencioso(original.carregar_interacoes_com_snapshot, self.csv)
+        self.assertTrue(os.path.exists(self.csv + '.snapshot'))
+        restaurado = SistemaAnaliseEngajamento(rankings_ao_vivo=True)
+        self.assertTrue(silencioso(restaurado.carregar_snapshot, self.csv + '.snapshot', self.csv))
+        self.assertEqual(resumir(restaurado), self.resumo)
+        self.assertEqual(restaurado.checkpoint_incremental(self.csv), original.checkpoint_incremental(self.csv))
+        self.assertEqual(silencioso(restaurado.carregar_interacoes_incremental, self.csv), 0)
+
+    def test_snapshot_recusa_sistema_com_dados(self):
+        original = SistemaAnaliseEngajamento()
+        silencioso(original.carregar_interacoes_com_snapshot, self.csv)
+        with self.assertRaises(ValueError):
+            original.carregar_snapshot(self.csv + '.snapshot', self.csv)
+        with self.assertRaises(ValueError):
+            original.carregar_interacoes_com_snapshot(self.csv)
+
+    def test_snapshot_desatualizado_nao_e_usado(self):
+        silencioso(SistemaAnaliseEngajamento().carregar_interacoes_com_snapshot, self.csv)
+        self.escrever(self.csv, self.linhas[1:3], 'a')
+        sistema = SistemaAnaliseEngajamento()
+        self.assertFalse(silencioso(sistema.carregar_snapshot, self.csv + '.snapshot', self.csv))
+
+
+if __name__ == '__main__':
+    unittest.main()
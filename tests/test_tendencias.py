@@ -0,0 +1,58 @@
+"""Testes do Space-Saving e do acompanhamento de conteúdos em alta contra as contagens exatas."""
+
+import unittest
+from collections import Counter
+
+from analise.sistema import SistemaAnaliseEngajamento
+from estruturas_dados.space_saving import SpaceSaving
+from tests.auxiliares import CAMINHO_CSV, carregar, fluxo_zipf, silencioso
+
+
+class TesteSpaceSaving(unittest.TestCase):
+
+    def test_contagens_limitam_a_frequencia_real(self):
+        fluxo = fluxo_zipf(20_000, 2000, semente=13)
+        sketch = SpaceSaving(capacidade=50)
+        for item in fluxo:
+            sketch.adicionar(item)
+        reais = Counter(fluxo)
+        self.assertEqual(len(sketch), 50)
+        for item, contagem, erro in sketch.top(50):
+            self.assertLessEqual(contagem - erro, reais[item])
+            self.assertLessEqual(reais[item], contagem)
+        monitorados = {item for item, _, _ in sketch.top(50)}
+        for item, real in reais.items():
+            if real > len(fluxo) / 50:  # Frequência acima de N / capacidade: garantidamente monitorado
+                self.assertIn(item, monitorados)
+        self.assertEqual([item for item, _, _ in sketch.top(3)], [item for item, _ in reais.most_common(3)])
+
+    def test_decaimento_pela_meia_vida(self):
+        sketch = SpaceSaving(capacidade=10, meia_vida_segundos=3600)
+        sketch.adicionar(1, 0)
+        sketch.adicionar(2, 3600)
+        sketch.adicionar(2, 7200)
+        self.assertAlmostEqual(sketch.estimar(1)[0], 0.25)
+        self.assertAlmostEqual(sketch.estimar(2)[0], 1.5)
+        self.assertEqual([item for item, _, _ in sketch.top(2)], [2, 1])
+        with self.assertRaises(ValueError):
+            sketch.adicionar(3)
+
+
+class TesteTendencias(unittest.TestCase):
+
+    def test_pontuacao_limita_a_quantidade_real(self):
+        sistema = SistemaAnaliseEngajamento()
+        sistema.monitorar_tendencias(capacidade=5)
+        silencioso(sistema._carregar_interacoes_csv, CAMINHO_CSV)
+        em_alta = sistema.conteudos_em_alta(5)
+        self.assertEqual(len(em_alta), 5)
+        for conteudo, pontuacao, erro in em_alta:
+            real = len(conteudo.interacoes)
+            self.assertLessEqual(pontuacao - erro, real)
+            self.assertLessEqual(real, pontuacao)
+        with self.assertRaises(ValueError):
+            carregar().conteudos_em_alta()
+
+
+if __name__ == '__main__':
+    unittest.main()